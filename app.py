@@ -4,64 +4,292 @@ Flask application for nutrition calculation of Indian dishes.
 
 import os
 import json
+import hmac
+import hashlib
 import logging
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+import time
+import threading
+from flask import Flask, Response, g, render_template, request, jsonify, redirect, url_for
 
-from utils.recipe_fetcher import RecipeFetcher
-from utils.ingredient_processor import IngredientProcessor
-from utils.nutrition_calculator import NutritionCalculator
-from config import OPENAI_API_KEY, NUTRITION_DB_FILE
+from utils import metrics, request_log
+from utils.lazy_component import LazyComponent
+from utils.lru_cache import MISSING
+from utils.recipe_cache import normalize_dish_name
+from utils.result_cache import ResultCache
+from config import (OPENAI_API_KEY, NUTRITION_DB_FILE, NUTRITION_SNAPSHOT_FILE, NUTRITION_DB_BACKEND,
+                    NUTRITION_FULL_PROFILE,
+                    INGREDIENT_CACHE_SIZE, INGREDIENT_MATCH_THRESHOLD, INGREDIENT_ALIASES_FILE,
+                    ESTIMATION_CATEGORIES_FILE,
+                    RECIPE_CACHE_ENABLED, RESULT_CACHE_ENABLED, RESULT_CACHE_SIZE,
+                    RECIPE_CACHE_PATH, RECIPE_CACHE_TTL_SECONDS, RECIPE_CACHE_MAX_ENTRIES,
+                    BATCH_MAX_DISHES, RECIPE_FETCH_MAX_CONCURRENCY, RECIPE_FETCH_TIMEOUT_SECONDS,
+                    RECIPE_SOURCE, RECIPE_CORPUS_FILE, RECIPE_SOURCE_LATENCY_MS, RECIPE_SOURCE_JITTER_MS,
+                    RECIPE_SOURCE_ERROR_RATE, RECIPE_SOURCE_SEED,
+                    NUTRITION_DB_WATCH_SECONDS, ADMIN_TOKEN, APP_WARMUP, DEBUG_TIMING_ENABLED, LOG_LEVEL, LOG_FORMAT, LOG_DEBUG_SAMPLE_RATE)
 
-logging.basicConfig(level=logging.DEBUG, 
-                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+request_log.configure(LOG_LEVEL, LOG_FORMAT, LOG_DEBUG_SAMPLE_RATE)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "nutrition-calculator-app")
 
-recipe_fetcher = RecipeFetcher(OPENAI_API_KEY)
-ingredient_processor = IngredientProcessor()
-nutrition_calculator = NutritionCalculator(NUTRITION_DB_FILE)
+# Heavy components (the nutrition table, the OpenAI clients) are built on first
+# use or by the warm-up thread, so importing the app and serving "/" stay cheap.
+
+def _build_recipe_source():
+    if RECIPE_SOURCE == 'openai':
+        return None
+    if RECIPE_SOURCE != 'local':
+        raise ValueError(f"Unknown RECIPE_SOURCE {RECIPE_SOURCE!r}; expected 'openai' or 'local'")
+
+    from utils.recipe_source import LocalCorpusSource
+
+    logger.info("Serving recipes from the local corpus %s", RECIPE_CORPUS_FILE)
+    return LocalCorpusSource.load(RECIPE_CORPUS_FILE, latency_ms=RECIPE_SOURCE_LATENCY_MS,
+                                  jitter_ms=RECIPE_SOURCE_JITTER_MS, error_rate=RECIPE_SOURCE_ERROR_RATE,
+                                  seed=RECIPE_SOURCE_SEED)
+
+def _build_recipe_fetcher():
+    from utils.recipe_cache import RecipeCache
+    from utils.recipe_fetcher import RecipeFetcher
+
+    source = _build_recipe_source()
+    # Corpus recipes are synthetic, so they stay out of the persistent cache.
+    recipe_cache = RecipeCache(RECIPE_CACHE_PATH, ttl_seconds=RECIPE_CACHE_TTL_SECONDS,
+                               max_entries=RECIPE_CACHE_MAX_ENTRIES) if RECIPE_CACHE_ENABLED and source is None else None
+    return RecipeFetcher(OPENAI_API_KEY, cache=recipe_cache, source=source)
+
+def _build_async_recipe_fetcher():
+    from utils.async_recipe_fetcher import AsyncRecipeFetcher
+
+    return AsyncRecipeFetcher(get_recipe_fetcher(), max_concurrency=RECIPE_FETCH_MAX_CONCURRENCY,
+                              timeout=RECIPE_FETCH_TIMEOUT_SECONDS)
+
+def _build_ingredient_processor():
+    from utils.ingredient_processor import IngredientProcessor
+
+    return IngredientProcessor()
+
+def _build_nutrition_calculator():
+    from utils.nutrition_calculator import NutritionCalculator
+
+    return NutritionCalculator(NUTRITION_DB_FILE, cache_size=INGREDIENT_CACHE_SIZE,
+                               full_profile=NUTRITION_FULL_PROFILE,
+                               snapshot_path=NUTRITION_SNAPSHOT_FILE,
+                               backend=NUTRITION_DB_BACKEND,
+                               match_threshold=INGREDIENT_MATCH_THRESHOLD,
+                               alias_path=INGREDIENT_ALIASES_FILE,
+                               estimation_path=ESTIMATION_CATEGORIES_FILE)
+
+def _build_db_reloader():
+    from utils.db_reloader import DatabaseReloader
+
+    reloader = DatabaseReloader(get_nutrition_calculator(), [NUTRITION_DB_FILE, INGREDIENT_ALIASES_FILE])
+    if NUTRITION_DB_WATCH_SECONDS > 0:
+        reloader.watch(NUTRITION_DB_WATCH_SECONDS)
+    return reloader
+
+components = {
+    'recipe_fetcher': LazyComponent('recipe_fetcher', _build_recipe_fetcher),
+    'async_recipe_fetcher': LazyComponent('async_recipe_fetcher', _build_async_recipe_fetcher),
+    'ingredient_processor': LazyComponent('ingredient_processor', _build_ingredient_processor),
+    'nutrition_calculator': LazyComponent('nutrition_calculator', _build_nutrition_calculator),
+    'db_reloader': LazyComponent('db_reloader', _build_db_reloader),
+}
+
+def get_recipe_fetcher():
+    return components['recipe_fetcher'].get()
+
+def get_async_recipe_fetcher():
+    return components['async_recipe_fetcher'].get()
+
+def get_ingredient_processor():
+    return components['ingredient_processor'].get()
+
+def get_nutrition_calculator():
+    return components['nutrition_calculator'].get()
+
+def get_db_reloader():
+    return components['db_reloader'].get()
+
+result_cache = ResultCache(RESULT_CACHE_SIZE) if RESULT_CACHE_ENABLED else None
+
+def _template_digest():
+    template_dir = os.path.join(app.root_path, app.template_folder)
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(template_dir)):
+        with open(os.path.join(template_dir, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+# Part of the /calculate ETag, so a deploy with new templates does not keep serving old pages.
+TEMPLATE_DIGEST = _template_digest()
+
+_warmup_lock = threading.Lock()
+_warmup_thread = None
+
+def _warm_up():
+    for component in components.values():
+        try:
+            component.get()
+        except Exception as e:
+            logger.error("Warm-up failed for %s: %s", component.name, e)
+
+def start_warmup():
+    """Build every component on a background thread; returns immediately."""
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=_warm_up, name="app-warmup", daemon=True)
+            _warmup_thread.start()
+
+if APP_WARMUP:
+    start_warmup()
+
+def _result_cache_key(recipe_data, nutrients=None):
+    if result_cache is None:
+        return None
+    return result_cache.key(recipe_data, get_nutrition_calculator().db_loader.version, nutrients)
+
+def _calculate_recipe_nutrition(recipe_data, processed_ingredients=None, nutrition_lookup=None, nutrients=None,
+                                cache_key=MISSING):
+    """(processed ingredients, nutrition result), from the result cache when this recipe was seen before."""
+    if cache_key is MISSING:
+        cache_key = _result_cache_key(recipe_data, nutrients)
+    if cache_key is not None:
+        cached = _cached_result(cache_key)
+        if cached is not MISSING:
+            return cached
+
+    if processed_ingredients is None:
+        with metrics.span('process_ingredients'):
+            processed_ingredients = get_ingredient_processor().process_ingredients(recipe_data["ingredients"])
+
+    total_cooked_weight = recipe_data.get("total_cooked_weight_grams")
+    servings = recipe_data.get("servings", 4)
+
+    with metrics.span('calculate_nutrition'):
+        nutrition_result = get_nutrition_calculator().calculate_nutrition(
+            recipe_data["dish_name"],
+            recipe_data["dish_type"],
+            processed_ingredients,
+            total_cooked_weight,
+            servings,
+            nutrition_lookup=nutrition_lookup,
+            nutrients=nutrients
+        )
+
+    if cache_key is not None:
+        # The resolved recipe is cached with the result, so a hit can register
+        # the result's recipe_handle again after the calculator has evicted it.
+        resolved = get_nutrition_calculator().resolved_recipe(nutrition_result.get('recipe_handle'))
+        result_cache.put(cache_key, (processed_ingredients, nutrition_result, resolved))
+    return processed_ingredients, nutrition_result
+
+def _cached_result(cache_key):
+    """(processed ingredients, nutrition result) from the result cache, or MISSING; keeps its recipe_handle valid."""
+    cached = result_cache.get(cache_key)
+    if cached is MISSING:
+        return MISSING
+
+    processed_ingredients, nutrition_result, resolved = cached
+    if resolved is not None:
+        get_nutrition_calculator().keep_resolved(resolved)
+    return processed_ingredients, nutrition_result
+
+# Endpoints whose per-ingredient log messages are collected into one summary record.
+SUMMARIZED_ENDPOINTS = {'calculate', 'api_calculate', 'api_calculate_batch', 'api_recalculate'}
+
+@app.before_request
+def _start_request_timing():
+    g.request_start = time.perf_counter()
+    if request.endpoint in SUMMARIZED_ENDPOINTS:
+        g.log_token = request_log.begin(request.endpoint)
+    if DEBUG_TIMING_ENABLED and request.headers.get('X-Debug-Timing'):
+        g.timing_token = metrics.start_request_timing()
+
+@app.after_request
+def _finish_request_timing(response):
+    start = g.pop('request_start', None)
+    if start is None:
+        return response
+
+    elapsed = time.perf_counter() - start
+    metrics.REGISTRY.histogram('nutrition_request_duration_seconds', 'endpoint', request.endpoint or 'unknown',
+                               "Time to answer a request, per endpoint.").observe(elapsed)
+
+    token = g.pop('timing_token', None)
+    if token is not None:
+        stages = metrics.request_timings() or {}
+        metrics.stop_request_timing(token)
+
+        response.headers['Server-Timing'] = ", ".join(
+            [f"{stage};dur={seconds * 1000:.3f}" for stage, (seconds, _) in stages.items()]
+            + [f"total;dur={elapsed * 1000:.3f}"]
+        )
+
+        body = response.get_json(silent=True) if response.is_json else None
+        if isinstance(body, dict):
+            body['debug_timing'] = {
+                'total_ms': round(elapsed * 1000, 3),
+                'stages': {stage: {'ms': round(seconds * 1000, 3), 'calls': calls}
+                           for stage, (seconds, calls) in stages.items()}
+            }
+            response.set_data(json.dumps(body))
+
+    return response
+
+@app.teardown_request
+def _finish_request_log(exc):
+    token = g.pop('log_token', None)
+    if token is not None:
+        request_log.end(token)
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
-@app.route('/calculate', methods=['POST'])
+@app.route('/calculate', methods=['GET', 'POST'])
 def calculate():
     try:
-        dish_name = request.form.get('dish_name', '')
+        # The form submits with GET (/calculate?dish_name=...), so the result page
+        # has a URL the browser can revalidate; POST is still accepted.
+        dish_name = request.values.get('dish_name', '')
         if not dish_name:
+            if request.method == 'GET':
+                return redirect(url_for('index'))
             return render_template('index.html', error="Please enter a dish name")
-        
-        logger.info(f"Processing nutrition calculation for dish: {dish_name}")
 
-        recipe_data = recipe_fetcher.fetch_recipe(dish_name)
+        request_log.annotate(dish=dish_name)
+
+        with metrics.span('fetch_recipe'):
+            recipe_data = get_async_recipe_fetcher().fetch_recipe(dish_name)
         if not recipe_data:
             return render_template('index.html', error="Could not fetch recipe. Please try again.")
 
-        processed_ingredients = ingredient_processor.process_ingredients(recipe_data["ingredients"])
+        # The page depends only on the recipe content, the database and the
+        # templates, so a browser revalidating it can skip the calculation
+        # entirely. Browsers only revalidate GETs, so POSTs get no ETag.
+        cache_key = _result_cache_key(recipe_data)
+        etag = f"{cache_key}-{TEMPLATE_DIGEST}" if cache_key and request.method == 'GET' else None
+        if etag and etag in request.if_none_match:
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
 
-        total_cooked_weight = recipe_data.get("total_cooked_weight_grams")
-        servings = recipe_data.get("servings", 4)
-        
-        nutrition_result = nutrition_calculator.calculate_nutrition(
-            recipe_data["dish_name"],
-            recipe_data["dish_type"],
-            processed_ingredients,
-            total_cooked_weight,
-            servings
-        )
-        
-        logger.info(f"Calculation complete for dish: {dish_name}")
+        processed_ingredients, nutrition_result = _calculate_recipe_nutrition(recipe_data, cache_key=cache_key)
+
+        response = app.make_response(render_template('result.html',
+                                                     dish=nutrition_result,
+                                                     recipe=recipe_data,
+                                                     processed_ingredients=processed_ingredients))
+        if etag:
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'private, no-cache'
+        return response
 
-        return render_template('result.html', 
-                              dish=nutrition_result, 
-                              recipe=recipe_data,
-                              processed_ingredients=processed_ingredients)
-        
     except Exception as e:
-        logger.error(f"Error calculating nutrition: {str(e)}")
+        logger.error("Error calculating nutrition: %s", e)
         return render_template('index.html', error=f"An error occurred: {str(e)}")
 
 @app.route('/api/calculate', methods=['POST'])
@@ -73,31 +301,242 @@ def api_calculate():
             return jsonify({'error': 'Missing dish_name parameter'}), 400
         
         dish_name = data['dish_name']
-        logger.info(f"API request for dish: {dish_name}")
+        request_log.annotate(dish=dish_name)
 
-        recipe_data = recipe_fetcher.fetch_recipe(dish_name)
+        nutrients = data.get('nutrients')
+        if nutrients is not None:
+            try:
+                nutrients = get_nutrition_calculator().db_loader.resolve_profile_columns(nutrients)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
 
-        processed_ingredients = ingredient_processor.process_ingredients(recipe_data["ingredients"])
+        with metrics.span('fetch_recipe'):
+            recipe_data = get_async_recipe_fetcher().fetch_recipe(dish_name)
+
+        processed_ingredients, nutrition_result = _calculate_recipe_nutrition(recipe_data, nutrients=nutrients)
 
-        total_cooked_weight = recipe_data.get("total_cooked_weight_grams")
-        servings = recipe_data.get("servings", 4)
-        
-        nutrition_result = nutrition_calculator.calculate_nutrition(
-            recipe_data["dish_name"],
-            recipe_data["dish_type"],
-            processed_ingredients,
-            total_cooked_weight,
-            servings
-        )
-        
-        logger.info(f"API calculation complete for dish: {dish_name}")
-        
         return jsonify(nutrition_result)
         
     except Exception as e:
-        logger.error(f"API error: {str(e)}")
+        logger.error("API error: %s", e)
         return jsonify({'error': str(e)}), 500
 
+def _positive_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+def _processed_substitutions(substitutions):
+    """Substitutions with quantities converted to grams, or an error message."""
+    if not isinstance(substitutions, list):
+        return None, 'substitutions must be a list'
+
+    processed = []
+    for entry in substitutions:
+        if not isinstance(entry, dict) or not isinstance(entry.get('ingredient') or entry.get('name'), str):
+            return None, 'Each substitution needs an ingredient or a name'
+
+        substitution = {key: entry[key] for key in ('ingredient', 'name') if entry.get(key)}
+        if 'quantity' in entry:
+            name = entry.get('name') or entry['ingredient']
+            parsed = get_ingredient_processor().process_ingredients([{'name': name, 'quantity': entry['quantity']}])
+            if not parsed or parsed[0].get('grams') is None:
+                return None, f"Could not parse quantity {entry['quantity']!r}"
+            substitution['quantity'] = entry['quantity']
+            substitution['grams'] = parsed[0]['grams']
+        elif 'grams' in entry:
+            if not (entry['grams'] == 0 or _positive_number(entry['grams'])):
+                return None, 'grams must be a non-negative number'
+            substitution['grams'] = entry['grams']
+        elif 'ingredient' not in substitution:
+            return None, 'A new ingredient needs a quantity or grams'
+
+        processed.append(substitution)
+    return processed, None
+
+@app.route('/api/recalculate', methods=['POST'])
+def api_recalculate():
+    """
+    An earlier /api/calculate result for other servings, weights or ingredient
+    substitutions, from its recipe_handle; nothing is fetched or matched again.
+    """
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data.get('recipe_handle'), str):
+        return jsonify({'error': 'Missing recipe_handle parameter'}), 400
+
+    options = {}
+    for field in ('servings', 'total_cooked_weight', 'serving_grams'):
+        if data.get(field) is not None:
+            if not _positive_number(data[field]):
+                return jsonify({'error': f'{field} must be a positive number'}), 400
+            options[field] = data[field]
+
+    if data.get('substitutions') is not None:
+        substitutions, error = _processed_substitutions(data['substitutions'])
+        if error:
+            return jsonify({'error': error}), 400
+        options['substitutions'] = substitutions
+
+    calculator = get_nutrition_calculator()
+    if data.get('nutrients') is not None:
+        try:
+            options['nutrients'] = calculator.db_loader.resolve_profile_columns(data['nutrients'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+    try:
+        with metrics.span('recalculate'):
+            result = calculator.recalculate(data['recipe_handle'], **options)
+    except KeyError:
+        return jsonify({'error': 'Unknown or expired recipe_handle. Calculate the dish again.'}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify(result)
+
+@app.route('/api/calculate_batch', methods=['POST'])
+def api_calculate_batch():
+    data = request.get_json(silent=True)
+
+    if not data or not isinstance(data.get('dish_names'), list):
+        return jsonify({'error': 'Missing dish_names parameter'}), 400
+
+    dish_names = data['dish_names']
+    if len(dish_names) > BATCH_MAX_DISHES:
+        return jsonify({'error': f'Too many dishes: at most {BATCH_MAX_DISHES} per request'}), 400
+
+    request_log.annotate(dishes=len(dish_names))
+
+    unique_dishes = {}
+    for dish_name in dish_names:
+        if isinstance(dish_name, str) and dish_name.strip():
+            unique_dishes.setdefault(normalize_dish_name(dish_name), dish_name)
+
+    recipes = {}
+    errors = {}
+
+    if unique_dishes:
+        with metrics.span('fetch_recipe'):
+            fetched = get_async_recipe_fetcher().fetch_recipes(list(unique_dishes.values()))
+        for key, recipe_data in zip(unique_dishes, fetched):
+            if isinstance(recipe_data, BaseException):
+                logger.error("Batch recipe fetch failed for %s: %s", unique_dishes[key], recipe_data)
+                errors[key] = f"Could not fetch recipe: {str(recipe_data)}"
+            else:
+                recipes[key] = recipe_data
+
+    processed = {}
+    cache_keys = {}
+    results_by_dish = {}
+    for key, recipe_data in recipes.items():
+        try:
+            cache_keys[key] = _result_cache_key(recipe_data)
+        except Exception as e:
+            logger.error("Batch result cache key failed for %s: %s", unique_dishes[key], e)
+            cache_keys[key] = None
+        cached = _cached_result(cache_keys[key]) if cache_keys[key] is not None else MISSING
+        if cached is not MISSING:
+            results_by_dish[key] = cached[1]
+            continue
+
+        try:
+            with metrics.span('process_ingredients'):
+                processed_ingredients = get_ingredient_processor().process_ingredients(recipe_data["ingredients"])
+        except Exception as e:
+            logger.error("Batch ingredient processing failed for %s: %s", unique_dishes[key], e)
+            errors[key] = str(e)
+            continue
+
+        invalid_names = [ingredient.get('name') for ingredient in processed_ingredients
+                         if not isinstance(ingredient.get('name'), str)]
+        if invalid_names:
+            logger.error("Batch recipe for %s has invalid ingredient names: %s", unique_dishes[key], invalid_names)
+            errors[key] = f"Invalid ingredient name: {invalid_names[0]!r}"
+            continue
+
+        processed[key] = processed_ingredients
+
+    try:
+        nutrition_lookup = get_nutrition_calculator().resolve_ingredients([
+            ingredient['name']
+            for processed_ingredients in processed.values()
+            for ingredient in processed_ingredients
+            if ingredient.get('grams')
+        ])
+    except Exception as e:
+        # Each dish then resolves its own ingredients, so a failure stays per item.
+        logger.error("Batch ingredient resolution failed: %s", e)
+        nutrition_lookup = None
+
+    for key, processed_ingredients in processed.items():
+        try:
+            results_by_dish[key] = _calculate_recipe_nutrition(
+                recipes[key], processed_ingredients, nutrition_lookup, cache_key=cache_keys[key]
+            )[1]
+        except Exception as e:
+            logger.error("Batch calculation failed for %s: %s", unique_dishes[key], e)
+            errors[key] = str(e)
+
+    results = []
+    for dish_name in dish_names:
+        if not isinstance(dish_name, str) or not dish_name.strip():
+            results.append({'dish_name': dish_name, 'error': 'Invalid dish name'})
+            continue
+
+        key = normalize_dish_name(dish_name)
+        if key in results_by_dish:
+            results.append(results_by_dish[key])
+        else:
+            results.append({'dish_name': dish_name, 'error': errors.get(key, 'Calculation failed')})
+
+    request_log.annotate(unique_dishes=len(unique_dishes), failed=len(errors))
+
+    return jsonify({'results': results})
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus text exposition of stage latencies and cache hit ratios."""
+    cache_stats = {}
+    if components['nutrition_calculator'].ready:
+        cache_stats.update(get_nutrition_calculator().cache_stats())
+    if components['recipe_fetcher'].ready and get_recipe_fetcher().cache is not None:
+        cache_stats['recipe'] = get_recipe_fetcher().cache.memory.stats()
+    if result_cache is not None:
+        cache_stats['result'] = result_cache.stats()
+
+    return Response(metrics.REGISTRY.render(cache_stats), mimetype='text/plain; version=0.0.4')
+
+@app.route('/admin/reload_database', methods=['POST'])
+def admin_reload_database():
+    """Reload the nutrition database in the background; ?wait=1 answers once it is swapped in."""
+    if not ADMIN_TOKEN:
+        return jsonify({'error': 'Not found'}), 404
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), ADMIN_TOKEN):
+        return jsonify({'error': 'Invalid admin token'}), 403
+
+    wait = request.args.get('wait') == '1'
+    reloader = get_db_reloader()
+    started = reloader.reload(reason='admin request', wait=wait)
+
+    status = reloader.status()
+    status['started'] = started
+    if wait:
+        return jsonify(status), 500 if status['state'] == 'failed' else 200
+    return jsonify(status), 202
+
+@app.route('/healthz')
+def healthz():
+    """Readiness: 200 once every component is built, 503 (and warm-up started) before that."""
+    start_warmup()
+
+    statuses = {name: component.status() for name, component in components.items()}
+    if all(component.ready for component in components.values()):
+        status = 'ready'
+    elif any(component.state == 'failed' for component in components.values()):
+        status = 'failed'
+    else:
+        status = 'warming'
+
+    return jsonify({'status': status, 'components': statuses}), 200 if status == 'ready' else 503
+
 @app.errorhandler(404)
 def page_not_found(e):
     return render_template('index.html', error="Page not found"), 404
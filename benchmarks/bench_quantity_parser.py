@@ -0,0 +1,98 @@
+"""
+Micro-benchmark: IngredientProcessor quantity parsing, compiled single-pass parser
+versus the previous loop over uncompiled patterns.
+
+    python benchmarks/bench_quantity_parser.py [--repeat N]
+"""
+
+import os
+import re
+import sys
+import timeit
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.quantity_parser import parse_quantity
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'quantity_strings.txt')
+
+LEGACY_PATTERNS = [
+    r'(\d+(?:\.\d+)?)\s*(?:-\s*\d+(?:\.\d+)?)?\s*(tablespoon|tbsp|tbs|cup|teaspoon|tsp|katori|glass|handful|pinch|gram|gm|g|kg|piece|ml|liter|lt|l)s?',
+    r'(\d+(?:\.\d+)?)\s*/\s*(\d+)\s+(tablespoon|tbsp|tbs|cup|teaspoon|tsp|katori|glass|handful|pinch|gram|gm|g|kg|piece|ml|liter|lt|l)s?',
+    r'(\d+(?:\.\d+)?)',
+]
+
+
+def legacy_parse_quantity(quantity_str):
+    """The IngredientProcessor._parse_quantity implementation this parser replaced."""
+    quantity_str = quantity_str.lower().strip()
+
+    for pattern in LEGACY_PATTERNS:
+        match = re.search(pattern, quantity_str)
+        if match:
+            if pattern.startswith(r'(\d+(?:\.\d+)?)\s*/\s*(\d+)'):
+                quantity_value = float(match.group(1)) / float(match.group(2))
+                unit = match.group(3)
+            else:
+                quantity_value = float(match.group(1))
+                unit = match.group(2) if len(match.groups()) > 1 else None
+
+            if unit:
+                if unit in ['tablespoon', 'tbsp', 'tbs']:
+                    unit = 'tablespoon'
+                elif unit in ['teaspoon', 'tsp']:
+                    unit = 'teaspoon'
+                elif unit in ['g', 'gm', 'gram']:
+                    unit = 'gram'
+                elif unit in ['kg', 'kilogram']:
+                    unit = 'kilogram'
+                    quantity_value *= 1000
+                elif unit in ['ml', 'milliliter']:
+                    unit = 'ml'
+                elif unit in ['l', 'lt', 'liter']:
+                    unit = 'liter'
+                    quantity_value *= 1000
+            else:
+                unit = 'piece'
+
+            return quantity_value, unit
+
+    return None, None
+
+
+def load_corpus(path=CORPUS_PATH):
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def bench(parse, corpus, repeat):
+    timings = timeit.repeat(lambda: [parse(quantity) for quantity in corpus], number=repeat, repeat=5)
+    return min(timings) / (repeat * len(corpus))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+
+    legacy = bench(legacy_parse_quantity, corpus, args.repeat)
+    compiled = bench(parse_quantity, corpus, args.repeat)
+
+    print(f"corpus: {len(corpus)} quantity strings")
+    print(f"legacy parser:   {legacy * 1e6:8.2f} us/string")
+    print(f"compiled parser: {compiled * 1e6:8.2f} us/string")
+    print(f"speedup:         {legacy / compiled:8.2f}x")
+
+    changed = [(quantity, legacy_parse_quantity(quantity), parse_quantity(quantity))
+               for quantity in corpus if legacy_parse_quantity(quantity) != parse_quantity(quantity)]
+    if changed:
+        print(f"\n{len(changed)} strings parse differently (legacy -> compiled):")
+        for quantity, old, new in changed:
+            print(f"  {quantity!r}: {old} -> {new}")
+
+
+if __name__ == '__main__':
+    main()
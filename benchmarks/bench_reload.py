@@ -0,0 +1,94 @@
+"""
+Ingredient lookup latency around a nutrition database hot reload.
+
+    python benchmarks/bench_reload.py [--names N]
+
+Looks ingredient names up in a loop and reports p50/p99/max lookup latency
+before the reload, while the new tables are built on the reload thread, and
+for the first pass over the same names after the swap. The reload is run
+twice: as NutritionCalculator.reload_database does it (fuzzy index built and
+lookup cache refilled before the swap), and with a plain swap of a freshly
+loaded, cold loader.
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.worker_pool import build_calculator
+
+WORDS = ["Toor Dal", "Onion", "Tomato", "Ghee", "Cumin seeds", "Salt", "Rice", "Paneer", "Butter", "Cream",
+         "Garam Masala", "Chicken", "Turmeric", "Green chillies", "Mustard oil", "Potato", "Spinach", "Methi",
+         "Coriander", "Ginger", "Garlic", "Cardamom", "Cinnamon", "Jaggery", "Curd", "Besan", "Peas", "Okra"]
+
+
+def make_names(count, seed=7):
+    rng = random.Random(seed)
+    names = set(WORDS)
+    while len(names) < count:
+        names.add(f"{rng.choice(['fresh', 'chopped', 'roasted', 'whole', 'ground', ''])} {rng.choice(WORDS)} "
+                  f"{rng.choice(['', 'powder', 'paste', 'leaves', 'seeds'])}".strip())
+    return sorted(names)
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1e6
+    return f"{len(samples):>8} {pick(0.5):>8.1f} {pick(0.99):>8.1f} {samples[-1] * 1e6:>10.1f}"
+
+
+def lookup_pass(calculator, names):
+    samples = []
+    for name in names:
+        start = time.perf_counter()
+        calculator.db_loader.find_food_match(name)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def cold_reload(calculator):
+    loader = calculator.db_loader.spawn()
+    loader.load()
+    calculator.db_loader = loader
+    return loader
+
+
+def run(label, calculator, names, reload):
+    lookup_pass(calculator, names)
+    before = lookup_pass(calculator, names)
+
+    during = []
+    thread = threading.Thread(target=reload, args=(calculator,))
+    thread.start()
+    while thread.is_alive():
+        during.extend(lookup_pass(calculator, names[:50]))
+    thread.join()
+    after = lookup_pass(calculator, names)
+
+    for phase, samples in (('before', before), ('during reload', during), ('after swap', after)):
+        print(f"{label:<12} {phase:<14} {percentiles(samples)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--names', type=int, default=500, help="distinct ingredient names looked up")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.ERROR)
+    names = make_names(args.names)
+    calculator = build_calculator()
+
+    print(f"{len(names)} names, {os.cpu_count()} CPUs; latency in microseconds\n")
+    print(f"{'reload':<12} {'phase':<14} {'lookups':>8} {'p50':>8} {'p99':>8} {'max':>10}")
+    run('warmed', calculator, names, lambda calc: calc.reload_database())
+    run('cold', calculator, names, cold_reload)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Startup benchmark: time to import the app, to answer the first requests, and
+until /healthz reports ready. Every run is a fresh interpreter.
+
+    python benchmarks/bench_startup.py [--runs N]
+
+"eager" builds every component before serving, as the app did before lazy
+initialization; "lazy" builds on first use; "warm-up" builds on the
+background thread while the first requests are served.
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+CHILD = r'''
+import json, sys, time
+start = time.perf_counter()
+import app as app_module
+timings = {'import': time.perf_counter() - start}
+timings['pandas_imported'] = 'pandas' in sys.modules
+timings['openai_imported'] = 'openai' in sys.modules
+
+if MODE == 'eager':
+    for component in app_module.components.values():
+        component.get()
+    timings['eager_build'] = time.perf_counter() - start
+
+client = app_module.app.test_client()
+
+def timed(name, call):
+    t = time.perf_counter()
+    response = call()
+    timings[name] = time.perf_counter() - t
+    return response
+
+timed('first_index', lambda: client.get('/'))
+timed('first_calculate', lambda: client.post('/api/calculate', json={'dish_name': 'Dal Tadka'}))
+
+while client.get('/healthz').status_code != 200:
+    time.sleep(0.005)
+timings['ready'] = time.perf_counter() - start
+
+print(json.dumps(timings))
+'''
+
+
+def run_child(mode):
+    env = dict(os.environ, OPENAI_API_KEY='', RECIPE_CACHE_ENABLED='0',
+               APP_WARMUP='1' if mode == 'warm-up' else '0')
+    code = f"MODE = {mode!r}\n" + CHILD
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    metrics = ['import', 'first_index', 'first_calculate', 'ready']
+    print(f"median of {args.runs} fresh processes, milliseconds\n")
+    print(f"{'mode':<10}" + "".join(f"{metric:>17}" for metric in metrics) + "   heavy imports at import")
+
+    for mode in ('eager', 'lazy', 'warm-up'):
+        runs = [run_child(mode) for _ in range(args.runs)]
+        if mode == 'eager':
+            # The eager app answered nothing until its components were built.
+            for run in runs:
+                run['import'] = run['eager_build']
+
+        medians = [statistics.median(run[metric] for run in runs) * 1000 for metric in metrics]
+        heavy = [name for name in ('pandas', 'openai') if runs[0][f'{name}_imported']]
+        print(f"{mode:<10}" + "".join(f"{value:>17.1f}" for value in medians) + f"   {', '.join(heavy) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Scaling benchmark: batch throughput and worker memory for 1..N worker processes,
+with workers sharing the parent's memory-mapped nutrition table (NutritionWorkerPool)
+versus each worker loading the CSV with pandas itself.
+
+    python benchmarks/bench_worker_pool.py [--max-workers N] [--recipes N]
+
+Memory is the summed proportional set size (PSS) of the workers, which splits
+shared pages between the processes mapping them; it needs Linux /proc.
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import utils.worker_pool as worker_pool
+from utils.worker_pool import NutritionWorkerPool, build_calculator, calculate_chunk
+
+INGREDIENTS = ["Toor Dal", "Onion", "Tomato", "Ghee", "Cumin seeds", "Salt", "Rice", "Paneer", "Butter",
+               "Cream", "Garam Masala", "Chicken", "Turmeric", "Green chillies", "Mustard oil", "Potato"]
+QUANTITIES = ["1 cup", "2 tablespoons", "1 teaspoon", "200 g", "1 medium", "2", "1/2 cup"]
+DISH_TYPES = ["Dal", "Rice", "Wet Sabzi", "Dry Sabzi"]
+CHUNK_SIZE = 64
+
+
+def make_recipes(count, seed=7):
+    rng = random.Random(seed)
+    return [(i, {
+        "dish_name": f"Dish {i}",
+        "dish_type": rng.choice(DISH_TYPES),
+        "total_cooked_weight_grams": 800,
+        "servings": 4,
+        "ingredients": [{"name": rng.choice(INGREDIENTS), "quantity": rng.choice(QUANTITIES)}
+                        for _ in range(rng.randint(4, 10))]
+    }) for i in range(count)]
+
+
+def _init_loading_worker():
+    # What a plain process pool does: every worker loads and prepares the CSV.
+    from utils.ingredient_processor import IngredientProcessor
+
+    logging.getLogger().setLevel(logging.ERROR)
+    worker_pool._processor = IngredientProcessor()
+    worker_pool._calculator = build_calculator(backend='pandas', snapshot_path=None)
+
+
+def _worker_pss_kib(_):
+    time.sleep(0.05)  # keep this worker busy so the probes spread over all workers
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            if line.startswith('Pss:'):
+                return os.getpid(), int(line.split()[1])
+    return os.getpid(), 0
+
+
+def measure(submit, workers, recipes):
+    chunks = [recipes[i:i + CHUNK_SIZE] for i in range(0, len(recipes), CHUNK_SIZE)]
+
+    start = time.perf_counter()
+    list(map(lambda future: future.result(), [submit(_worker_pss_kib, None) for _ in range(workers)]))
+    ready = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for future in [submit(calculate_chunk, chunk) for chunk in chunks]:
+        future.result()
+    elapsed = time.perf_counter() - start
+
+    pss = dict(future.result() for future in [submit(_worker_pss_kib, None) for _ in range(workers * 4)])
+    return ready, len(recipes) / elapsed, sum(pss.values()) / 1024, len(pss)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--recipes', type=int, default=5000)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.ERROR)
+    recipes = make_recipes(args.recipes)
+    calculator = build_calculator()
+
+    print(f"{args.recipes} recipes, {os.cpu_count()} CPUs\n")
+    print(f"{'workers':>7} {'mode':<14} {'startup s':>10} {'recipes/s':>10} {'workers PSS MiB':>16}")
+
+    for workers in range(1, args.max_workers + 1):
+        with NutritionWorkerPool(calculator, workers=workers, log_level=logging.ERROR) as pool:
+            shared = measure(pool.submit, workers, recipes)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_loading_worker) as executor:
+            loading = measure(executor.submit, workers, recipes)
+
+        for mode, (ready, throughput, pss, seen) in (('shared table', shared), ('per-worker CSV', loading)):
+            note = '' if seen == workers else f"  ({seen} of {workers} workers sampled)"
+            print(f"{workers:>7} {mode:<14} {ready:>10.2f} {throughput:>10.0f} {pss:>16.1f}{note}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Fixtures for the pytest-benchmark suite: the real IFCT database and the
+recipe corpus, loaded once per session.
+"""
+
+import os
+import sys
+import json
+import logging
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+DB_PATH = os.path.join(ROOT, 'attached_assets', 'Assignment Inputs - Nutrition source.csv')
+ALIASES_PATH = os.path.join(ROOT, 'attached_assets', 'ingredient_aliases.json')
+ESTIMATION_PATH = os.path.join(ROOT, 'attached_assets', 'estimation_categories.json')
+CORPUS_PATH = os.path.join(ROOT, 'attached_assets', 'recipe_corpus.json')
+
+
+@pytest.fixture(scope='session', autouse=True)
+def quiet_logging():
+    # Per-ingredient warnings would otherwise be formatted and printed inside the timed loops.
+    logging.disable(logging.WARNING)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture(scope='session')
+def recipes():
+    with open(CORPUS_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope='session')
+def processor():
+    from utils.ingredient_processor import IngredientProcessor
+
+    return IngredientProcessor()
+
+
+@pytest.fixture(scope='session')
+def classifier():
+    from utils.food_classifier import FoodClassifier
+
+    return FoodClassifier()
+
+
+@pytest.fixture(scope='session')
+def calculator():
+    from utils.nutrition_calculator import NutritionCalculator
+
+    return NutritionCalculator(DB_PATH, backend='csv', alias_path=ALIASES_PATH, estimation_path=ESTIMATION_PATH)
+
+
+@pytest.fixture(scope='session')
+def loader(calculator):
+    loader = calculator.db_loader
+    loader.warm_up()
+    return loader
+
+
+@pytest.fixture(scope='session')
+def processed_recipes(recipes, processor):
+    return [(recipe, processor.process_ingredients(recipe['ingredients'])) for recipe in recipes]
@@ -0,0 +1,178 @@
+"""
+End-to-end load test of /calculate and /api/calculate with no network.
+
+    python benchmarks/load_test.py [--requests N] [--concurrency N] [--latency-ms MS] ...
+    python benchmarks/load_test.py --url http://localhost:5000 ...
+
+Recipes come from the local corpus source (RECIPE_SOURCE=local), which
+stands in for OpenAI with the given latency, jitter and error rate. Without
+--url the app is driven in process through Flask test clients, one per
+worker thread; with --url requests go to a running server, which must have
+been started with RECIPE_SOURCE=local (and the RECIPE_SOURCE_* settings) for
+the run to stay offline.
+
+Each worker sends requests back to back. Dishes are drawn from the corpus,
+with --unique-ratio of them replaced by names never seen before, so that
+fraction misses the result cache. Reports p50/p95/p99 latency, errors and
+requests per second per endpoint.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+ENDPOINTS = {'api': '/api/calculate', 'form': '/calculate'}
+
+
+def make_dishes(corpus_path, count, unique_ratio, seed):
+    with open(corpus_path, encoding='utf-8') as f:
+        names = [recipe['dish_name'] for recipe in json.load(f)]
+    rng = random.Random(seed)
+    return [f"Load Test Dish {seed}-{index}" if rng.random() < unique_ratio else rng.choice(names)
+            for index in range(count)]
+
+
+def percentile(samples, q):
+    return samples[min(len(samples) - 1, int(q * len(samples)))] * 1000 if samples else 0.0
+
+
+class InProcessTarget:
+    """Sends requests through a Flask test client per thread."""
+
+    def __init__(self):
+        import app as app_module
+
+        self.app = app_module.app
+        self._local = threading.local()
+
+    def send(self, endpoint, dish_name):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        if endpoint == 'api':
+            response = client.post(ENDPOINTS[endpoint], json={'dish_name': dish_name})
+        else:
+            response = client.get(ENDPOINTS[endpoint], query_string={'dish_name': dish_name})
+        return response.status_code
+
+
+class HttpTarget:
+    """Sends requests to a running server."""
+
+    def __init__(self, url):
+        self.url = url.rstrip('/')
+
+    def send(self, endpoint, dish_name):
+        if endpoint == 'api':
+            request = urllib.request.Request(self.url + ENDPOINTS[endpoint],
+                                             data=json.dumps({'dish_name': dish_name}).encode('utf-8'),
+                                             headers={'Content-Type': 'application/json'})
+        else:
+            # The result page form submits with GET.
+            request = urllib.request.Request(
+                f"{self.url}{ENDPOINTS[endpoint]}?{urllib.parse.urlencode({'dish_name': dish_name})}")
+        try:
+            with urllib.request.urlopen(request, timeout=120) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+
+def run(target, endpoint, dishes, concurrency):
+    """Latencies (seconds, sorted), error count and wall time for one endpoint."""
+    latencies = []
+    errors = 0
+    position = iter(range(len(dishes)))
+    lock = threading.Lock()
+
+    def worker():
+        nonlocal errors
+        while True:
+            with lock:
+                index = next(position, None)
+            if index is None:
+                return
+            start = time.perf_counter()
+            try:
+                status = target.send(endpoint, dishes[index])
+            except Exception:
+                status = None
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                if status != 200:
+                    errors += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencies), errors, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help="base URL of a running server (default: drive the app in process)")
+    parser.add_argument('--endpoint', choices=['api', 'form', 'both'], default='both')
+    parser.add_argument('--requests', type=int, default=500, help="requests per endpoint")
+    parser.add_argument('--concurrency', type=int, default=16, help="concurrent clients")
+    parser.add_argument('--warmup', type=int, default=20, help="unmeasured requests per endpoint")
+    parser.add_argument('--unique-ratio', type=float, default=0.5,
+                        help="fraction of requests for dishes not seen before")
+    parser.add_argument('--latency-ms', type=float, default=50.0, help="recipe source base latency")
+    parser.add_argument('--jitter-ms', type=float, default=25.0, help="mean extra recipe source latency")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of recipe source calls failing")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--corpus', default=os.path.join(os.path.dirname(__file__), '..', 'attached_assets',
+                                                         'recipe_corpus.json'))
+    args = parser.parse_args()
+
+    if args.url:
+        target = HttpTarget(args.url)
+    else:
+        # Read by config when the app is imported.
+        os.environ.update({
+            'RECIPE_SOURCE': 'local',
+            'RECIPE_CORPUS_FILE': os.path.abspath(args.corpus),
+            'RECIPE_SOURCE_LATENCY_MS': str(args.latency_ms),
+            'RECIPE_SOURCE_JITTER_MS': str(args.jitter_ms),
+            'RECIPE_SOURCE_ERROR_RATE': str(args.error_rate),
+            'RECIPE_SOURCE_SEED': str(args.seed),
+            'LOG_LEVEL': os.environ.get('LOG_LEVEL', 'ERROR'),
+        })
+        target = InProcessTarget()
+        logging.getLogger().setLevel(logging.ERROR)
+
+    endpoints = ['api', 'form'] if args.endpoint == 'both' else [args.endpoint]
+    print(f"{args.requests} requests per endpoint, {args.concurrency} clients, "
+          f"recipe source {args.latency_ms:g}ms + {args.jitter_ms:g}ms jitter, {args.error_rate:.0%} errors, "
+          f"{args.unique_ratio:.0%} new dishes; latency in milliseconds\n")
+    print(f"{'endpoint':<16} {'requests':>8} {'errors':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'rps':>8}")
+
+    for offset, endpoint in enumerate(endpoints):
+        seed = args.seed + offset
+        run(target, endpoint, make_dishes(args.corpus, args.warmup, args.unique_ratio, seed + 1000),
+            args.concurrency)
+        latencies, errors, wall = run(target, endpoint,
+                                      make_dishes(args.corpus, args.requests, args.unique_ratio, seed),
+                                      args.concurrency)
+        print(f"{ENDPOINTS[endpoint]:<16} {len(latencies):>8} {errors:>7} {percentile(latencies, 0.5):>8.1f} "
+              f"{percentile(latencies, 0.95):>8.1f} {percentile(latencies, 0.99):>8.1f} "
+              f"{latencies[-1] * 1000 if latencies else 0.0:>8.1f} {len(latencies) / wall:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+pytest-benchmark suite for the request hot paths, run against the real IFCT
+CSV and the recipe corpus. It is kept out of the unit test run (pytest.ini
+only collects tests/); run it explicitly:
+
+    pytest benchmarks --benchmark-autosave                 # record a baseline
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=median:15%
+
+Install the suite's dependencies with ``pip install -r requirements-dev.txt``.
+Baselines are saved under .benchmarks/ per machine and Python version, and
+are not committed: timings only compare against runs on the same machine.
+The second command compares against the latest one and fails any benchmark
+whose median got more than 15% slower.
+"""
+
+import os
+import sys
+import subprocess
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from conftest import ALIASES_PATH, DB_PATH, ROOT
+
+# (ingredient, stage of NutritionDatabaseLoader._find_match that resolves it)
+LOOKUP_CASES = [
+    ('toor dal', 'alias'),
+    ('makhana', 'exact'),
+    ('roasted groundnut', 'fuzzy'),
+    ('dal', 'substring'),
+    ('chopped fresh coriander', 'word_fallback'),
+    ('xyzzy foo', 'miss'),
+]
+
+
+def match_stage(loader, name):
+    """The stage of NutritionDatabaseLoader._find_match that resolves ``name``, checked in the same order."""
+    name_lower = name.lower()
+    if loader.aliases.lookup(name) is not None:
+        return 'alias'
+    if loader.index.find_exact(name_lower)[0] is not None:
+        return 'exact'
+    best = loader.fuzzy_index.top_k(name_lower, 1)
+    if best and best[0][1] >= loader.match_threshold:
+        return 'fuzzy'
+    if loader.index.find_containing(name_lower)[0] is not None:
+        return 'substring'
+    if loader._find_row(name)[0] is not None:
+        return 'word_fallback'
+    return 'miss'
+
+
+@pytest.mark.parametrize('backend', ['csv', 'pandas'])
+def test_load_database(benchmark, backend):
+    from utils.db_loader import NutritionDatabaseLoader
+
+    def fresh_loader():
+        return (NutritionDatabaseLoader(DB_PATH, backend=backend, alias_path=ALIASES_PATH),), {}
+
+    table = benchmark.pedantic(lambda loader: loader.load_database(), setup=fresh_loader, rounds=5)
+    assert len(table) > 1000
+
+
+@pytest.mark.parametrize('name,stage', LOOKUP_CASES, ids=[stage for _, stage in LOOKUP_CASES])
+def test_get_ingredient_nutrition_uncached(benchmark, loader, name, stage):
+    # Otherwise a data or matcher change would silently time a different stage.
+    assert match_stage(loader, name) == stage
+
+    def lookup():
+        loader.lookup_cache.invalidate()
+        return loader.get_ingredient_nutrition(name)
+
+    result = benchmark(lookup)
+    assert (result is None) == (stage == 'miss')
+
+
+def test_get_ingredient_nutrition_cached(benchmark, loader):
+    loader.get_ingredient_nutrition('paneer')
+
+    assert benchmark(loader.get_ingredient_nutrition, 'paneer') is not None
+
+
+@pytest.mark.parametrize('mode', ['per_name', 'bulk'])
+def test_corpus_ingredient_lookups_uncached(benchmark, loader, recipes, mode):
+    names = [ingredient['name'] for recipe in recipes for ingredient in recipe['ingredients']]
+
+    def lookup():
+        loader.lookup_cache.invalidate()
+        if mode == 'bulk':
+            return loader.get_ingredients_nutrition(names)
+        return [loader.get_ingredient_nutrition(name) for name in names]
+
+    assert len(benchmark(lookup)) == len(names)
+
+
+def test_process_ingredients(benchmark, processor, recipes):
+    def process_corpus():
+        return [processor.process_ingredients(recipe['ingredients']) for recipe in recipes]
+
+    assert len(benchmark(process_corpus)) == len(recipes)
+
+
+@pytest.mark.parametrize('source', ['dish_type', 'dish_name', 'ingredients'])
+def test_classify_dish(benchmark, classifier, recipes, source):
+    if source == 'dish_type':
+        calls = [(recipe['dish_name'], recipe['dish_type'], None) for recipe in recipes]
+    elif source == 'dish_name':
+        calls = [(recipe['dish_name'], None, None) for recipe in recipes]
+    else:
+        calls = [(f"House special {index}", None, recipe['ingredients']) for index, recipe in enumerate(recipes)]
+
+    def classify_corpus():
+        return [classifier.classify_dish(*call) for call in calls]
+
+    assert len(benchmark(classify_corpus)) == len(recipes)
+
+
+def test_calculate_nutrition(benchmark, calculator, processed_recipes):
+    def calculate_corpus():
+        return [calculator.calculate_nutrition(recipe['dish_name'], recipe['dish_type'], processed,
+                                               recipe['total_cooked_weight_grams'], recipe['servings'])
+                for recipe, processed in processed_recipes]
+
+    assert len(benchmark(calculate_corpus)) == len(processed_recipes)
+
+
+def test_calculate_nutrition_cold_lookups(benchmark, calculator, processed_recipes):
+    def calculate_corpus():
+        calculator.invalidate_caches()
+        return [calculator.calculate_nutrition(recipe['dish_name'], recipe['dish_type'], processed,
+                                               recipe['total_cooked_weight_grams'], recipe['servings'])
+                for recipe, processed in processed_recipes]
+
+    assert len(benchmark.pedantic(calculate_corpus, rounds=10)) == len(processed_recipes)
+
+
+def test_app_cold_import(benchmark):
+    env = dict(os.environ, APP_WARMUP='0', RECIPE_CACHE_ENABLED='0', LOG_LEVEL='ERROR')
+
+    def import_app():
+        subprocess.run([sys.executable, '-c', 'import app'], cwd=ROOT, env=env, check=True)
+
+    benchmark.pedantic(import_app, rounds=5)
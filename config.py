@@ -1,9 +1,81 @@
 import os
+import tempfile
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
 NUTRITION_DB_FILE = "attached_assets/Assignment Inputs - Nutrition source.csv"
 
+# Prepared tables built by `python -m utils.db_snapshot`; ignored when missing or stale.
+NUTRITION_SNAPSHOT_FILE = os.getenv("NUTRITION_SNAPSHOT_FILE", "attached_assets/nutrition_snapshot.npz")
+
+# "csv" parses the database with the stdlib csv module, so pandas is not needed to serve
+# requests; "pandas" uses pandas.read_csv. Both build identical lookup tables.
+NUTRITION_DB_BACKEND = os.getenv("NUTRITION_DB_BACKEND", "csv")
+
+# Keep every numeric IFCT column (micronutrients, unit_serving_*) for /api/calculate "nutrients".
+NUTRITION_FULL_PROFILE = os.getenv("NUTRITION_FULL_PROFILE", "0") == "1"
+
+# Kitchen and Hindi ingredient names mapped to IFCT food codes, checked before any other matching.
+INGREDIENT_ALIASES_FILE = os.getenv("INGREDIENT_ALIASES_FILE", "attached_assets/ingredient_aliases.json")
+
+# Nutrient estimates per category (with their keywords) for ingredients the database does not match.
+ESTIMATION_CATEGORIES_FILE = os.getenv("ESTIMATION_CATEGORIES_FILE", "attached_assets/estimation_categories.json")
+
+# Fuzzy ingredient matches scoring below this (0-1) fall back to substring search.
+INGREDIENT_MATCH_THRESHOLD = float(os.getenv("INGREDIENT_MATCH_THRESHOLD", "0.5"))
+
+INGREDIENT_CACHE_SIZE = int(os.getenv("INGREDIENT_CACHE_SIZE", "2048"))
+
+RECIPE_CACHE_ENABLED = os.getenv("RECIPE_CACHE_ENABLED", "1") == "1"
+RECIPE_CACHE_PATH = os.getenv("RECIPE_CACHE_PATH",
+                              os.path.join(tempfile.gettempdir(), "nutrition_calculator_recipes.sqlite3"))
+RECIPE_CACHE_TTL_SECONDS = int(os.getenv("RECIPE_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+RECIPE_CACHE_MAX_ENTRIES = int(os.getenv("RECIPE_CACHE_MAX_ENTRIES", "5000"))
+
+# Reload the nutrition database and alias files when they change, checking every N
+# seconds (0 turns watching off). POST /admin/reload_database reloads on demand; it
+# is only enabled when ADMIN_TOKEN is set, and must send it as X-Admin-Token.
+NUTRITION_DB_WATCH_SECONDS = float(os.getenv("NUTRITION_DB_WATCH_SECONDS", "0"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# Computed results keyed by recipe content and nutrition database version, so a
+# recipe seen before is answered with one lookup.
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "1") == "1"
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "1024"))
+
+# Level of the application log. Per-ingredient messages are summarized into one
+# record per request; LOG_FORMAT=json writes one JSON object per record.
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+# Fraction of requests (0-1) that also log each per-ingredient message, whatever LOG_LEVEL is.
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0"))
+
+# Requests sending an X-Debug-Timing header get a per-stage timing breakdown
+# (debug_timing in JSON bodies, and a Server-Timing header).
+DEBUG_TIMING_ENABLED = os.getenv("DEBUG_TIMING_ENABLED", "1") == "1"
+
+BATCH_MAX_DISHES = int(os.getenv("BATCH_MAX_DISHES", "100"))
+
+RECIPE_FETCH_MAX_CONCURRENCY = int(os.getenv("RECIPE_FETCH_MAX_CONCURRENCY", "8"))
+RECIPE_FETCH_TIMEOUT_SECONDS = float(os.getenv("RECIPE_FETCH_TIMEOUT_SECONDS", "30"))
+
+# Where uncached recipes come from: "openai", or "local" to serve them from
+# RECIPE_CORPUS_FILE with no network (for load tests). The local source waits
+# RECIPE_SOURCE_LATENCY_MS plus a random extra delay averaging
+# RECIPE_SOURCE_JITTER_MS per call, fails RECIPE_SOURCE_ERROR_RATE (0-1) of
+# calls, and draws both from RECIPE_SOURCE_SEED. Its recipes are not written
+# to the recipe cache.
+RECIPE_SOURCE = os.getenv("RECIPE_SOURCE", "openai")
+RECIPE_CORPUS_FILE = os.getenv("RECIPE_CORPUS_FILE", "attached_assets/recipe_corpus.json")
+RECIPE_SOURCE_LATENCY_MS = float(os.getenv("RECIPE_SOURCE_LATENCY_MS", "0"))
+RECIPE_SOURCE_JITTER_MS = float(os.getenv("RECIPE_SOURCE_JITTER_MS", "0"))
+RECIPE_SOURCE_ERROR_RATE = float(os.getenv("RECIPE_SOURCE_ERROR_RATE", "0"))
+RECIPE_SOURCE_SEED = int(os.getenv("RECIPE_SOURCE_SEED", "0"))
+
+# Build the nutrition tables and recipe fetchers on a background thread at startup.
+# When off, each is built by the first request that needs it.
+APP_WARMUP = os.getenv("APP_WARMUP", "1") == "1"
+
 FOOD_CATEGORIES = {
     "Wet Sabzi": {"serving_unit": "katori", "serving_grams": 180},
     "Dry Sabzi": {"serving_unit": "katori", "serving_grams": 150},
@@ -0,0 +1,316 @@
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("RECIPE_CACHE_ENABLED", "0")
+os.environ.setdefault("APP_WARMUP", "0")
+
+import app as app_module
+from utils.lru_cache import LRUCache
+
+RECIPES = {
+    "jeera rice": {
+        "dish_name": "Jeera Rice",
+        "dish_type": "Rice",
+        "total_cooked_weight_grams": 600,
+        "servings": 4,
+        "ingredients": [
+            {"name": "Rice", "quantity": "1 cup"},
+            {"name": "Ghee", "quantity": "1 tablespoon"},
+            {"name": "Salt", "quantity": "1 teaspoon"}
+        ]
+    },
+    "dal tadka": {
+        "dish_name": "Dal Tadka",
+        "dish_type": "Dal",
+        "total_cooked_weight_grams": 800,
+        "servings": 4,
+        "ingredients": [
+            {"name": "Toor Dal", "quantity": "1 cup"},
+            {"name": "Ghee", "quantity": "1 tablespoon"},
+            {"name": "Salt", "quantity": "1 teaspoon"}
+        ]
+    },
+    "broken dal": {
+        "dish_name": "Broken Dal",
+        "dish_type": "Dal",
+        "servings": 4,
+        "ingredients": [
+            {"name": 5, "quantity": "100 g"},
+            {"name": "Salt", "quantity": "1 teaspoon"}
+        ]
+    }
+}
+
+def fake_fetch_recipe(dish_name):
+    if dish_name.lower() not in RECIPES:
+        raise RuntimeError("upstream unavailable")
+    return RECIPES[dish_name.lower()]
+
+class TestBatchEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app_module.app.test_client()
+        recipe_fetcher = app_module.get_recipe_fetcher()
+        patcher = patch.multiple(recipe_fetcher, api_key=None, cache=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = patch.object(recipe_fetcher, '_get_fallback_recipe', side_effect=fake_fetch_recipe)
+        self.fetch_recipe = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_results_in_request_order_with_duplicates_collapsed(self):
+        response = self.client.post('/api/calculate_batch', json={
+            'dish_names': ['Jeera Rice', 'Dal Tadka', 'jeera  rice']
+        })
+
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()['results']
+        self.assertEqual([result['dish_name'] for result in results],
+                         ['Jeera Rice', 'Dal Tadka', 'Jeera Rice'])
+        self.assertEqual(results[0], results[2])
+        self.assertEqual(self.fetch_recipe.call_count, 2)
+
+    def test_matches_single_dish_endpoint(self):
+        single = self.client.post('/api/calculate', json={'dish_name': 'Dal Tadka'}).get_json()
+        batch = self.client.post('/api/calculate_batch', json={'dish_names': ['Dal Tadka']}).get_json()
+
+        self.assertEqual(batch['results'][0], single)
+
+    def test_reports_errors_per_item(self):
+        response = self.client.post('/api/calculate_batch', json={
+            'dish_names': ['Jeera Rice', 'Unknown Dish', '']
+        })
+
+        results = response.get_json()['results']
+        self.assertNotIn('error', results[0])
+        self.assertIn('upstream unavailable', results[1]['error'])
+        self.assertEqual(results[2]['error'], 'Invalid dish name')
+
+    def test_reports_invalid_ingredient_names_per_item(self):
+        response = self.client.post('/api/calculate_batch', json={
+            'dish_names': ['Broken Dal', 'Jeera Rice']
+        })
+
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()['results']
+        self.assertEqual(results[0]['error'], 'Invalid ingredient name: 5')
+        self.assertNotIn('error', results[1])
+
+    def test_rejects_invalid_payload(self):
+        self.assertEqual(self.client.post('/api/calculate_batch', json={}).status_code, 400)
+        too_many = {'dish_names': ['Dal Tadka'] * (app_module.BATCH_MAX_DISHES + 1)}
+        self.assertEqual(self.client.post('/api/calculate_batch', json=too_many).status_code, 400)
+
+class TestHealthz(unittest.TestCase):
+
+    def test_reports_ready_once_components_are_built(self):
+        client = app_module.app.test_client()
+        for component in app_module.components.values():
+            component.get()
+
+        response = client.get('/healthz')
+
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual(body['status'], 'ready')
+        self.assertEqual(body['components']['nutrition_calculator']['state'], 'ready')
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app_module.app.test_client()
+        patcher = patch.object(app_module, 'result_cache', app_module.ResultCache(16))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        recipe_fetcher = app_module.get_recipe_fetcher()
+        patcher = patch.multiple(recipe_fetcher, api_key=None, cache=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = patch.object(recipe_fetcher, '_get_fallback_recipe', side_effect=fake_fetch_recipe)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_repeated_recipe_is_served_from_cache(self):
+        calculator = app_module.get_nutrition_calculator()
+        with patch.object(calculator, 'calculate_nutrition', wraps=calculator.calculate_nutrition) as calculate:
+            first = self.client.post('/api/calculate', json={'dish_name': 'Dal Tadka'}).get_json()
+            second = self.client.post('/api/calculate', json={'dish_name': 'dal tadka'}).get_json()
+            batch = self.client.post('/api/calculate_batch', json={'dish_names': ['Dal Tadka']}).get_json()
+
+        self.assertEqual(calculate.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(batch['results'][0], first)
+        self.assertEqual(app_module.result_cache.stats()['hits'], 2)
+
+    def test_result_page_etag(self):
+        response = self.client.get('/calculate', query_string={'dish_name': 'Jeera Rice'})
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+
+        repeat = self.client.get('/calculate', query_string={'dish_name': 'Jeera Rice'},
+                                 headers={'If-None-Match': etag})
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(repeat.headers['ETag'], etag)
+
+        other = self.client.get('/calculate', query_string={'dish_name': 'Dal Tadka'},
+                                headers={'If-None-Match': etag})
+        self.assertEqual(other.status_code, 200)
+        self.assertNotEqual(other.headers['ETag'], etag)
+
+    def test_result_page_over_post_has_no_etag(self):
+        response = self.client.post('/calculate', data={'dish_name': 'Jeera Rice'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response.headers)
+        self.assertEqual(self.client.get('/calculate').status_code, 302)
+
+class TestRecalculateEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app_module.app.test_client()
+        patcher = patch.object(app_module.get_async_recipe_fetcher(), 'fetch_recipe', side_effect=fake_fetch_recipe)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_recalculates_from_handle(self):
+        original = self.client.post('/api/calculate', json={'dish_name': 'Dal Tadka'}).get_json()
+
+        response = self.client.post('/api/recalculate', json={
+            'recipe_handle': original['recipe_handle'],
+            'servings': 2,
+            'serving_grams': 400,
+            'substitutions': [{'ingredient': 'Ghee', 'name': 'Mustard oil', 'quantity': '2 tablespoons'}]
+        })
+
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual(body['serving_size_grams'], 400)
+        self.assertEqual(body['ingredients_used'][1]['ingredient'], 'Mustard oil')
+        self.assertEqual(body['ingredients_used'][1]['quantity'], '2 tablespoons')
+
+    def test_substitution_names_are_matched_literally(self):
+        original = self.client.post('/api/calculate', json={'dish_name': 'Dal Tadka'}).get_json()
+
+        start = time.perf_counter()
+        response = self.client.post('/api/recalculate', json={
+            'recipe_handle': original['recipe_handle'],
+            'substitutions': [{'ingredient': 'Toor Dal', 'name': '(\\w+\\s?)+$!'},
+                              {'name': '(a+)+$ (x|xx)*y', 'grams': 10}]
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertLess(time.perf_counter() - start, 2.0)
+
+    def test_cached_result_keeps_its_handle_valid(self):
+        calculator = app_module.get_nutrition_calculator()
+        patcher = patch.multiple(app_module, result_cache=app_module.ResultCache(16))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(calculator, 'resolved_recipes', LRUCache(1))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        handle = self.client.post('/api/calculate', json={'dish_name': 'Dal Tadka'}).get_json()['recipe_handle']
+        self.client.post('/api/calculate', json={'dish_name': 'Jeera Rice'})
+        self.assertEqual(self.client.post('/api/recalculate', json={'recipe_handle': handle}).status_code, 404)
+
+        again = self.client.post('/api/calculate', json={'dish_name': 'Dal Tadka'}).get_json()
+        self.assertEqual(again['recipe_handle'], handle)
+        self.assertEqual(app_module.result_cache.stats()['hits'], 1)
+        self.assertEqual(self.client.post('/api/recalculate', json={'recipe_handle': handle}).status_code, 200)
+
+    def test_rejects_unknown_handle_and_bad_input(self):
+        self.assertEqual(self.client.post('/api/recalculate', json={'recipe_handle': 'nope'}).status_code, 404)
+        self.assertEqual(self.client.post('/api/recalculate', json={}).status_code, 400)
+        self.assertEqual(self.client.post('/api/recalculate', json={'recipe_handle': 'nope', 'servings': -1})
+                         .status_code, 400)
+
+class TestAdminReload(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app_module.app.test_client()
+
+    def test_disabled_without_admin_token(self):
+        with patch.object(app_module, 'ADMIN_TOKEN', ''):
+            self.assertEqual(self.client.post('/admin/reload_database').status_code, 404)
+
+    def test_reload_requires_token_and_swaps_tables(self):
+        calculator = app_module.get_nutrition_calculator()
+        old_loader = calculator.db_loader
+
+        with patch.object(app_module, 'ADMIN_TOKEN', 'secret'):
+            denied = self.client.post('/admin/reload_database', headers={'X-Admin-Token': 'wrong'})
+            response = self.client.post('/admin/reload_database?wait=1', headers={'X-Admin-Token': 'secret'})
+
+        self.assertEqual(denied.status_code, 403)
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertTrue(body['started'])
+        self.assertEqual(body['version'], old_loader.version)
+        self.assertIsNot(calculator.db_loader, old_loader)
+
+class TestRecipeSourceSetting(unittest.TestCase):
+
+    def test_local_source_serves_corpus_recipes_without_recipe_cache(self):
+        with patch.multiple(app_module, RECIPE_SOURCE='local', RECIPE_CACHE_ENABLED=True):
+            fetcher = app_module._build_recipe_fetcher()
+
+        self.assertEqual(fetcher.source.name, 'local')
+        self.assertIsNone(fetcher.cache)
+        self.assertEqual(fetcher.fetch_recipe('Dal Makhani')['dish_type'], 'Dal')
+
+    def test_unknown_source_is_rejected(self):
+        with patch.object(app_module, 'RECIPE_SOURCE', 'carrier-pigeon'):
+            with self.assertRaises(ValueError):
+                app_module._build_recipe_fetcher()
+
+class TestTimingAndMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app_module.app.test_client()
+        patcher = patch.object(app_module.get_async_recipe_fetcher(), 'fetch_recipe', side_effect=fake_fetch_recipe)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_debug_timing_header_adds_stage_breakdown(self):
+        patcher = patch.object(app_module, 'result_cache', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        response = self.client.post('/api/calculate', json={'dish_name': 'Dal Tadka'},
+                                    headers={'X-Debug-Timing': '1'})
+
+        self.assertEqual(response.status_code, 200)
+        timing = response.get_json()['debug_timing']
+        for stage in ('fetch_recipe', 'process_ingredients', 'calculate_nutrition', 'classify_dish',
+                      'ingredient_lookup_batch'):
+            self.assertIn(stage, timing['stages'])
+        self.assertEqual(timing['stages']['ingredient_lookup_batch']['calls'], 1)
+        self.assertIn('total;dur=', response.headers['Server-Timing'])
+
+        plain = self.client.post('/api/calculate', json={'dish_name': 'Dal Tadka'})
+        self.assertNotIn('debug_timing', plain.get_json())
+        self.assertNotIn('Server-Timing', plain.headers)
+
+    def test_metrics_exposes_stage_histograms_and_cache_ratios(self):
+        self.client.post('/api/calculate', json={'dish_name': 'Dal Tadka'})
+
+        response = self.client.get('/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        text = response.get_data(as_text=True)
+        self.assertIn('nutrition_stage_duration_seconds_count{stage="calculate_nutrition"}', text)
+        self.assertIn('nutrition_stage_duration_seconds_count{stage="ingredient_lookup_batch"}', text)
+        self.assertIn('nutrition_request_duration_seconds_count{endpoint="api_calculate"}', text)
+        self.assertIn('nutrition_cache_hit_ratio{cache="ingredient_lookup"}', text)
+
+if __name__ == '__main__':
+    unittest.main()
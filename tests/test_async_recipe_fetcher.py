@@ -0,0 +1,109 @@
+import os
+import sys
+import json
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.recipe_fetcher import RecipeFetcher
+from utils.async_recipe_fetcher import AsyncRecipeFetcher
+from utils.recipe_source import LocalCorpusSource
+
+SAMPLE_RECIPE = {
+    "dish_name": "Jeera Rice",
+    "dish_type": "Rice",
+    "total_cooked_weight_grams": 600,
+    "servings": 4,
+    "ingredients": [{"name": "Basmati Rice", "quantity": "1 cup"}]
+}
+
+class FakeCompletions:
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return MagicMock(choices=[MagicMock(message=MagicMock(content=json.dumps(SAMPLE_RECIPE)))])
+
+class TestAsyncRecipeFetcher(unittest.TestCase):
+
+    def make_fetcher(self, delay=0.05, **kwargs):
+        recipe_fetcher = RecipeFetcher.__new__(RecipeFetcher)
+        recipe_fetcher.api_key = "test-key"
+        recipe_fetcher.cache = None
+        recipe_fetcher.source = None
+
+        fetcher = AsyncRecipeFetcher(recipe_fetcher, **kwargs)
+        completions = FakeCompletions(delay)
+        fetcher.client = MagicMock()
+        fetcher.client.chat.completions = completions
+        self.addCleanup(fetcher.close)
+        return fetcher, completions
+
+    def test_coalesces_concurrent_requests_for_same_dish(self):
+        fetcher, completions = self.make_fetcher()
+
+        results = fetcher.fetch_recipes(["Jeera Rice"] * 10 + ["jeera  rice!"])
+
+        self.assertEqual(completions.calls, 1)
+        self.assertTrue(all(result == SAMPLE_RECIPE for result in results))
+        self.assertIsNot(results[0], results[1])
+
+    def test_limits_upstream_concurrency(self):
+        fetcher, completions = self.make_fetcher(max_concurrency=2)
+
+        fetcher.fetch_recipes([f"Dish {index}" for index in range(6)])
+
+        self.assertEqual(completions.calls, 6)
+        self.assertEqual(completions.max_active, 2)
+
+    def test_timeout_uses_fallback_recipe(self):
+        fetcher, _ = self.make_fetcher(delay=1.0, timeout=0.05)
+
+        recipe = fetcher.fetch_recipe("Aloo Gobi")
+
+        self.assertEqual(recipe["dish_name"], "Aloo Gobi")
+        self.assertEqual(recipe["dish_type"], "Dry Sabzi")
+
+    def test_shares_local_recipe_steps_with_sync_fetcher(self):
+        fetcher, completions = self.make_fetcher()
+        fetcher.recipe_fetcher.cache = MagicMock()
+        fetcher.recipe_fetcher.cache.get.return_value = SAMPLE_RECIPE
+
+        self.assertEqual(fetcher.fetch_recipe("Jeera Rice"), SAMPLE_RECIPE)
+
+        fetcher.recipe_fetcher.cache = None
+        fetcher.recipe_fetcher.api_key = None
+        recipe = fetcher.fetch_recipe("Dal Makhani")
+
+        self.assertEqual(recipe, fetcher.recipe_fetcher.fetch_recipe("Dal Makhani"))
+        self.assertEqual(completions.calls, 0)
+
+    def test_recipe_source_replaces_openai(self):
+        fetcher, completions = self.make_fetcher(max_concurrency=2, timeout=0.5)
+        fetcher.recipe_fetcher.api_key = None
+        fetcher.recipe_fetcher.source = LocalCorpusSource([SAMPLE_RECIPE], latency_ms=20)
+
+        results = fetcher.fetch_recipes(["Jeera Rice", "Dish 1", "Dish 2"])
+
+        self.assertEqual(results[0], SAMPLE_RECIPE)
+        self.assertEqual(results[1]["dish_name"], "Dish 1")
+        self.assertEqual(completions.calls, 0)
+
+        fetcher.recipe_fetcher.source.latency_ms = 1000
+        self.assertEqual(fetcher.fetch_recipe("Aloo Gobi")["dish_type"], "Dry Sabzi")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import io
+import os
+import sys
+import csv
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.bulk_nutrition import read_recipes, run
+
+RECIPE = {
+    "dish_name": "Jeera Rice",
+    "dish_type": "Rice",
+    "total_cooked_weight_grams": 600,
+    "servings": 4,
+    "ingredients": [
+        {"name": "Rice", "quantity": "1 cup"},
+        {"name": "Ghee", "quantity": "1 tablespoon"},
+        {"name": "Cumin seeds", "quantity": "1 teaspoon"}
+    ]
+}
+
+class TestBulkNutrition(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        return path
+
+    def test_streams_jsonl_in_input_order(self):
+        records = [dict(RECIPE, dish_name=f"Jeera Rice {i}") for i in range(7)]
+        lines = [json.dumps(record) for record in records]
+        lines[3] = "{not json"
+        path = self.write('recipes.jsonl', "\n".join(lines) + "\n\n")
+
+        output = io.StringIO()
+        stats = run(read_recipes(path), output, workers=2, chunk_size=2)
+
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([result['line'] for result in results], list(range(1, 8)))
+        self.assertIn('Invalid record', results[3]['error'])
+        self.assertEqual(results[6]['dish_name'], "Jeera Rice 6")
+        self.assertIn('estimated_nutrition_per_katori', results[0])
+        self.assertEqual((stats['recipes'], stats['errors']), (7, 1))
+        self.assertGreater(stats['recipes_per_second'], 0)
+
+    def test_reads_csv_with_json_ingredients(self):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(RECIPE))
+        writer.writeheader()
+        writer.writerow(dict(RECIPE, ingredients=json.dumps(RECIPE['ingredients'])))
+        writer.writerow(dict(RECIPE, dish_name='', ingredients='[]'))
+        path = self.write('recipes.csv', buffer.getvalue())
+
+        records = list(read_recipes(path))
+        self.assertEqual(records[0][1], RECIPE)
+
+        output = io.StringIO()
+        run(iter(records), output, workers=1)
+
+        first, second = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(first['dish_name'], "Jeera Rice")
+        self.assertEqual(second['error'], "Record needs a dish_name and an ingredients list")
+
+    def test_full_profile_follows_config(self):
+        path = self.write('recipes.jsonl', json.dumps(RECIPE) + "\n")
+
+        output = io.StringIO()
+        with patch('config.NUTRITION_FULL_PROFILE', True):
+            run(read_recipes(path), output, workers=1, nutrients=['iron_mg'])
+        result = json.loads(output.getvalue())
+        self.assertEqual(list(result['nutrient_profile_per_katori']), ['iron_mg'])
+
+        with self.assertRaises(ValueError):
+            run(read_recipes(path), io.StringIO(), workers=1, nutrients='all')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import importlib.util
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import NUTRITION_DB_FILE
+from utils.db_loader import NutritionDatabaseLoader
+from utils.nutrition_calculator import NutritionCalculator
+from utils.ingredient_processor import IngredientProcessor
+
+DB_PATH = os.path.join(os.path.dirname(__file__), '..', NUTRITION_DB_FILE)
+
+HAS_PANDAS = importlib.util.find_spec('pandas') is not None
+
+LOOKUPS = ["Onion", "onion", "Tomato", "Basmati Rice", "ghee", "Green chillies", "toor dal",
+           "Paneer", "garam masala powder", "fresh coriander leaves", "Salt", "Water",
+           "chicken breast", "xyz unknown ingredient", "mustard oil"]
+
+RECIPE = [
+    {"name": "Toor Dal", "quantity": "1 cup"},
+    {"name": "Onion", "quantity": "1 medium"},
+    {"name": "Tomato", "quantity": "2"},
+    {"name": "Ghee", "quantity": "1 tablespoon"},
+    {"name": "Cumin seeds", "quantity": "1 teaspoon"},
+    {"name": "Salt", "quantity": "to taste"}
+]
+
+def load(path, backend, full_profile=False):
+    loader = NutritionDatabaseLoader(path, full_profile=full_profile, backend=backend)
+    loader.load()
+    return loader
+
+@unittest.skipUnless(HAS_PANDAS, "parity is checked against the pandas backend")
+class TestCsvBackendParity(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pandas_loader = load(DB_PATH, 'pandas', full_profile=True)
+        cls.csv_loader = load(DB_PATH, 'csv', full_profile=True)
+
+    def test_builds_identical_tables(self):
+        self.assertEqual(self.csv_loader.food_codes, self.pandas_loader.food_codes)
+        self.assertEqual(self.csv_loader.food_names, self.pandas_loader.food_names)
+        self.assertEqual(self.csv_loader.index.names, self.pandas_loader.index.names)
+        np.testing.assert_array_equal(self.csv_loader.nutrient_matrix, self.pandas_loader.nutrient_matrix)
+
+    def test_builds_identical_profile(self):
+        self.assertEqual(self.csv_loader.profile_columns, self.pandas_loader.profile_columns)
+        self.assertEqual(self.csv_loader.profile_matrix.dtype, self.pandas_loader.profile_matrix.dtype)
+        np.testing.assert_array_equal(self.csv_loader.profile_matrix, self.pandas_loader.profile_matrix)
+
+    def test_lookups_match(self):
+        for name in LOOKUPS + self.pandas_loader.food_names[::50]:
+            self.assertEqual(self.csv_loader.get_ingredient_nutrition(name),
+                             self.pandas_loader.get_ingredient_nutrition(name), name)
+            self.assertEqual(self.csv_loader.get_ingredient_profile(name),
+                             self.pandas_loader.get_ingredient_profile(name), name)
+
+    def test_dataframe_matches(self):
+        self.assertTrue(self.csv_loader.nutrition_df.equals(self.pandas_loader.nutrition_df))
+
+    def test_recipe_totals_match(self):
+        ingredients = IngredientProcessor().process_ingredients(RECIPE)
+        results = [
+            NutritionCalculator(DB_PATH, backend=backend).calculate_nutrition(
+                "Dal Tadka", "Dal", ingredients, 800, 4)
+            for backend in ('pandas', 'csv')
+        ]
+        self.assertEqual(results[0], results[1])
+
+    def test_missing_cells_and_columns_match(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'foods.csv')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("food_code,food_name,energy_kcal,carb_g,protein_g,fat_g,iron_mg,notes,empty\n"
+                    "A001,Wheat Flour,341,64.2,10.6,1.5,NA,whole,\n"
+                    "A002,Rice Flakes,,76.7,NaN,1.1,4.5,,\n"
+                    "A003,\"Dal, moong\",334,56.7,23.9,1.35,3.9,split,\n")
+
+        pandas_loader = load(path, 'pandas', full_profile=True)
+        csv_loader = load(path, 'csv', full_profile=True)
+
+        self.assertEqual(csv_loader.food_names, pandas_loader.food_names)
+        np.testing.assert_array_equal(csv_loader.nutrient_matrix, pandas_loader.nutrient_matrix)
+        self.assertEqual(csv_loader.profile_columns, pandas_loader.profile_columns)
+        np.testing.assert_array_equal(csv_loader.profile_matrix, pandas_loader.profile_matrix)
+        self.assertEqual(csv_loader.get_ingredient_nutrition('moong'),
+                         pandas_loader.get_ingredient_nutrition('moong'))
+
+class TestCsvBackend(unittest.TestCase):
+
+    def test_rejects_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            NutritionDatabaseLoader(DB_PATH, backend='excel')
+
+    def test_rejects_text_nutrient_column(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'foods.csv')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("food_code,food_name,energy_kcal,carb_g,protein_g,fat_g,fibre_g\n"
+                    "A001,Wheat Flour,high,64.2,10.6,1.5,11.2\n")
+
+        with self.assertRaises(ValueError):
+            load(path, 'csv')
+
+if __name__ == '__main__':
+    unittest.main()
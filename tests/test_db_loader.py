@@ -0,0 +1,106 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import NUTRITION_DB_FILE
+from utils.db_loader import NutritionDatabaseLoader
+from utils.nutrition_calculator import NutritionCalculator
+
+DB_PATH = os.path.join(os.path.dirname(__file__), '..', NUTRITION_DB_FILE)
+
+class TestFullProfile(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.loader = NutritionDatabaseLoader(DB_PATH, full_profile=True)
+        cls.loader.load_database()
+
+    def test_profile_keeps_micronutrients(self):
+        self.assertIn('sodium_mg', self.loader.profile_columns)
+        self.assertIn('unit_serving_iron_mg', self.loader.profile_columns)
+        self.assertEqual(self.loader.profile_matrix.dtype.name, 'float32')
+        self.assertEqual(self.loader.profile_matrix.shape[0], len(self.loader.nutrient_matrix))
+
+    def test_profile_matches_core_nutrients(self):
+        nutrition = self.loader.get_ingredient_nutrition('Onion')
+        profile = self.loader.get_ingredient_profile('Onion', ['energy_kcal', 'protein_g'])
+
+        self.assertEqual(profile['ingredient'], nutrition['ingredient'])
+        self.assertAlmostEqual(profile['energy_kcal'], nutrition['calories'], places=3)
+        self.assertAlmostEqual(profile['protein_g'], nutrition['protein'], places=3)
+
+    def test_resolve_profile_columns(self):
+        columns = self.loader.resolve_profile_columns('all')
+        self.assertIn('calcium_mg', columns)
+        self.assertFalse(any(column.startswith('unit_serving_') for column in columns))
+
+        self.assertEqual(self.loader.resolve_profile_columns(['iron_mg', 'iron_mg']), ['iron_mg'])
+        with self.assertRaises(ValueError):
+            self.loader.resolve_profile_columns(['unit_serving_iron_mg'])
+        with self.assertRaises(ValueError):
+            self.loader.resolve_profile_columns(['not_a_column'])
+
+    def test_profile_disabled_by_default(self):
+        loader = NutritionDatabaseLoader(DB_PATH)
+        loader.load_database()
+
+        self.assertIsNone(loader.profile_matrix)
+        with self.assertRaises(ValueError):
+            loader.resolve_profile_columns('all')
+
+    def test_calculator_reports_profile_per_serving(self):
+        calculator = NutritionCalculator(DB_PATH, full_profile=True)
+        ingredients = [
+            {'name': 'Onion', 'quantity': '1 medium', 'grams': 100},
+            {'name': 'Main Ingredient', 'quantity': '1 cup', 'grams': 100}
+        ]
+
+        result = calculator.calculate_nutrition("Test Dish", "Dal", ingredients, 400, 4,
+                                                nutrients=['energy_kcal', 'iron_mg'])
+        without_profile = calculator.calculate_nutrition("Test Dish", "Dal", ingredients, 400, 4)
+
+        profile = result['nutrient_profile_per_katori']
+        onion = self.loader.get_ingredient_profile('Onion', ['energy_kcal', 'iron_mg'])
+        self.assertAlmostEqual(profile['energy_kcal'], onion['energy_kcal'] / 2, places=2)
+        self.assertAlmostEqual(profile['iron_mg'], onion['iron_mg'] / 2, places=2)
+        self.assertEqual(result['estimated_nutrition_per_katori'],
+                         without_profile['estimated_nutrition_per_katori'])
+
+class TestBulkLookup(unittest.TestCase):
+
+    NAMES = ['Onion', 'toor dal', 'onion', 'xyzzy foo', 'Paneer', 'roasted groundnut', 'ONION', 'chopped fresh coriander']
+
+    @classmethod
+    def setUpClass(cls):
+        cls.loader = NutritionDatabaseLoader(DB_PATH, backend='csv',
+                                             alias_path=os.path.join(os.path.dirname(DB_PATH), 'ingredient_aliases.json'))
+        cls.loader.load()
+
+    def setUp(self):
+        self.loader.lookup_cache.invalidate()
+
+    def test_matches_per_name_lookups_in_input_order(self):
+        bulk = self.loader.find_food_matches(self.NAMES)
+
+        self.loader.lookup_cache.invalidate()
+        self.assertEqual(bulk, [self.loader.find_food_match(name) for name in self.NAMES])
+        self.assertEqual(self.loader.get_ingredients_nutrition(self.NAMES),
+                         [self.loader.get_ingredient_nutrition(name) for name in self.NAMES])
+        self.assertEqual(self.loader.find_food_matches([]), [])
+
+    def test_resolves_each_name_once_and_only_unmatched_names_fuzzily(self):
+        before = self.loader.cache_stats()
+        with patch.object(self.loader, '_find_similar_match', wraps=self.loader._find_similar_match) as similar:
+            self.loader.find_food_matches(self.NAMES)
+            self.loader.find_food_matches(self.NAMES)
+
+        self.assertEqual([call.args[0] for call in similar.call_args_list],
+                         ['xyzzy foo', 'roasted groundnut', 'chopped fresh coriander'])
+        after = self.loader.cache_stats()
+        self.assertEqual((after['misses'] - before['misses'], after['hits'] - before['hits']), (6, 6))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import csv
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import NUTRITION_DB_FILE
+from utils.db_reloader import DatabaseReloader
+from utils.nutrition_calculator import NutritionCalculator
+
+DB_PATH = os.path.join(os.path.dirname(__file__), '..', NUTRITION_DB_FILE)
+
+INGREDIENTS = [{"name": "Onion", "quantity": "1", "grams": 100}, {"name": "Ghee", "quantity": "1 tbsp", "grams": 15}]
+
+def replace_onion_calories(path, calories):
+    """Rewrite the energy_kcal cell of the first food whose name starts with Onion; returns its name."""
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    name_column, energy_column = rows[0].index('food_name'), rows[0].index('energy_kcal')
+    row = next(row for row in rows[1:] if row[name_column].lower().startswith('onion'))
+    row[energy_column] = str(calories)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(rows)
+    return row[name_column]
+
+class TestDatabaseReload(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.db_path = os.path.join(self.tmpdir, 'nutrition.csv')
+        shutil.copy(DB_PATH, self.db_path)
+        self.calculator = NutritionCalculator(self.db_path, backend='csv')
+
+    def test_reload_swaps_in_new_tables_and_version(self):
+        old_loader = self.calculator.db_loader
+        self.calculator.calculate_nutrition("Onion Fry", "Dry Sabzi", INGREDIENTS, 100, 1)
+        food_name = replace_onion_calories(self.db_path, 9999)
+
+        reloader = DatabaseReloader(self.calculator)
+        self.assertTrue(reloader.reload(wait=True))
+
+        new_loader = self.calculator.db_loader
+        self.assertIsNot(new_loader, old_loader)
+        self.assertNotEqual(new_loader.version, old_loader.version)
+        # Recently looked-up names are already cached in the new loader.
+        self.assertIn('onion', new_loader.lookup_cache.keys())
+        self.assertEqual(reloader.status()['reloads'], 1)
+
+        row = new_loader.food_names.index(food_name)
+        self.assertEqual(new_loader.nutrient_matrix[row][0], 9999)
+        self.assertNotEqual(old_loader.nutrient_matrix[row][0], 9999)
+
+    def test_lookup_from_an_older_version_is_not_used(self):
+        lookup = self.calculator.resolve_ingredients(["Onion"])
+        lookup["Onion"] = (None, 0.0)
+        replace_onion_calories(self.db_path, 9999)
+
+        self.calculator.reload_database()
+        result = self.calculator.calculate_nutrition("Onion Fry", "Dry Sabzi", INGREDIENTS, 100, 1,
+                                                     nutrition_lookup=lookup)
+
+        self.assertIsNotNone(result['ingredients_used'][0]['matched_food'])
+
+    def test_failed_reload_keeps_current_tables(self):
+        old_loader = self.calculator.db_loader
+        reloader = DatabaseReloader(self.calculator)
+
+        with patch.object(self.calculator, 'reload_database', side_effect=ValueError("broken csv")):
+            reloader.reload(wait=True)
+
+        self.assertIs(self.calculator.db_loader, old_loader)
+        self.assertEqual(reloader.status()['state'], 'failed')
+        self.assertEqual(reloader.status()['last_error'], 'broken csv')
+
+    def test_watch_reloads_after_file_change(self):
+        reloader = DatabaseReloader(self.calculator, [self.db_path])
+        old_loader = self.calculator.db_loader
+
+        with patch.object(reloader, 'reload') as reload:
+            reloader.watch(0.01)
+            self.addCleanup(reloader.stop)
+            replace_onion_calories(self.db_path, 1234)
+            for _ in range(500):
+                if reload.called:
+                    break
+                reloader._stop.wait(0.01)
+
+        reload.assert_called_once()
+        self.assertIn('nutrition.csv', reload.call_args.kwargs['reason'])
+        self.assertIs(self.calculator.db_loader, old_loader)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import NUTRITION_DB_FILE
+from utils.db_loader import NutritionDatabaseLoader
+from utils.db_snapshot import write_snapshot
+
+DB_PATH = os.path.join(os.path.dirname(__file__), '..', NUTRITION_DB_FILE)
+
+INGREDIENTS = ['Onion', 'Basmati Rice', 'Ghee', 'Red Chili Powder', 'Main Ingredient', 'sa.t']
+
+class TestDatabaseSnapshot(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.db_path = os.path.join(cls.tmp_dir, 'nutrition.csv')
+        shutil.copy(DB_PATH, cls.db_path)
+
+        cls.csv_loader = NutritionDatabaseLoader(cls.db_path, full_profile=True)
+        cls.csv_loader.load()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def setUp(self):
+        self.snapshot_path = os.path.join(self.tmp_dir, 'nutrition.npz')
+        write_snapshot(self.csv_loader, self.snapshot_path)
+
+    def load(self, full_profile=False):
+        loader = NutritionDatabaseLoader(self.db_path, full_profile=full_profile, snapshot_path=self.snapshot_path)
+        loader.load()
+        return loader
+
+    def test_snapshot_lookups_match_csv(self):
+        loader = self.load(full_profile=True)
+
+        self.assertEqual(loader.loaded_from, 'snapshot')
+        for name in INGREDIENTS:
+            self.assertEqual(loader.get_ingredient_nutrition(name), self.csv_loader.get_ingredient_nutrition(name))
+        self.assertEqual(loader.get_ingredient_profile('Onion'), self.csv_loader.get_ingredient_profile('Onion'))
+
+    def test_dataframe_is_built_on_demand(self):
+        loader = self.load()
+
+        self.assertIsNone(loader._nutrition_df)
+        self.assertEqual(loader.nutrition_df['food_name'].tolist(), self.csv_loader.nutrition_df['food_name'].tolist())
+        self.assertEqual(loader.nutrition_df['energy_kcal'].tolist(),
+                         self.csv_loader.nutrition_df['energy_kcal'].tolist())
+
+    def test_touched_source_with_same_content_keeps_snapshot(self):
+        os.utime(self.db_path, ns=(0, 0))
+
+        self.assertEqual(self.load().loaded_from, 'snapshot')
+
+    def test_changed_source_falls_back_to_csv(self):
+        changed_path = os.path.join(self.tmp_dir, 'changed.csv')
+        shutil.copy(self.db_path, changed_path)
+        with open(changed_path, 'a') as f:
+            f.write('\n')
+        shutil.copystat(self.db_path, changed_path)
+
+        loader = NutritionDatabaseLoader(changed_path, snapshot_path=self.snapshot_path)
+        loader.load()
+        self.assertEqual(loader.loaded_from, 'csv')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.db_loader import NUTRIENT_KEYS
+from utils.estimation_table import EstimationTable, DEFAULT_CATEGORIES_PATH, DEFAULT_NUTRITION
+
+class TestEstimationTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = EstimationTable.load(DEFAULT_CATEGORIES_PATH, NUTRIENT_KEYS)
+
+    def test_categories_follow_file_priority(self):
+        self.assertEqual(self.table.category("Chicken breast"), 'meat')
+        # "ghee" is listed under dairy before oil.
+        self.assertEqual(self.table.category("Desi Ghee"), 'dairy')
+        self.assertEqual(self.table.category("Green peas"), 'vegetable')
+        self.assertIsNone(self.table.category("Mystery ingredient"))
+
+    def test_estimate_is_a_read_only_row(self):
+        vector = self.table.vector("Mutton")
+
+        self.assertEqual(dict(zip(NUTRIENT_KEYS, vector.tolist())),
+                         {'calories': 200, 'carbs': 0, 'protein': 25, 'fat': 10, 'fiber': 0})
+        self.assertFalse(vector.flags.writeable)
+        self.assertEqual(self.table.vector("xyz").tolist(), [DEFAULT_NUTRITION[key] for key in NUTRIENT_KEYS])
+
+    def test_names_are_resolved_once(self):
+        for name in ("Basmati rice", "basmati RICE", "Basmati rice"):
+            self.table.row(name)
+
+        stats = self.table.cache.stats()
+        self.assertEqual((stats['misses'], stats['hits']), (1, 2))
+
+    def test_custom_and_missing_files(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        path = os.path.join(tmpdir, 'categories.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"default": {"calories": 10},
+                       "categories": [{"category": "millet", "nutrients": {"calories": 340, "fiber": 8},
+                                       "keywords": ["bajra", "ragi"]}]}, f)
+
+        custom = EstimationTable.load(path, NUTRIENT_KEYS)
+        self.assertEqual(custom.category("ragi flour"), 'millet')
+        self.assertEqual(custom.vector("ragi flour").tolist(), [340, 0, 0, 0, 8])
+        self.assertEqual(custom.vector("rice").tolist(), [10, 0, 0, 0, 0])
+
+        missing = EstimationTable.load(os.path.join(tmpdir, 'missing.json'), NUTRIENT_KEYS)
+        self.assertIsNone(missing.category("Chicken"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import NUTRITION_DB_FILE
+from utils.db_loader import NutritionDatabaseLoader
+from utils.fuzzy_index import FuzzyIndex
+from utils.nutrition_calculator import NutritionCalculator
+
+DB_PATH = os.path.join(os.path.dirname(__file__), '..', NUTRITION_DB_FILE)
+
+NAMES = ["oil, mustard", "oil, coconut", "boiled egg", "mustard seeds", "coriander leaves", "salt"]
+
+class TestFuzzyIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = FuzzyIndex(NAMES)
+
+    def test_ranks_by_similarity(self):
+        ranked = self.index.top_k("mustard oil", 3)
+
+        self.assertEqual(ranked[0][0], NAMES.index("oil, mustard"))
+        self.assertEqual(len(ranked), 3)
+        scores = [score for _, score in ranked]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertTrue(all(0 < score <= 1 for score in scores))
+
+    def test_same_name_scores_one(self):
+        self.assertEqual(self.index.top_k("Salt", 1), [(NAMES.index("salt"), 1.0)])
+        self.assertAlmostEqual(self.index.score("salt", NAMES.index("salt")), 1.0)
+
+    def test_tolerates_misspellings(self):
+        self.assertEqual(self.index.top_k("corriander leafs", 1)[0][0], NAMES.index("coriander leaves"))
+
+    def test_no_shared_trigrams(self):
+        self.assertEqual(self.index.top_k("xyz", 5), [])
+        self.assertEqual(self.index.top_k("", 5), [])
+
+    def test_row_weights_scale_scores(self):
+        weighted = FuzzyIndex(["salt", "salt"], row_weights=[0.5, 1.0])
+        self.assertEqual(weighted.top_k("salt", 2), [(1, 1.0), (0, 0.5)])
+
+class TestFuzzyIngredientMatching(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.loader = NutritionDatabaseLoader(DB_PATH, backend='csv')
+        cls.loader.load()
+
+    def test_exact_names_score_one(self):
+        row_id, score = self.loader.find_food_match('Salt')
+        self.assertEqual(self.loader.food_name(row_id), 'Salt')
+        self.assertEqual(score, 1.0)
+
+    def test_reordered_and_misspelled_names(self):
+        for query, expected in [("Mustard oil", "Oil, mustard"),
+                                ("tumeric powder", "Turmeric powder"),
+                                ("Green chillies", "Chillies, green")]:
+            row_id, score = self.loader.find_food_match(query)
+            self.assertTrue(self.loader.food_name(row_id).startswith(expected), query)
+            self.assertGreaterEqual(score, self.loader.match_threshold)
+
+    def test_search_returns_ranked_candidates(self):
+        results = self.loader.search("mustard oil", k=3)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0]['ingredient'], "Oil, mustard")
+        self.assertEqual(results[0]['food_code'], self.loader.food_codes[self.loader.food_names.index("Oil, mustard")])
+
+    def test_low_scores_fall_back_to_substring_search(self):
+        strict = NutritionDatabaseLoader(DB_PATH, backend='csv', match_threshold=1.0)
+        strict.load()
+
+        row_id, score = strict.find_food_match('Curd')
+        self.assertEqual(strict.food_name(row_id), "Curds (cow's milk)")
+        self.assertLess(score, 1.0)
+
+    def test_queries_are_sub_millisecond(self):
+        self.loader.search("warmup")
+        start = time.perf_counter()
+        for _ in range(100):
+            self.loader.search("basmati rice", k=5)
+        self.assertLess((time.perf_counter() - start) / 100, 0.001)
+
+    def test_calculator_reports_match_and_score(self):
+        calculator = NutritionCalculator(DB_PATH, backend='csv')
+        result = calculator.calculate_nutrition("Tadka", "Dal", [
+            {'name': 'Mustard oil', 'quantity': '1 tablespoon', 'grams': 15},
+            {'name': 'Main Ingredient', 'quantity': '1 cup', 'grams': 200}
+        ])
+
+        used = result['ingredients_used']
+        self.assertEqual(used[0]['matched_food'], "Oil, mustard")
+        self.assertGreater(used[0]['match_score'], 0.5)
+        self.assertIsNone(used[1]['matched_food'])
+        self.assertEqual(used[1]['match_score'], 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import sys
+import json
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import NUTRITION_DB_FILE, INGREDIENT_ALIASES_FILE
+from utils.db_loader import NutritionDatabaseLoader
+from utils.ingredient_aliases import AliasTable, normalize_name
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+DB_PATH = os.path.join(ROOT, NUTRITION_DB_FILE)
+ALIASES_PATH = os.path.join(ROOT, INGREDIENT_ALIASES_FILE)
+
+class TestAliasTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = AliasTable.compile([
+            {"food_code": "B004", "food_name": "Black gram, whole", "aliases": ["Whole Urad Dal", "black gram"]},
+            {"food_code": "B020", "food_name": "Rajmah, red", "aliases": ["rajma"]},
+            {"food_code": "Z999", "food_name": "Not in the table", "aliases": ["mystery"]}
+        ], ["A001", "B004", "B020"])
+
+    def test_normalize_name(self):
+        self.assertEqual(normalize_name("  Ginger-Garlic   Paste! "), "ginger garlic paste")
+
+    def test_resolves_normalized_names(self):
+        self.assertEqual(self.table.lookup("WHOLE URAD-DAL"), 1)
+        self.assertEqual(self.table.lookup("rajma"), 2)
+        self.assertIsNone(self.table.lookup("mystery"))
+        self.assertEqual(len(self.table), 3)
+
+    def test_resolves_parenthetical_forms(self):
+        self.assertEqual(self.table.lookup("Kidney Beans (Rajma)"), 2)
+        self.assertEqual(self.table.lookup("Black Gram (Whole Urad Dal)"), 1)
+        self.assertEqual(self.table.lookup("Black Gram (Sabut)"), 1)
+        self.assertIsNone(self.table.lookup("Green Gram (Moong)"))
+
+class TestShippedAliases(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.loader = NutritionDatabaseLoader(DB_PATH, backend='csv', alias_path=ALIASES_PATH)
+        cls.loader.load()
+
+    def test_every_food_code_exists(self):
+        with open(ALIASES_PATH, encoding='utf-8') as f:
+            entries = json.load(f)
+
+        codes = set(self.loader.food_codes)
+        for entry in entries:
+            self.assertIn(entry['food_code'], codes)
+            self.assertEqual(entry['food_name'], self.loader.food_name(self.loader.food_codes.index(entry['food_code'])))
+
+    def test_aliases_are_checked_first(self):
+        for name, expected in [("Ginger Garlic Paste", "Garlic, big clove"),
+                               ("Kidney Beans (Rajma)", "Rajmah, red"),
+                               ("Black Gram (Whole Urad Dal)", "Black gram, whole"),
+                               ("Toor Dal", "Red gram, dal"),
+                               ("Haldi", "Turmeric powder")]:
+            row_id, score = self.loader.find_food_match(name)
+            self.assertTrue(self.loader.food_name(row_id).startswith(expected), name)
+            self.assertEqual(score, 1.0)
+
+    def test_missing_alias_file_is_ignored(self):
+        loader = NutritionDatabaseLoader(DB_PATH, backend='csv', alias_path=os.path.join(ROOT, 'missing.json'))
+        loader.load()
+
+        self.assertEqual(len(loader.aliases), 0)
+        self.assertIsNotNone(loader.find_food_index("Toor Dal"))
+
+if __name__ == '__main__':
+    unittest.main()
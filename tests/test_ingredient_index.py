@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.ingredient_index import IngredientIndex
+
+class TestIngredientIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = IngredientIndex([
+            'onion, big (allium cepa)',
+            'spring onions, bulbs only, raw',
+            'amla',
+            'salt',
+            'amla',
+            'kidney beans, red (phaseolus vulgaris)',
+        ])
+
+    def test_find_exact_returns_first_row(self):
+        self.assertEqual(self.index.find_exact('amla'), (2, 2))
+        self.assertEqual(self.index.find_exact('salt'), (3, 1))
+        self.assertEqual(self.index.find_exact('pepper'), (None, 0))
+
+    def test_find_containing_returns_first_row(self):
+        self.assertEqual(self.index.find_containing('onion'), (0, 2))
+        self.assertEqual(self.index.find_containing('bulbs only'), (1, 1))
+        self.assertEqual(self.index.find_containing('garlic'), (None, 0))
+
+    def test_find_containing_short_query(self):
+        self.assertEqual(self.index.find_containing('am'), (2, 2))
+
+    def test_find_containing_matches_regex_syntax_literally(self):
+        self.assertEqual(self.index.find_containing('sa.t'), (None, 0))
+        self.assertEqual(self.index.find_containing('kidney beans.*(vulgaris)'), (None, 0))
+        self.assertEqual(self.index.find_containing('onion, big (allium'), (0, 1))
+        self.assertEqual(self.index.find_containing('(phaseolus vulgaris)'), (5, 1))
+
+    def test_find_containing_does_not_backtrack_on_hostile_names(self):
+        index = IngredientIndex(['a' * 30 + 'b'] * 2000)
+
+        start = time.perf_counter()
+        for query in ('(a+)+$', '(\\w+\\s?)+$!', '(a|aa)*c'):
+            self.assertEqual(index.find_containing(query), (None, 0))
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import sys
+import random
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.keyword_matcher import KeywordMatcher
+
+class TestKeywordMatcher(unittest.TestCase):
+
+    def test_finds_overlapping_and_nested_keywords(self):
+        matcher = KeywordMatcher.from_groups({
+            "Rice": ["rice", "fried rice", "jeera rice"],
+            "Dry Sabzi": ["fry", "dry"]
+        })
+
+        found = matcher.matches("egg fried rice")
+        self.assertEqual({matcher.keywords[entry] for entry in found}, {"rice", "fried rice"})
+        self.assertEqual(matcher.count_by_value("egg fried rice"), {"Rice": 2})
+        self.assertEqual(matcher.matched_values("dry jeera rice"), {"Rice", "Dry Sabzi"})
+
+    def test_first_keeps_table_order(self):
+        matcher = KeywordMatcher({"coriander": "Spices", "coriander leaves": "Leafy Vegetables", "leaves": "Other"})
+
+        self.assertEqual(matcher.first("fresh coriander leaves"), "Spices")
+        self.assertEqual(matcher.first("curry leaves"), "Other")
+        self.assertEqual(matcher.first("salt", "Dry Ingredients"), "Dry Ingredients")
+
+    def test_same_keyword_in_several_groups(self):
+        matcher = KeywordMatcher.from_groups({"Wet Sabzi": ["korma"], "Non-Veg Curry": ["korma", "chicken"]})
+
+        self.assertEqual(matcher.count_by_value("chicken korma"), {"Wet Sabzi": 1, "Non-Veg Curry": 2})
+        self.assertEqual(matcher.first("chicken korma"), "Wet Sabzi")
+
+    def test_agrees_with_substring_checks(self):
+        rng = random.Random(7)
+        for _ in range(500):
+            keywords = ["".join(rng.choice("abc ") for _ in range(rng.randint(1, 4)))
+                        for _ in range(rng.randint(1, 12))]
+            matcher = KeywordMatcher((keyword, entry) for entry, keyword in enumerate(keywords))
+            text = "".join(rng.choice("abcd ") for _ in range(rng.randint(0, 20)))
+
+            expected = {entry for entry, keyword in enumerate(keywords) if keyword in text}
+            self.assertEqual(matcher.matches(text), expected)
+            self.assertEqual(matcher.first(text), min(expected) if expected else None)
+
+if __name__ == '__main__':
+    unittest.main()
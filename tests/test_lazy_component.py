@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+import unittest
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.lazy_component import LazyComponent
+
+class TestLazyComponent(unittest.TestCase):
+
+    def test_builds_once_across_threads(self):
+        calls = []
+
+        def factory():
+            calls.append(1)
+            time.sleep(0.05)
+            return object()
+
+        component = LazyComponent('slow', factory)
+        self.assertEqual(component.status(), {'state': 'pending'})
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(component.get())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len({id(result) for result in results}), 1)
+        self.assertTrue(component.ready)
+        self.assertIn('build_seconds', component.status())
+
+    def test_failed_build_is_reported_and_retried(self):
+        attempts = []
+
+        def factory():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise FileNotFoundError("missing table")
+            return "built"
+
+        component = LazyComponent('flaky', factory)
+        with self.assertRaises(FileNotFoundError):
+            component.get()
+        self.assertEqual(component.status(), {'state': 'failed', 'error': 'missing table'})
+
+        self.assertEqual(component.get(), "built")
+        self.assertTrue(component.ready)
+
+if __name__ == '__main__':
+    unittest.main()
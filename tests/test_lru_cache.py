@@ -0,0 +1,45 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.lru_cache import LRUCache, MISSING
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_get_and_put(self):
+        cache = LRUCache(2)
+        self.assertIs(cache.get('salt'), MISSING)
+        cache.put('salt', 1)
+        self.assertEqual(cache.get('salt'), 1)
+
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_caches_negative_results(self):
+        cache = LRUCache(2)
+        cache.put('main ingredient', None)
+        self.assertIsNone(cache.get('main ingredient'))
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.put('onion', 1)
+        cache.put('salt', 2)
+        cache.get('onion')
+        cache.put('oil', 3)
+
+        self.assertIs(cache.get('salt'), MISSING)
+        self.assertEqual(cache.get('onion'), 1)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_invalidate(self):
+        cache = LRUCache(2)
+        cache.put('onion', 1)
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+        self.assertIs(cache.get('onion'), MISSING)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import metrics
+from utils.metrics import Histogram, MetricsRegistry
+
+class TestHistogram(unittest.TestCase):
+
+    def test_values_fall_in_first_bucket_at_or_above_them(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        counts, total, count = histogram.snapshot()
+        self.assertEqual(counts, [2, 1, 1])
+        self.assertAlmostEqual(total, 3.65)
+        self.assertEqual(count, 4)
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def test_render_uses_cumulative_buckets(self):
+        registry = MetricsRegistry(buckets=(0.1, 1.0))
+        registry.observe('fetch_recipe', 0.05)
+        registry.observe('fetch_recipe', 0.5)
+
+        lines = registry.render().splitlines()
+
+        self.assertIn('# TYPE nutrition_stage_duration_seconds histogram', lines)
+        self.assertIn('nutrition_stage_duration_seconds_bucket{stage="fetch_recipe",le="0.1"} 1', lines)
+        self.assertIn('nutrition_stage_duration_seconds_bucket{stage="fetch_recipe",le="1.0"} 2', lines)
+        self.assertIn('nutrition_stage_duration_seconds_bucket{stage="fetch_recipe",le="+Inf"} 2', lines)
+        self.assertIn('nutrition_stage_duration_seconds_count{stage="fetch_recipe"} 2', lines)
+
+    def test_render_includes_cache_stats(self):
+        text = MetricsRegistry().render({'recipe': {'hits': 3, 'misses': 1, 'hit_ratio': 0.75, 'size': 4}})
+
+        self.assertIn('nutrition_cache_hits_total{cache="recipe"} 3', text)
+        self.assertIn('nutrition_cache_hit_ratio{cache="recipe"} 0.75', text)
+
+    def test_request_timing_only_collects_while_active(self):
+        registry = MetricsRegistry()
+        registry.observe('classify_dish', 0.01)
+        self.assertIsNone(metrics.request_timings())
+
+        token = metrics.start_request_timing()
+        try:
+            with registry.span('ingredient_lookup'):
+                pass
+            with registry.span('ingredient_lookup'):
+                pass
+            timings = metrics.request_timings()
+        finally:
+            metrics.stop_request_timing(token)
+
+        self.assertEqual(list(timings), ['ingredient_lookup'])
+        self.assertEqual(timings['ingredient_lookup'][1], 2)
+        self.assertIsNone(metrics.request_timings())
+
+if __name__ == '__main__':
+    unittest.main()
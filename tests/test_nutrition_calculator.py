@@ -3,6 +3,8 @@ import sys
 import unittest
 from unittest.mock import MagicMock, patch
 
+import numpy as np
+
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from utils.nutrition_calculator import NutritionCalculator
@@ -25,27 +27,14 @@ class TestNutritionCalculator(unittest.TestCase):
         self.assertEqual(self.calculator._estimate_cooked_weight(100, "curry"), 110)
         self.assertEqual(self.calculator._estimate_cooked_weight(100, None), 100)
     
-    def test_calculate_scaled_nutrition(self):
-
-        sample_nutrition = {
-            'ingredient': 'Test Ingredient',
-            'calories': 100,
-            'carbs': 10,
-            'protein': 5,
-            'fat': 2,
-            'fiber': 3
-        }
+    def test_sum_nutrition_scales_per_100_grams(self):
+        self.mock_db_loader.nutrient_matrix = np.array([[100.0, 10.0, 5.0, 2.0, 3.0]])
 
-        scaled = self.calculator._calculate_scaled_nutrition(sample_nutrition, 200)
-        
-        self.assertEqual(scaled['calories'], 200)
-        self.assertEqual(scaled['carbs'], 20)
-        self.assertEqual(scaled['protein'], 10)
-        self.assertEqual(scaled['fat'], 4)
-        self.assertEqual(scaled['fiber'], 6)
-        
-        scaled_none = self.calculator._calculate_scaled_nutrition(None, 100)
-        self.assertEqual(scaled_none, self.calculator.default_nutrition)
+        total = self.calculator._sum_nutrition([0], [200], {})
+        self.assertEqual(total.tolist(), [200.0, 20.0, 10.0, 4.0, 6.0])
+
+        empty = self.calculator._sum_nutrition([], [], {})
+        self.assertEqual(empty.tolist(), [0.0] * 5)
     
     def test_validate_nutrition_values(self):
         normal_values = {
@@ -82,5 +71,44 @@ class TestNutritionCalculator(unittest.TestCase):
         validated = self.calculator._validate_nutrition_values(extreme_values)
         self.assertEqual(validated['calories'], 900)  
 
+    def test_estimated_nutrition_is_memoized(self):
+        self.mock_db_loader.find_food_matches.side_effect = lambda names: [(None, 0.0)] * len(names)
+        ingredients = [
+            {'name': 'Main Ingredient', 'quantity': '1 cup', 'grams': 200},
+            {'name': 'Main Ingredient', 'quantity': '1 cup', 'grams': 200}
+        ]
+
+        with patch.object(self.calculator.estimation, '_resolve',
+                          wraps=self.calculator.estimation._resolve) as resolve:
+            self.calculator.calculate_nutrition("Test Dish", "Wet Sabzi", ingredients)
+            self.calculator.calculate_nutrition("Test Dish", "Wet Sabzi", ingredients)
+
+        resolve.assert_called_once_with('Main Ingredient')
+        self.assertEqual(self.calculator.estimate_cache.stats()['hits'], 3)
+
+    def test_sum_nutrition_mixes_database_rows_and_estimates(self):
+        self.mock_db_loader.nutrient_matrix = np.array([
+            [100.0, 10.0, 5.0, 2.0, 3.0],
+            [880.0, 0.0, 0.0, 100.0, 0.0]
+        ])
+        estimate = np.array([50.0, 10.0, 2.0, 0.0, 3.0])
+
+        total = self.calculator._sum_nutrition([1, 0, 0], [10, 200, 50], {2: estimate})
+
+        expected = (self.mock_db_loader.nutrient_matrix[1] * 0.1
+                    + self.mock_db_loader.nutrient_matrix[0] * 2.0
+                    + estimate * 0.5)
+        self.assertEqual(total.tolist(), expected.tolist())
+
+    def test_calculate_nutrition_per_serving(self):
+        total = np.array([800.0, 80.0, 40.0, 20.0, 8.0])
+
+        per_serving = self.calculator._calculate_nutrition_per_serving(total, 800, 200, 4)
+        self.assertEqual(per_serving, {'calories': 200.0, 'carbs': 20.0, 'protein': 10.0,
+                                       'fat': 5.0, 'fiber': 2.0})
+
+        per_serving = self.calculator._calculate_nutrition_per_serving(total, 0, 200, 4)
+        self.assertEqual(per_serving['calories'], 200.0)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,60 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.quantity_parser import parse_quantity
+from utils.ingredient_processor import IngredientProcessor
+
+class TestParseQuantity(unittest.TestCase):
+
+    def test_simple_quantities(self):
+        self.assertEqual(parse_quantity("250 grams"), (250.0, "gram"))
+        self.assertEqual(parse_quantity("2 Tablespoons"), (2.0, "tablespoon"))
+        self.assertEqual(parse_quantity("500ml"), (500.0, "ml"))
+        self.assertEqual(parse_quantity("4 medium"), (4.0, "piece"))
+
+    def test_fractions(self):
+        self.assertEqual(parse_quantity("1/2 teaspoon"), (0.5, "teaspoon"))
+        self.assertEqual(parse_quantity("1 1/2 cups"), (1.5, "cup"))
+        self.assertEqual(parse_quantity("1 and 1/2 cups"), (1.5, "cup"))
+        self.assertEqual(parse_quantity(".25 cup"), (0.25, "cup"))
+
+    def test_unicode_fractions(self):
+        self.assertEqual(parse_quantity("½ tsp"), (0.5, "teaspoon"))
+        self.assertEqual(parse_quantity("1½ cups"), (1.5, "cup"))
+        self.assertEqual(parse_quantity("¾ katori"), (0.75, "katori"))
+
+    def test_ranges_use_midpoint(self):
+        self.assertEqual(parse_quantity("2-3 tbsp"), (2.5, "tablespoon"))
+        self.assertEqual(parse_quantity("2 to 3 cups"), (2.5, "cup"))
+        self.assertEqual(parse_quantity("8-10 curry leaves"), (9.0, "piece"))
+
+    def test_number_words(self):
+        self.assertEqual(parse_quantity("half cup"), (0.5, "cup"))
+        self.assertEqual(parse_quantity("one and a half cups"), (1.5, "cup"))
+        self.assertEqual(parse_quantity("a pinch"), (1.0, "pinch"))
+
+    def test_units_must_be_whole_words(self):
+        self.assertEqual(parse_quantity("2 large"), (2.0, "piece"))
+        self.assertEqual(parse_quantity("2 green chilies"), (2.0, "piece"))
+        self.assertEqual(parse_quantity("2 heaped tablespoons"), (2.0, "tablespoon"))
+
+    def test_unparseable(self):
+        self.assertEqual(parse_quantity("to taste"), (None, None))
+        self.assertEqual(parse_quantity("a few leaves"), (None, None))
+        self.assertEqual(parse_quantity("an inch piece"), (None, None))
+
+    def test_metric_units_convert_once(self):
+        processor = IngredientProcessor()
+        processed = processor.process_ingredients([
+            {"name": "Potato", "quantity": "1 kg"},
+            {"name": "Water", "quantity": "1/2 liter"}
+        ])
+
+        self.assertEqual(processed[0]['grams'], 1000.0)
+        self.assertEqual(processed[1]['grams'], 500.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import NUTRITION_DB_FILE
+from utils.nutrition_calculator import NutritionCalculator
+
+DB_PATH = os.path.join(os.path.dirname(__file__), '..', NUTRITION_DB_FILE)
+
+INGREDIENTS = [
+    {"name": "Toor Dal", "quantity": "1 cup", "grams": 200},
+    {"name": "Ghee", "quantity": "1 tablespoon", "grams": 15},
+    {"name": "Mystery spice blend", "quantity": "1 teaspoon", "grams": 5},
+]
+
+def without_handle(result):
+    return {key: value for key, value in result.items() if key != 'recipe_handle'}
+
+class TestRecalculate(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.calculator = NutritionCalculator(DB_PATH, backend='csv')
+
+    def setUp(self):
+        self.original = self.calculator.calculate_nutrition("Dal Tadka", "Dal", INGREDIENTS, 800, 4)
+        self.handle = self.original['recipe_handle']
+
+    def test_unchanged_recalculation_matches_original(self):
+        self.assertEqual(self.calculator.recalculate(self.handle), self.original)
+
+    def test_weights_and_servings_reuse_matches(self):
+        with patch.object(self.calculator.db_loader, 'find_food_match') as find_food_match:
+            larger = self.calculator.recalculate(self.handle, serving_grams=400, servings=2)
+            heavier = self.calculator.recalculate(self.handle, total_cooked_weight=1600)
+        find_food_match.assert_not_called()
+
+        self.assertEqual(larger['serving_size_grams'], 400)
+        self.assertEqual(larger['servings'], 2)
+        self.assertEqual(heavier['total_cooked_weight_grams'], 1600)
+        # Same serving from twice the cooked weight: about half the calories.
+        self.assertAlmostEqual(heavier['estimated_nutrition_per_katori']['calories'],
+                               self.original['estimated_nutrition_per_katori']['calories'] / 2, delta=1)
+
+    def test_substitution_looks_up_only_the_new_name(self):
+        loader = self.calculator.db_loader
+        with patch.object(loader, 'find_food_match', wraps=loader.find_food_match) as find_food_match:
+            result = self.calculator.recalculate(self.handle, substitutions=[
+                {'ingredient': 'ghee', 'name': 'Mustard oil', 'quantity': '1 tablespoon', 'grams': 15},
+                {'ingredient': 'Mystery spice blend', 'grams': 0},
+                {'name': 'Salt', 'quantity': '1 teaspoon', 'grams': 6},
+            ])
+        self.assertEqual([call.args[0] for call in find_food_match.call_args_list], ['Mustard oil', 'Salt'])
+
+        fresh = self.calculator.calculate_nutrition("Dal Tadka", "Dal", [
+            INGREDIENTS[0],
+            {"name": "Mustard oil", "quantity": "1 tablespoon", "grams": 15},
+            {"name": "Salt", "quantity": "1 teaspoon", "grams": 6},
+        ], 800, 4)
+        self.assertEqual(result, fresh)
+        self.assertNotEqual(result['recipe_handle'], self.handle)
+
+    def test_unknown_handle_and_ingredient(self):
+        with self.assertRaises(KeyError):
+            self.calculator.recalculate('no-such-handle')
+        with self.assertRaises(ValueError):
+            self.calculator.recalculate(self.handle, substitutions=[{'ingredient': 'Paneer', 'grams': 10}])
+
+    def test_estimated_cooked_weight_follows_substitutions(self):
+        estimated = self.calculator.calculate_nutrition("Dal Tadka", "Dal", INGREDIENTS, None, 4)
+        result = self.calculator.recalculate(estimated['recipe_handle'],
+                                             substitutions=[{'ingredient': 'Toor Dal', 'grams': 400}])
+
+        fresh = self.calculator.calculate_nutrition("Dal Tadka", "Dal", [
+            dict(INGREDIENTS[0], grams=400), INGREDIENTS[1], INGREDIENTS[2]], None, 4)
+        self.assertEqual(without_handle(result), without_handle(fresh))
+        self.assertGreater(result['total_cooked_weight_grams'], estimated['total_cooked_weight_grams'])
+
+if __name__ == '__main__':
+    unittest.main()
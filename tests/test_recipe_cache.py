@@ -0,0 +1,98 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.recipe_cache import RecipeCache, normalize_dish_name
+from utils.recipe_fetcher import RecipeFetcher
+
+SAMPLE_RECIPE = {
+    "dish_name": "Jeera Rice",
+    "dish_type": "Rice",
+    "total_cooked_weight_grams": 600,
+    "servings": 4,
+    "ingredients": [
+        {"name": "Basmati Rice", "quantity": "1 cup"},
+        {"name": "Cumin Seeds", "quantity": "1 teaspoon"}
+    ]
+}
+
+class TestRecipeCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "recipes.sqlite3")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_normalize_dish_name(self):
+        self.assertEqual(normalize_dish_name("  Jeera   Rice! "), "jeera rice")
+        self.assertEqual(normalize_dish_name("Aloo-Gobi"), "aloo gobi")
+
+    def test_survives_restart(self):
+        RecipeCache(self.db_path).put("Jeera Rice", SAMPLE_RECIPE)
+
+        cache = RecipeCache(self.db_path)
+        self.assertEqual(cache.get("jeera rice"), SAMPLE_RECIPE)
+
+    def test_expired_entries_are_dropped(self):
+        cache = RecipeCache(self.db_path, ttl_seconds=60)
+        with patch('utils.recipe_cache.time.time', return_value=1000.0):
+            cache.put("Jeera Rice", SAMPLE_RECIPE)
+        with patch('utils.recipe_cache.time.time', return_value=1061.0):
+            self.assertIsNone(cache.get("Jeera Rice"))
+        self.assertEqual(cache.stats()['disk_entries'], 0)
+
+    def test_evicts_beyond_max_entries(self):
+        cache = RecipeCache(self.db_path, max_entries=2)
+        for index, dish in enumerate(["Jeera Rice", "Dal Tadka", "Aloo Gobi"]):
+            with patch('utils.recipe_cache.time.time', return_value=1000.0 + index):
+                cache.put(dish, SAMPLE_RECIPE)
+
+        self.assertEqual(cache.stats()['disk_entries'], 2)
+        self.assertIsNone(RecipeCache(self.db_path).get("Jeera Rice"))
+
+    def test_memory_hits_count_as_recent_for_eviction(self):
+        cache = RecipeCache(self.db_path, max_entries=2, access_flush_seconds=3600)
+        with patch('utils.recipe_cache.time.time', return_value=1000.0):
+            cache.put("Jeera Rice", SAMPLE_RECIPE)
+        with patch('utils.recipe_cache.time.time', return_value=1001.0):
+            cache.put("Dal Tadka", SAMPLE_RECIPE)
+        with patch('utils.recipe_cache.time.time', return_value=1002.0):
+            self.assertEqual(cache.get("Jeera Rice"), SAMPLE_RECIPE)
+        with patch('utils.recipe_cache.time.time', return_value=1003.0):
+            cache.put("Aloo Gobi", SAMPLE_RECIPE)
+
+        disk_only = RecipeCache(self.db_path, ttl_seconds=0)
+        self.assertEqual(disk_only.get("Jeera Rice"), SAMPLE_RECIPE)
+        self.assertIsNone(disk_only.get("Dal Tadka"))
+
+    def test_fetcher_serves_cached_recipe_without_network(self):
+        cache = RecipeCache(self.db_path)
+        cache.put("Jeera Rice", SAMPLE_RECIPE)
+
+        fetcher = RecipeFetcher("test-key", cache=cache)
+
+        with patch('openai.OpenAI') as client_class:
+            self.assertEqual(fetcher.fetch_recipe("Jeera  rice"), SAMPLE_RECIPE)
+        client_class.assert_not_called()
+        self.assertIsNone(fetcher.client)
+
+    def test_fetcher_does_not_cache_fallback_recipes(self):
+        cache = RecipeCache(self.db_path)
+
+        fetcher = RecipeFetcher("test-key", cache=cache)
+        fetcher.client = MagicMock()
+        fetcher.client.chat.completions.create.return_value = MagicMock(
+            choices=[MagicMock(message=MagicMock(content='{"dish_name": "Aloo Gobi"}'))]
+        )
+
+        fetcher.fetch_recipe("Aloo Gobi")
+        self.assertIsNone(cache.get("Aloo Gobi"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import sys
+import json
+import asyncio
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.recipe_fetcher import RecipeFetcher
+from utils.recipe_source import LocalCorpusSource, RecipeSourceError
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), '..', 'attached_assets', 'recipe_corpus.json')
+
+RECIPES = [
+    {"dish_name": "Jeera Rice", "dish_type": "Rice", "total_cooked_weight_grams": 600, "servings": 4,
+     "ingredients": [{"name": "Basmati Rice", "quantity": "1 cup"}]},
+    {"dish_name": "Dal Tadka", "dish_type": "Dal", "total_cooked_weight_grams": 900, "servings": 4,
+     "ingredients": [{"name": "Toor Dal", "quantity": "1 cup"}]},
+]
+
+class TestLocalCorpusSource(unittest.TestCase):
+
+    def test_serves_corpus_recipes_and_maps_other_dishes_deterministically(self):
+        source = LocalCorpusSource(RECIPES)
+
+        self.assertEqual(source.fetch("jeera  rice!"), RECIPES[0])
+        other = source.fetch("Masala Chai")
+        self.assertEqual(other["dish_name"], "Masala Chai")
+        self.assertIn(other["ingredients"], [recipe["ingredients"] for recipe in RECIPES])
+        self.assertEqual(LocalCorpusSource(RECIPES).fetch("masala chai"), other)
+
+        other["ingredients"].clear()
+        self.assertTrue(source.fetch("Masala Chai")["ingredients"])
+
+    def test_latency_and_errors_replay_for_the_same_seed(self):
+        def run(seed):
+            source = LocalCorpusSource(RECIPES, latency_ms=5, jitter_ms=10, error_rate=0.3, seed=seed)
+            return [source._draw(f"Dish {index % 7}") for index in range(200)]
+
+        draws = run(1)
+        self.assertEqual(draws, run(1))
+        self.assertNotEqual(draws, run(2))
+        self.assertTrue(all(delay >= 0.005 for delay, _ in draws))
+        self.assertTrue(30 < sum(failed for _, failed in draws) < 90)
+
+    def test_fetch_waits_and_raises_simulated_errors(self):
+        source = LocalCorpusSource(RECIPES, latency_ms=30, error_rate=1.0)
+
+        with patch('utils.recipe_source.time.sleep') as sleep:
+            with self.assertRaises(RecipeSourceError):
+                source.fetch("Jeera Rice")
+        sleep.assert_called_once_with(0.03)
+
+        with self.assertRaises(RecipeSourceError):
+            asyncio.run(source.fetch_async("Jeera Rice"))
+
+    def test_loads_json_and_jsonl_corpora(self):
+        self.assertGreater(len(LocalCorpusSource.load(CORPUS_PATH).recipes), 10)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'corpus.jsonl')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("\n".join(json.dumps(recipe) for recipe in RECIPES) + "\n")
+            self.assertEqual(LocalCorpusSource.load(path).recipes, RECIPES)
+
+        with self.assertRaises(ValueError):
+            LocalCorpusSource([])
+
+class TestRecipeFetcherWithSource(unittest.TestCase):
+
+    def test_fetcher_uses_source_without_api_key(self):
+        fetcher = RecipeFetcher(None, source=LocalCorpusSource(RECIPES))
+
+        with patch.dict(os.environ, {"OPENAI_API_KEY": ""}), patch('openai.OpenAI') as client_class:
+            self.assertEqual(fetcher.fetch_recipe("Dal Tadka"), RECIPES[1])
+        client_class.assert_not_called()
+
+    def test_fetcher_falls_back_when_source_fails_or_returns_invalid_data(self):
+        failing = RecipeFetcher(None, source=LocalCorpusSource(RECIPES, error_rate=1.0))
+        self.assertEqual(failing.fetch_recipe("Aloo Gobi")["dish_type"], "Dry Sabzi")
+
+        invalid = RecipeFetcher(None, source=LocalCorpusSource([{"dish_name": "Aloo Gobi"}]))
+        self.assertEqual(len(invalid.fetch_recipe("Aloo Gobi")["ingredients"]), 12)
+
+if __name__ == '__main__':
+    unittest.main()
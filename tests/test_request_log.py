@@ -0,0 +1,76 @@
+import os
+import sys
+import logging
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import request_log
+
+class ListHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+class TestRequestLog(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = ListHandler()
+        self.logger = logging.getLogger('test_request_log')
+        self.logger.setLevel(logging.WARNING)
+        self.logger.propagate = False
+        self.logger.addHandler(self.handler)
+        request_log.summary_logger.setLevel(logging.WARNING)
+        request_log.summary_logger.addHandler(self.handler)
+        self.addCleanup(request_log.summary_logger.setLevel, logging.NOTSET)
+        self.addCleanup(request_log.summary_logger.removeHandler, self.handler)
+        self.addCleanup(self.logger.removeHandler, self.handler)
+
+    def test_events_outside_a_request_are_logged_at_their_level(self):
+        request_log.event(self.logger, 'no_match', "No match found for ingredient: '%s'", 'saffron',
+                          level=logging.WARNING)
+        request_log.event(self.logger, 'dish_matched', "Matched dish '%s'", 'Dal Tadka')
+
+        self.assertEqual([record.getMessage() for record in self.handler.records],
+                         ["No match found for ingredient: 'saffron'"])
+
+    def test_request_events_are_summarized_in_one_record(self):
+        token = request_log.begin('api_calculate', dish='Dal Tadka')
+        for name in ('salt', 'ghee', 'saffron', 'hing'):
+            request_log.event(self.logger, 'no_match', "No match found for ingredient: '%s'", name,
+                              level=logging.WARNING)
+        request_log.event(self.logger, 'dish_matched', "Matched dish '%s'", 'Dal Tadka')
+        request_log.end(token)
+
+        self.assertEqual(len(self.handler.records), 1)
+        summary = self.handler.records[0]
+        self.assertEqual(summary.levelno, logging.WARNING)
+        self.assertEqual(summary.fields['dish'], 'Dal Tadka')
+        self.assertEqual(summary.fields['events']['no_match'], {'count': 4, 'examples': ['salt', 'ghee', 'saffron']})
+        self.assertEqual(summary.fields['events']['dish_matched']['count'], 1)
+
+    def test_sampled_requests_log_every_event(self):
+        with patch.object(request_log, '_debug_sample_rate', 1.0):
+            token = request_log.begin('api_calculate')
+        request_log.event(self.logger, 'dish_matched', "Matched dish '%s'", 'Dal Tadka')
+        request_log.end(token)
+
+        # The INFO summary itself stays below the WARNING level.
+        self.assertEqual([record.getMessage() for record in self.handler.records], ["Matched dish 'Dal Tadka'"])
+
+    def test_structured_formatter_includes_fields(self):
+        record = logging.LogRecord('nutrition.request', logging.INFO, __file__, 1, "done in %sms", (3,), None)
+        record.fields = {'request': 'api_calculate', 'events': {}}
+
+        line = request_log.StructuredFormatter().format(record)
+
+        self.assertIn('"message": "done in 3ms"', line)
+        self.assertIn('"request": "api_calculate"', line)
+
+if __name__ == '__main__':
+    unittest.main()
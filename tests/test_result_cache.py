@@ -0,0 +1,52 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.lru_cache import MISSING
+from utils.result_cache import ResultCache, recipe_fingerprint
+
+RECIPE = {
+    "dish_name": "Jeera Rice",
+    "dish_type": "Rice",
+    "total_cooked_weight_grams": 600,
+    "servings": 4,
+    "ingredients": [
+        {"name": "Rice", "quantity": "1 cup"},
+        {"name": "Ghee", "quantity": "1 tablespoon"}
+    ]
+}
+
+class TestRecipeFingerprint(unittest.TestCase):
+
+    def test_ignores_key_order_and_unrelated_fields(self):
+        reordered = {key: RECIPE[key] for key in reversed(list(RECIPE))}
+        reordered["ingredients"] = [{"quantity": "1 cup", "name": "Rice"}, {"quantity": "1 tablespoon", "name": "Ghee"}]
+        reordered["source"] = "cache"
+
+        self.assertEqual(recipe_fingerprint(reordered, "v1"), recipe_fingerprint(RECIPE, "v1"))
+
+    def test_changes_with_content_version_and_options(self):
+        fingerprint = recipe_fingerprint(RECIPE, "v1")
+
+        self.assertNotEqual(recipe_fingerprint(dict(RECIPE, servings=2), "v1"), fingerprint)
+        self.assertNotEqual(recipe_fingerprint(RECIPE, "v2"), fingerprint)
+        self.assertNotEqual(recipe_fingerprint(RECIPE, "v1", ["iron_mg"]), fingerprint)
+
+class TestResultCache(unittest.TestCase):
+
+    def test_new_database_version_drops_old_entries(self):
+        cache = ResultCache(8)
+        old_key = cache.key(RECIPE, "v1")
+        cache.put(old_key, "result")
+        self.assertEqual(cache.get(cache.key(RECIPE, "v1")), "result")
+
+        new_key = cache.key(RECIPE, "v2")
+
+        self.assertNotEqual(new_key, old_key)
+        self.assertIs(cache.get(old_key), MISSING)
+        self.assertEqual(cache.stats()['size'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
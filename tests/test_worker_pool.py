@@ -0,0 +1,71 @@
+import os
+import sys
+import logging
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import NUTRITION_DB_FILE
+from utils.db_loader import NutritionDatabaseLoader
+from utils.ingredient_processor import IngredientProcessor
+from utils.shared_table import SharedNutritionTable
+from utils.worker_pool import NutritionWorkerPool, build_calculator
+
+DB_PATH = os.path.join(os.path.dirname(__file__), '..', NUTRITION_DB_FILE)
+
+RECIPE = {
+    "dish_name": "Dal Tadka",
+    "dish_type": "Dal",
+    "total_cooked_weight_grams": 800,
+    "servings": 4,
+    "ingredients": [
+        {"name": "Toor Dal", "quantity": "1 cup"},
+        {"name": "Onion", "quantity": "1 medium"},
+        {"name": "Ghee", "quantity": "1 tablespoon"},
+        {"name": "Green chillies", "quantity": "2"}
+    ]
+}
+
+class TestSharedNutritionTable(unittest.TestCase):
+
+    def test_attached_tables_match_the_loader(self):
+        loader = NutritionDatabaseLoader(DB_PATH, backend='csv', full_profile=True)
+        loader.load()
+
+        with SharedNutritionTable(loader) as table:
+            arrays = SharedNutritionTable.attach(table.descriptor)
+            self.assertIsInstance(arrays['nutrient_matrix'], np.memmap)
+            self.assertFalse(arrays['nutrient_matrix'].flags.writeable)
+
+            attached = NutritionDatabaseLoader(DB_PATH, full_profile=True)
+            attached.load_arrays(arrays, 'shared')
+
+            np.testing.assert_array_equal(attached.nutrient_matrix, loader.nutrient_matrix)
+            np.testing.assert_array_equal(attached.profile_matrix, loader.profile_matrix)
+            for name in ["Onion", "toor dal", "Paneer", "mustard oil", "unknown thing"]:
+                self.assertEqual(attached.find_food_match(name), loader.find_food_match(name))
+                self.assertEqual(attached.get_ingredient_profile(name), loader.get_ingredient_profile(name))
+
+            directory = table.directory
+        self.assertFalse(os.path.exists(directory))
+
+class TestNutritionWorkerPool(unittest.TestCase):
+
+    def test_workers_calculate_like_the_parent(self):
+        calculator = build_calculator()
+        expected = calculator.calculate_nutrition(
+            RECIPE['dish_name'], RECIPE['dish_type'],
+            IngredientProcessor().process_ingredients(RECIPE['ingredients']),
+            RECIPE['total_cooked_weight_grams'], RECIPE['servings']
+        )
+
+        with NutritionWorkerPool(calculator, workers=2, log_level=logging.ERROR) as pool:
+            results = pool.submit_chunk([(1, RECIPE), (2, {"dish_name": "Empty"})]).result()
+
+        self.assertEqual(results[0], (1, expected))
+        self.assertIn('error', results[1][1])
+
+if __name__ == '__main__':
+    unittest.main()
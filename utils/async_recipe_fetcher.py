@@ -0,0 +1,140 @@
+"""
+Asyncio recipe fetching with bounded concurrency and in-flight request coalescing.
+"""
+
+import copy
+import math
+import asyncio
+import logging
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Union
+
+from utils.recipe_cache import normalize_dish_name
+from utils.recipe_fetcher import RecipeFetcher
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRecipeFetcher:
+    """
+    Runs RecipeFetcher lookups on a shared background event loop.
+
+    All upstream calls go through one ``AsyncOpenAI`` client (or the
+    fetcher's recipe source, when it has one), at most ``max_concurrency`` at
+    a time, each bounded by ``timeout`` seconds.
+    Concurrent requests for the same (normalized) dish share a single
+    upstream call. Prompting, validation, caching and fallback recipes are
+    delegated to the wrapped RecipeFetcher so both paths behave the same.
+
+    ``fetch_recipe`` and ``fetch_recipes`` are blocking bridges for the
+    synchronous Flask views.
+    """
+
+    def __init__(self, recipe_fetcher: RecipeFetcher, max_concurrency: int = 8, timeout: float = 30.0):
+        self.recipe_fetcher = recipe_fetcher
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.client = None
+
+        self._loop = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._semaphore = None
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        # Started on first use rather than in __init__ so pre-forking servers
+        # create the loop thread inside each worker.
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name="recipe-fetch-loop", daemon=True)
+                self._thread.start()
+                self._loop = loop
+        return self._loop
+
+    def close(self) -> None:
+        with self._start_lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join(timeout=5)
+                self._loop.close()
+                self._loop = None
+                self._thread = None
+
+    def _get_client(self):
+        if self.client is None:
+            from openai import AsyncOpenAI
+            self.client = AsyncOpenAI(api_key=self.recipe_fetcher.api_key)
+        return self.client
+
+    async def fetch_recipe_async(self, dish_name: str) -> Dict:
+        key = normalize_dish_name(dish_name)
+
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(dish_name))
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            logger.info("Joining in-flight recipe fetch for %s", dish_name)
+
+        recipe_data = await asyncio.shield(future)
+        return copy.deepcopy(recipe_data)
+
+    async def _fetch(self, dish_name: str) -> Dict:
+        fetcher = self.recipe_fetcher
+
+        recipe_data = await asyncio.to_thread(fetcher._local_recipe, dish_name)
+        if recipe_data is not None:
+            return recipe_data
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        try:
+            if fetcher.source is not None:
+                async with self._semaphore:
+                    recipe_data = await asyncio.wait_for(fetcher.source.fetch_async(dish_name),
+                                                         timeout=self.timeout)
+
+                return await asyncio.to_thread(fetcher._recipe_from_source, recipe_data, dish_name)
+
+            async with self._semaphore:
+                response = await asyncio.wait_for(
+                    self._get_client().chat.completions.create(**fetcher._completion_request(dish_name)),
+                    timeout=self.timeout
+                )
+
+            return await asyncio.to_thread(fetcher._recipe_from_completion, response, dish_name)
+
+        except asyncio.TimeoutError:
+            return fetcher._fallback_after_error(dish_name, f"timed out after {self.timeout}s")
+        except Exception as e:
+            return fetcher._fallback_after_error(dish_name, str(e))
+
+    async def fetch_recipes_async(self, dish_names: List[str]) -> List[Union[Dict, BaseException]]:
+        return await asyncio.gather(
+            *(self.fetch_recipe_async(dish_name) for dish_name in dish_names),
+            return_exceptions=True
+        )
+
+    def _run(self, coroutine, timeout: Optional[float]):
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._ensure_loop())
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def fetch_recipe(self, dish_name: str) -> Dict:
+        """Blocking drop-in for RecipeFetcher.fetch_recipe."""
+        # The upstream call is already bounded by self.timeout; the extra margin
+        # covers time spent queued behind the concurrency limit.
+        return self._run(self.fetch_recipe_async(dish_name), self.timeout * 2)
+
+    def fetch_recipes(self, dish_names: List[str]) -> List[Union[Dict, BaseException]]:
+        """Fetch several dishes concurrently; failures are returned in place of the recipe."""
+        waves = math.ceil(len(dish_names) / self.max_concurrency) if dish_names else 0
+        return self._run(self.fetch_recipes_async(dish_names), self.timeout * (waves + 1))
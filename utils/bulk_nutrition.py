@@ -0,0 +1,163 @@
+"""
+Bulk nutrition for recipe files, without the web app.
+
+Reads recipes shaped like RecipeFetcher results (dish_name, dish_type,
+total_cooked_weight_grams, servings, ingredients) from JSONL, one recipe per
+line, or CSV, with ``ingredients`` holding the JSON list. Calculations run on
+a NutritionWorkerPool and results are written as JSONL in input order while the
+input is still being read:
+
+    python -m utils.bulk_nutrition recipes.jsonl [-o results.jsonl] [--workers N] [--nutrients all]
+
+Only a bounded window of chunks is in flight at any time, so memory use does
+not grow with the size of the input.
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import logging
+import argparse
+from collections import deque
+from itertools import islice
+from typing import Dict, Iterator, Tuple
+
+from utils import request_log
+from utils.worker_pool import NutritionWorkerPool, build_calculator
+
+logger = logging.getLogger(__name__)
+
+# Recipes per task handed to a worker, and tasks in flight per worker.
+DEFAULT_CHUNK_SIZE = 64
+PENDING_CHUNKS_PER_WORKER = 2
+
+
+def read_recipes(path: str) -> Iterator[Tuple[int, object]]:
+    """
+    Yield (line number, recipe) for every record of a .jsonl or .csv file.
+
+    A record that cannot be decoded is yielded as the exception instead, so it
+    is reported in the output without stopping the run.
+    """
+    if path.lower().endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                try:
+                    yield reader.line_num, _recipe_from_csv_row(row)
+                except ValueError as e:
+                    yield reader.line_num, e
+        return
+
+    stream = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    try:
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as e:
+                yield line_number, e
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def _recipe_from_csv_row(row: Dict[str, str]) -> Dict:
+    recipe = {key: value for key, value in row.items() if value not in (None, '')}
+    recipe['ingredients'] = json.loads(row.get('ingredients') or '[]')
+    for key, cast in (('total_cooked_weight_grams', float), ('servings', int)):
+        if key in recipe:
+            recipe[key] = cast(recipe[key])
+    return recipe
+
+
+def _chunks(records, size):
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run(records, output, workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+        log_level: int = logging.WARNING, nutrients=None) -> Dict:
+    """
+    Calculate every record and write one JSON line per record to ``output``.
+
+    ``nutrients`` ("all" or a list of IFCT columns) adds the full nutrient
+    profile to each result; it needs NUTRITION_FULL_PROFILE=1 and raises
+    ValueError otherwise. Returns counts and throughput for the run.
+    """
+    start = time.perf_counter()
+    recipes = errors = 0
+
+    def write(results):
+        nonlocal recipes, errors
+        for line_number, result in results:
+            recipes += 1
+            if 'error' in result:
+                errors += 1
+            output.write(json.dumps({'line': line_number, **result}) + '\n')
+
+    calculator = build_calculator()
+    if nutrients is not None:
+        nutrients = calculator.db_loader.resolve_profile_columns(nutrients)
+
+    with NutritionWorkerPool(calculator, workers=workers or os.cpu_count(), log_level=log_level) as pool:
+        pending = deque()
+        for chunk in _chunks(records, chunk_size):
+            pending.append(pool.submit_chunk(chunk, nutrients))
+            if len(pending) >= pool.workers * PENDING_CHUNKS_PER_WORKER:
+                write(pending.popleft().result())
+        while pending:
+            write(pending.popleft().result())
+
+    elapsed = time.perf_counter() - start
+    return {
+        'recipes': recipes,
+        'errors': errors,
+        'seconds': elapsed,
+        'recipes_per_second': recipes / elapsed if elapsed > 0 else 0.0
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Calculate nutrition for a file of recipes.")
+    parser.add_argument('input', help="recipes as .jsonl (or - for stdin) or .csv")
+    parser.add_argument('-o', '--output', default='-', help="JSONL results file (default: stdout)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="recipes per worker task")
+    parser.add_argument('--log-level', default='ERROR', help="log level (default: ERROR)")
+    parser.add_argument('--nutrients', default=None,
+                        help="add the full nutrient profile: \"all\" or comma-separated IFCT columns "
+                             "(needs NUTRITION_FULL_PROFILE=1)")
+    args = parser.parse_args(argv)
+
+    nutrients = args.nutrients
+    if nutrients is not None and nutrients != 'all':
+        nutrients = [column.strip() for column in nutrients.split(',') if column.strip()]
+
+    log_level = getattr(logging, args.log_level.upper(), logging.ERROR)
+    request_log.configure(log_level)
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        stats = run(read_recipes(args.input), output, workers=args.workers,
+                    chunk_size=args.chunk_size, log_level=log_level, nutrients=nutrients)
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"Processed {stats['recipes']} recipes ({stats['errors']} errors) in {stats['seconds']:.2f}s: "
+          f"{stats['recipes_per_second']:.1f} recipes/s", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,74 @@
+import csv
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Cells pandas.read_csv reads as missing by default.
+NA_VALUES = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+])
+
+
+class CsvTable:
+    """
+    A CSV file held as one list of raw strings per column, read with the stdlib
+    ``csv`` module.
+
+    Columns are typed on demand: ``numeric`` follows pandas' inference, so a
+    column is numeric when every non-missing cell parses as a float.
+    """
+
+    __slots__ = ('columns', '_cells')
+
+    def __init__(self, columns: List[str], cells: Dict[str, List[str]]):
+        self.columns = columns
+        self._cells = cells
+
+    @classmethod
+    def read(cls, path: str) -> 'CsvTable':
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            columns = next(reader, [])
+            rows = [row for row in reader if row]
+
+        cells = {}
+        for position, column in enumerate(columns):
+            cells[column] = [row[position] if position < len(row) else '' for row in rows]
+        return cls(columns, cells)
+
+    def __len__(self) -> int:
+        return len(self._cells[self.columns[0]]) if self.columns else 0
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._cells
+
+    def strings(self, column: str) -> List[Optional[str]]:
+        """Cells of a text column, with missing cells as None."""
+        return [None if value in NA_VALUES else value for value in self._cells[column]]
+
+    def numeric(self, column: str) -> Optional[np.ndarray]:
+        """Cells of a column as float64 with NaN for missing cells, or None for a text column."""
+        values = np.empty(len(self), dtype=np.float64)
+        for row, value in enumerate(self._cells[column]):
+            value = value.strip()
+            if value in NA_VALUES:
+                values[row] = np.nan
+                continue
+            # float() also accepts digit separators ("1_000"), which pandas reads as text.
+            if '_' in value:
+                return None
+            try:
+                values[row] = float(value)
+            except ValueError:
+                return None
+        return values
+
+    def numeric_columns(self) -> Dict[str, np.ndarray]:
+        """Every numeric column, in file order."""
+        numeric = {}
+        for column in self.columns:
+            values = self.numeric(column)
+            if values is not None:
+                numeric[column] = values
+        return numeric
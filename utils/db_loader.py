@@ -1,45 +1,290 @@
 import os
-import pandas as pd
+import re
+import hashlib
+import numpy as np
 import logging
 
-logging.basicConfig(level=logging.INFO, 
-                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+from utils.csv_table import CsvTable
+from utils.db_snapshot import read_snapshot
+from utils.fuzzy_index import FuzzyIndex
+from utils.ingredient_aliases import AliasTable
+from utils.ingredient_index import IngredientIndex, PackedPostings
+from utils import metrics, request_log
+from utils.lru_cache import LRUCache, MISSING
+
 logger = logging.getLogger(__name__)
 
+# Nutrient keys used throughout the calculator, in nutrient matrix column order,
+# and the database columns they are read from.
+NUTRIENT_KEYS = ['calories', 'carbs', 'protein', 'fat', 'fiber']
+NUTRIENT_COLUMNS = ['energy_kcal', 'carb_g', 'protein_g', 'fat_g', 'fibre_g']
+
+# IFCT columns holding values for one household serving rather than per 100g.
+UNIT_SERVING_PREFIX = 'unit_serving_'
+
+ESSENTIAL_COLUMNS = ['food_code', 'food_name'] + NUTRIENT_COLUMNS
+
+# How the CSV is parsed: with pandas, or with the stdlib csv module so that
+# deployments without pandas can still load it.
+BACKENDS = ('pandas', 'csv')
+
+# Fuzzy matches scoring below this fall back to the substring search.
+DEFAULT_MATCH_THRESHOLD = 0.5
+
+# IFCT raw foods have a one-letter code (A001, T510); composite dishes
+# (ASC..., BFP..., OSR...) score lower so ingredient names prefer raw foods.
+RAW_FOOD_CODE = re.compile(r'^[A-Z]\d')
+DISH_SCORE_FACTOR = 0.8
+
+# Botanical names in parentheses ("Cumin seeds (Cuminum cyminum)") are left
+# out of fuzzy matching; they only dilute the score.
+PARENTHESIZED_SUFFIX = re.compile(r'\s*\(.*$')
+
+def _as_list(values):
+    """Python list of a numpy array (so strings and ints are native) or any sequence."""
+    return values.tolist() if isinstance(values, np.ndarray) else list(values)
+
 class NutritionDatabaseLoader:
 
-    def __init__(self, db_path):
+    def __init__(self, db_path, cache_size=2048, full_profile=False, snapshot_path=None, backend='pandas',
+                 match_threshold=DEFAULT_MATCH_THRESHOLD, alias_path=None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown nutrition database backend {backend!r}, expected one of {BACKENDS}")
+
         self.db_path = db_path
-        self.nutrition_df = None
+        self.backend = backend
+        self.full_profile = full_profile
+        self.snapshot_path = snapshot_path
+        self.loaded_from = None
+        self._nutrition_df = None
+        self.match_threshold = match_threshold
+        self.alias_path = alias_path
+        self.aliases = AliasTable({})
+        self.index = None
+        self._fuzzy_index = None
+        self._version = None
+        self._food_names = []
+        self._food_codes = []
+        self.nutrient_matrix = np.zeros((0, len(NUTRIENT_COLUMNS)))
+        self.profile_columns = []
+        self.profile_matrix = None
+        self._profile_column_index = {}
+        self.lookup_cache = LRUCache(cache_size)
         
+    @property
+    def nutrition_df(self):
+        """The prepared table as a DataFrame; built on first access when pandas did not load it."""
+        if self._nutrition_df is None and self.index is not None:
+            self._nutrition_df = self._dataframe_from_arrays()
+        return self._nutrition_df
+
+    @nutrition_df.setter
+    def nutrition_df(self, value):
+        self._nutrition_df = value
+
+    @property
+    def food_names(self):
+        return self._food_names
+
+    @property
+    def food_codes(self):
+        return self._food_codes
+
+    @property
+    def fuzzy_index(self):
+        """Trigram similarity index over the food names, built on first use."""
+        if self._fuzzy_index is None:
+            self._fuzzy_index = FuzzyIndex(
+                [PARENTHESIZED_SUFFIX.sub('', name) for name in self.index.names],
+                row_weights=[1.0 if RAW_FOOD_CODE.match(str(code)) else DISH_SCORE_FACTOR
+                             for code in self._food_codes]
+            )
+        return self._fuzzy_index
+
+    @property
+    def version(self):
+        """
+        Short digest of everything that decides lookup results: the nutrient
+        tables, the food names, the aliases and the match threshold.
+
+        Results computed against one version stay valid until it changes.
+        """
+        if self._version is None:
+            if self.index is None:
+                raise ValueError("Nutrition database must be loaded first")
+
+            digest = hashlib.sha256()
+            digest.update(repr((self.match_threshold, self._food_codes, self._food_names)).encode('utf-8'))
+            digest.update(repr(sorted(self.aliases.rows_by_alias.items())).encode('utf-8'))
+            digest.update(np.ascontiguousarray(self.nutrient_matrix).tobytes())
+            if self.profile_matrix is not None:
+                digest.update(repr(self.profile_columns).encode('utf-8'))
+                digest.update(np.ascontiguousarray(self.profile_matrix).tobytes())
+            self._version = digest.hexdigest()[:16]
+        return self._version
+
     def load_database(self):
+        """Load the database and return the prepared table as a DataFrame."""
+        self.load()
+        return self.nutrition_df
+
+    def load(self):
+        """
+        Load the lookup tables, from the binary snapshot when a fresh one exists.
+
+        Unlike load_database this never needs pandas on the snapshot path or
+        with the csv backend.
+        """
         try:
+            if self.snapshot_path and self._load_snapshot():
+                logger.info("Loaded nutrition database snapshot with %s entries", len(self._food_names))
+                return
+
             if not os.path.exists(self.db_path):
-                logger.error(f"Database file not found at: {self.db_path}")
+                logger.error("Database file not found at: %s", self.db_path)
                 raise FileNotFoundError(f"Database file not found at: {self.db_path}")
 
-            self.nutrition_df = pd.read_csv(self.db_path)
+            if self.backend == 'csv':
+                self._load_csv_table()
+            else:
+                import pandas as pd
 
-            self._prepare_dataframe()
+                self.nutrition_df = pd.read_csv(self.db_path)
+
+                if self.full_profile:
+                    self._build_profile()
+                self._prepare_dataframe()
+                self._build_index()
+
+            self.loaded_from = 'csv'
+            self._load_aliases()
+            self.invalidate_cache()
             
-            logger.info(f"Successfully loaded nutrition database with {len(self.nutrition_df)} entries")
-            return self.nutrition_df
+            logger.info("Successfully loaded nutrition database with %s entries", len(self._food_names))
             
         except Exception as e:
-            logger.error(f"Error loading nutrition database: {str(e)}")
+            logger.error("Error loading nutrition database: %s", e)
             raise
+
+    def _load_snapshot(self):
+        arrays = read_snapshot(self.snapshot_path, self.db_path, include_profile=self.full_profile)
+        if arrays is None:
+            return False
+
+        self.load_arrays(arrays, 'snapshot')
+        return True
+
+    def table_arrays(self):
+        """The prepared tables, keyed like a snapshot, for handing to load_arrays elsewhere."""
+        if self.index is None:
+            raise ValueError("Nutrition database must be loaded first")
+
+        keys, offsets, rows = self.index.packed_postings()
+        arrays = {
+            'food_codes': self._food_codes,
+            'food_names': self._food_names,
+            'food_names_lower': self.index.names,
+            'nutrient_matrix': self.nutrient_matrix,
+            'postings_keys': keys,
+            'postings_offsets': offsets,
+            'postings_rows': rows,
+        }
+        if self.profile_matrix is not None:
+            arrays['profile_columns'] = self.profile_columns
+            arrays['profile_matrix'] = self.profile_matrix
+        return arrays
+
+    def load_arrays(self, arrays, loaded_from):
+        """
+        Use tables prepared elsewhere (a snapshot, or another process) as they are.
+
+        The matrices are not copied, so they may be read-only or memory-mapped.
+        """
+        self._nutrition_df = None
+        self._food_codes = _as_list(arrays['food_codes'])
+        self._food_names = _as_list(arrays['food_names'])
+        self.nutrient_matrix = arrays['nutrient_matrix']
+        self.index = IngredientIndex(
+            _as_list(arrays['food_names_lower']),
+            postings=PackedPostings(_as_list(arrays['postings_keys']),
+                                    _as_list(arrays['postings_offsets']),
+                                    _as_list(arrays['postings_rows']))
+        )
+
+        if self.full_profile:
+            self.profile_columns = _as_list(arrays['profile_columns'])
+            self.profile_matrix = arrays['profile_matrix']
+            self._profile_column_index = {column: i for i, column in enumerate(self.profile_columns)}
+
+        self.loaded_from = loaded_from
+        self._load_aliases()
+        self.invalidate_cache()
+
+    def _load_csv_table(self):
+        """Build the same arrays as the pandas path, straight from the CSV cells."""
+        table = CsvTable.read(self.db_path)
+
+        missing_columns = [col for col in ESSENTIAL_COLUMNS if col not in table]
+        if missing_columns:
+            logger.warning("Missing essential columns in nutrition database: %s", missing_columns)
+
+        nutrient_columns = []
+        for column in NUTRIENT_COLUMNS:
+            values = table.numeric(column) if column in table else np.zeros(len(table))
+            if values is None:
+                raise ValueError(f"Nutrition database column {column} is not numeric")
+            nutrient_columns.append(values)
+
+        self._nutrition_df = None
+        self._food_codes = table.strings('food_code') if 'food_code' in table else [None] * len(table)
+        self._food_names = table.strings('food_name') if 'food_name' in table else [None] * len(table)
+        nutrient_matrix = np.column_stack(nutrient_columns)
+        self.nutrient_matrix = np.where(np.isnan(nutrient_matrix), 0.0, nutrient_matrix)
+        self.index = IngredientIndex([name.lower() if name is not None else '' for name in self._food_names])
+
+        if self.full_profile:
+            numeric = table.numeric_columns()
+            self.profile_columns = list(numeric)
+            matrix = np.column_stack(list(numeric.values())) if numeric else np.zeros((len(table), 0))
+            self.profile_matrix = np.ascontiguousarray(np.where(np.isnan(matrix), 0.0, matrix), dtype=np.float32)
+            self._profile_column_index = {column: i for i, column in enumerate(self.profile_columns)}
+
+    def _load_aliases(self):
+        """Compile the alias file against the food codes just loaded; a missing file means no aliases."""
+        self.aliases = AliasTable({})
+        if not self.alias_path:
+            return
+
+        if not os.path.exists(self.alias_path):
+            logger.warning("Ingredient alias file not found at: %s", self.alias_path)
+            return
+
+        try:
+            self.aliases = AliasTable.load(self.alias_path, self._food_codes)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.error("Could not load ingredient aliases from %s: %s", self.alias_path, e)
+            return
+
+        logger.info("Loaded %s ingredient aliases", len(self.aliases))
+
+    def _dataframe_from_arrays(self):
+        import pandas as pd
+
+        nutrition_df = pd.DataFrame({'food_code': self._food_codes, 'food_name': self._food_names})
+        nutrition_df[NUTRIENT_COLUMNS] = self.nutrient_matrix
+        nutrition_df['food_name_lower'] = self.index.names
+        return nutrition_df
     
     def _prepare_dataframe(self):
         if self.nutrition_df is None:
             return
         
 
-        essential_columns = ['food_code', 'food_name', 'energy_kcal', 'carb_g', 
-                            'protein_g', 'fat_g', 'fibre_g']
+        essential_columns = ESSENTIAL_COLUMNS
 
         missing_columns = [col for col in essential_columns if col not in self.nutrition_df.columns]
         if missing_columns:
-            logger.warning(f"Missing essential columns in nutrition database: {missing_columns}")
+            logger.warning("Missing essential columns in nutrition database: %s", missing_columns)
 
             for col in missing_columns:
                 self.nutrition_df[col] = float('nan')
@@ -49,50 +294,278 @@ class NutritionDatabaseLoader:
             
             self.nutrition_df['food_name_lower'] = self.nutrition_df['food_name'].str.lower()
 
-            numerical_columns = ['energy_kcal', 'carb_g', 'protein_g', 'fat_g', 'fibre_g']
-            self.nutrition_df[numerical_columns] = self.nutrition_df[numerical_columns].fillna(0)
+            self.nutrition_df[NUTRIENT_COLUMNS] = self.nutrition_df[NUTRIENT_COLUMNS].fillna(0)
             
         except Exception as e:
-            logger.error(f"Error preparing nutrition dataframe: {str(e)}")
+            logger.error("Error preparing nutrition dataframe: %s", e)
             raise
     
-    def get_ingredient_nutrition(self, ingredient_name):
+    def _build_profile(self):
+        """
+        Keep every numeric column of the raw CSV in a compact float32 matrix.
+
+        Must run before _prepare_dataframe drops the non-essential columns. Missing
+        values are stored as 0, matching how the essential columns are treated.
+        """
+        numeric_df = self.nutrition_df.select_dtypes(include='number')
+
+        self.profile_columns = numeric_df.columns.tolist()
+        self.profile_matrix = np.ascontiguousarray(numeric_df.fillna(0).to_numpy(dtype=np.float32))
+        self._profile_column_index = {column: i for i, column in enumerate(self.profile_columns)}
+
+    def aggregatable_profile_columns(self):
+        """Profile columns expressed per 100g, which can be scaled by ingredient weight."""
+        return [column for column in self.profile_columns if not column.startswith(UNIT_SERVING_PREFIX)]
+
+    def resolve_profile_columns(self, requested):
+        """
+        Validate a column selection for recipe-level profiles.
+
+        ``"all"`` selects every per-100g column; otherwise a list of column names is
+        expected. Raises ValueError for anything that cannot be aggregated.
+        """
+        if self.profile_matrix is None:
+            raise ValueError("Full nutrient profile is not enabled")
+
+        available = self.aggregatable_profile_columns()
+        if requested == 'all':
+            return available
+
+        if not isinstance(requested, list) or not all(isinstance(column, str) for column in requested):
+            raise ValueError("nutrients must be \"all\" or a list of column names")
+
+        unknown = [column for column in requested if column not in available]
+        if unknown:
+            raise ValueError(f"Unknown or non-aggregatable nutrient columns: {unknown}")
+
+        return list(dict.fromkeys(requested))
+
+    def profile_column_indices(self, columns):
+        if self.profile_matrix is None:
+            raise ValueError("Full nutrient profile is not enabled")
+
+        unknown = [column for column in columns if column not in self._profile_column_index]
+        if unknown:
+            raise ValueError(f"Unknown nutrient columns: {unknown}")
+
+        return np.array([self._profile_column_index[column] for column in columns], dtype=np.intp)
+
+    def get_ingredient_profile(self, ingredient_name, columns=None):
+        """Full nutrient profile of the matched food, including unit_serving_* values."""
+        row_id = self.find_food_index(ingredient_name)
+        if row_id is None:
+            return None
+
+        columns = columns or self.profile_columns
+        values = self.profile_matrix[row_id, self.profile_column_indices(columns)].tolist()
+        return {
+            'ingredient': self._food_names[row_id],
+            **dict(zip(columns, values))
+        }
+
+    def _build_index(self):
         if self.nutrition_df is None:
-            logger.warning("Nutrition database not loaded. Loading now...")
-            self.load_database()
+            return
 
+        self._food_names = self.nutrition_df['food_name'].tolist()
+        self._food_codes = self.nutrition_df['food_code'].tolist()
+        self.nutrient_matrix = np.ascontiguousarray(
+            self.nutrition_df[NUTRIENT_COLUMNS].to_numpy(dtype=np.float64)
+        )
+        self.index = IngredientIndex(self.nutrition_df['food_name_lower'].fillna('').tolist())
+
+    def _find_match(self, ingredient_name):
+        """
+        (row id, score) of the best food for an ingredient name.
+
+        Alias and exact names score 1. Otherwise the best fuzzy match is taken when it
+        scores at least ``match_threshold``; below that the first food containing
+        the name (or one of its words) is used, scored by its similarity.
+        """
+        match = self._find_direct_match(ingredient_name)
+        if match is not None:
+            return match
+        return self._find_similar_match(ingredient_name)
+
+    def _find_direct_match(self, ingredient_name):
+        """(row id, 1.0) for an alias or an exact food name; None otherwise."""
+        row_id = self.aliases.lookup(ingredient_name)
+        if row_id is not None:
+            return row_id, 1.0
+
+        row_id, match_count = self.index.find_exact(ingredient_name.lower())
+        if row_id is None:
+            return None
+
+        if match_count > 1:
+            request_log.event(logger, 'multiple_matches', "Multiple matches found for '%s'. Using first match: '%s'",
+                              ingredient_name, self._food_names[row_id])
+        return row_id, 1.0
+
+    def _find_similar_match(self, ingredient_name):
+        """Fuzzy and substring stages of ``_find_match``, for names with no direct match."""
         ingredient_lower = ingredient_name.lower()
 
-        matches = self.nutrition_df[self.nutrition_df['food_name_lower'] == ingredient_lower]
+        best = self.fuzzy_index.top_k(ingredient_lower, 1)
+        if best and best[0][1] >= self.match_threshold:
+            return best[0]
 
-        if len(matches) == 0:
-            matches = self.nutrition_df[self.nutrition_df['food_name_lower'].str.contains(ingredient_lower)]
+        row_id, match_count = self._find_row(ingredient_name)
+        if row_id is None:
+            return None, 0.0
 
-        if len(matches) == 0:
+        if match_count > 1:
+            request_log.event(logger, 'multiple_matches', "Multiple matches found for '%s'. Using first match: '%s'",
+                              ingredient_name, self._food_names[row_id])
+        return row_id, self.fuzzy_index.score(ingredient_lower, row_id)
+
+    def _find_row(self, ingredient_name):
+        ingredient_lower = ingredient_name.lower()
+
+        row_id, match_count = self.index.find_containing(ingredient_lower)
+
+        if row_id is None:
             words = ingredient_lower.split()
             if len(words) > 1:  
                 for word in words:
                     if len(word) > 3:  
-                        word_matches = self.nutrition_df[self.nutrition_df['food_name_lower'].str.contains(word)]
-                        if len(word_matches) > 0:
-                            matches = word_matches
-                            logger.info(f"Found partial match for '{ingredient_name}' using word '{word}'")
+                        row_id, match_count = self.index.find_containing(word)
+                        if row_id is not None:
+                            request_log.event(logger, 'partial_match', "Found partial match for '%s' using word '%s'",
+                                              ingredient_name, word)
                             break
-        
-        if len(matches) > 0:
 
-            if len(matches) > 1:
-                logger.info(f"Multiple matches found for '{ingredient_name}'. Using first match: '{matches.iloc[0]['food_name']}'")
+        return row_id, match_count
+
+    def spawn(self):
+        """A new, unloaded loader with the same files and settings."""
+        return NutritionDatabaseLoader(self.db_path, cache_size=self.lookup_cache.maxsize,
+                                       full_profile=self.full_profile, snapshot_path=self.snapshot_path,
+                                       backend=self.backend, match_threshold=self.match_threshold,
+                                       alias_path=self.alias_path)
 
-            nutrition_data = matches.iloc[0].to_dict()
+    def warm_up(self, ingredient_names=()):
+        """
+        Build everything that is otherwise built on first use (the fuzzy index,
+        the version) and fill the lookup cache for ``ingredient_names``.
+        """
+        self.fuzzy_index
+        self.version
+        self.find_food_matches(list(ingredient_names))
+
+    def invalidate_cache(self):
+        """Forget memoized lookups; must be called whenever the underlying table changes."""
+        self._fuzzy_index = None
+        self._version = None
+        self.lookup_cache.invalidate()
+
+    def cache_stats(self):
+        return self.lookup_cache.stats()
+
+    def find_food_index(self, ingredient_name):
+        """Row of ``nutrient_matrix`` matching the ingredient, or None when nothing matches."""
+        return self.find_food_match(ingredient_name)[0]
+
+    def find_food_match(self, ingredient_name):
+        """(row id, match score) for the ingredient; (None, 0.0) when nothing matches."""
+        if self.index is None:
+            logger.warning("Nutrition database not loaded. Loading now...")
+            self.load()
+
+        with metrics.span('ingredient_lookup'):
+            cache_key = ingredient_name.lower()
+            match = self.lookup_cache.get(cache_key)
+
+            if match is MISSING:
+                match = self._find_match(ingredient_name)
+                self.lookup_cache.put(cache_key, match)
+
+                if match[0] is None:
+                    request_log.event(logger, 'no_match', "No match found for ingredient: '%s'", ingredient_name,
+                                      level=logging.WARNING)
+
+        return match
+
+    def find_food_matches(self, ingredient_names):
+        """
+        (row id, match score) for each ingredient name, in input order.
+
+        Gives the same matches as calling find_food_match per name, but each
+        distinct name is resolved once, and in stages over the whole list:
+        cached names, then aliases and exact names, and only the names still
+        unmatched go through fuzzy and substring matching.
+
+        A call is timed as one ``ingredient_lookup_batch`` observation, so the
+        per-name ``ingredient_lookup`` stage keeps its meaning.
+        """
+        if self.index is None:
+            logger.warning("Nutrition database not loaded. Loading now...")
+            self.load()
+
+        with metrics.span('ingredient_lookup_batch'):
+            matches = {}
+            pending = {}
+            for name in ingredient_names:
+                cache_key = name.lower()
+                if cache_key in matches or cache_key in pending:
+                    continue
+                match = self.lookup_cache.get(cache_key)
+                if match is MISSING:
+                    pending[cache_key] = name
+                else:
+                    matches[cache_key] = match
+
+            unmatched = []
+            for cache_key, name in pending.items():
+                match = self._find_direct_match(name)
+                if match is None:
+                    unmatched.append((cache_key, name))
+                else:
+                    matches[cache_key] = match
+
+            for cache_key, name in unmatched:
+                match = matches[cache_key] = self._find_similar_match(name)
+                if match[0] is None:
+                    request_log.event(logger, 'no_match', "No match found for ingredient: '%s'", name,
+                                      level=logging.WARNING)
+
+            for cache_key in pending:
+                self.lookup_cache.put(cache_key, matches[cache_key])
+
+        return [matches[name.lower()] for name in ingredient_names]
+
+    def search(self, ingredient_name, k=5):
+        """The ``k`` foods most similar to the ingredient name, best first, with their scores."""
+        if self.index is None:
+            self.load()
+
+        return [
+            {'food_code': self._food_codes[row_id], 'ingredient': self._food_names[row_id], 'score': score}
+            for row_id, score in self.fuzzy_index.top_k(ingredient_name.lower(), k)
+        ]
+
+    def food_name(self, row_id):
+        return self._food_names[row_id]
+
+    def get_ingredient_nutrition(self, ingredient_name):
+        row_id = self.find_food_index(ingredient_name)
+
+        if row_id is not None:
             return {
-                'ingredient': matches.iloc[0]['food_name'],
-                'calories': nutrition_data['energy_kcal'],
-                'carbs': nutrition_data['carb_g'],
-                'protein': nutrition_data['protein_g'],
-                'fat': nutrition_data['fat_g'],
-                'fiber': nutrition_data['fibre_g']
+                'ingredient': self._food_names[row_id],
+                **dict(zip(NUTRIENT_KEYS, self.nutrient_matrix[row_id].tolist()))
             }
         else:
-            logger.warning(f"No match found for ingredient: '{ingredient_name}'")
             return None
+
+    def get_ingredients_nutrition(self, ingredient_names):
+        """get_ingredient_nutrition for each name, in input order, resolved with find_food_matches."""
+        row_ids = [row_id for row_id, _ in self.find_food_matches(ingredient_names)]
+        matched = [row_id for row_id in row_ids if row_id is not None]
+        values = iter(self.nutrient_matrix[matched].tolist())
+
+        return [
+            {'ingredient': self._food_names[row_id], **dict(zip(NUTRIENT_KEYS, next(values)))}
+            if row_id is not None else None
+            for row_id in row_ids
+        ]
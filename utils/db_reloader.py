@@ -0,0 +1,132 @@
+import os
+import time
+import logging
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DatabaseReloader:
+    """
+    Reloads a NutritionCalculator's database on a background thread.
+
+    A reload is started on demand (``reload``) or, with ``watch``, when one of
+    the database files changes. At most one reload runs at a time; requests
+    keep being served from the current tables until the new ones are swapped
+    in, and a failed reload leaves them in place.
+    """
+
+    def __init__(self, calculator, watch_paths: Iterable[str] = ()):
+        self.calculator = calculator
+        self.watch_paths = [path for path in watch_paths if path]
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.state = 'idle'
+        self.reloads = 0
+        self.last_reason: Optional[str] = None
+        self.last_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def reload(self, reason: str = 'manual', wait: bool = False) -> bool:
+        """Start a reload; False when one is already running (``wait`` then waits for that one)."""
+        with self._lock:
+            started = not self.running
+            if started:
+                self.state = 'reloading'
+                self.last_reason = reason
+                self._thread = threading.Thread(target=self._run, name='nutrition-db-reload', daemon=True)
+                self._thread.start()
+            thread = self._thread
+
+        if wait:
+            thread.join()
+        return started
+
+    def _run(self) -> None:
+        start = time.perf_counter()
+        try:
+            with metrics.span('reload_database'):
+                loader = self.calculator.reload_database()
+        except Exception as e:
+            self.last_error = str(e)
+            self.state = 'failed'
+            logger.error("Nutrition database reload (%s) failed, keeping the current tables: %s",
+                         self.last_reason, e)
+            return
+
+        self.last_seconds = time.perf_counter() - start
+        self.last_error = None
+        self.reloads += 1
+        self.state = 'idle'
+        logger.info("Reloaded nutrition database (%s): %s entries, version %s, in %.2fs",
+                    self.last_reason, len(loader.food_names), loader.version, self.last_seconds)
+
+    def watch(self, interval: float) -> None:
+        """
+        Poll the watched files every ``interval`` seconds. A changed file is
+        reloaded once it has stayed the same for one interval.
+        """
+        if self._watcher is not None or not self.watch_paths:
+            return
+
+        signatures = {path: _file_signature(path) for path in self.watch_paths}
+        pending = {}
+
+        def poll():
+            while not self._stop.wait(interval):
+                changed = []
+                for path in self.watch_paths:
+                    signature = _file_signature(path)
+                    if signature == signatures[path]:
+                        pending.pop(path, None)
+                    elif pending.get(path) == signature:
+                        # Unchanged since the last poll, so the file is no longer being written.
+                        signatures[path] = signature
+                        del pending[path]
+                        changed.append(path)
+                    else:
+                        pending[path] = signature
+
+                if changed:
+                    self.reload(reason=f"changed: {', '.join(os.path.basename(path) for path in changed)}")
+
+        self._watcher = threading.Thread(target=poll, name='nutrition-db-watch', daemon=True)
+        self._watcher.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def status(self) -> Dict[str, Any]:
+        status = {
+            'state': self.state,
+            'version': self.calculator.db_loader.version,
+            'reloads': self.reloads,
+            'watching': self._watcher is not None,
+        }
+        if self.last_reason:
+            status['last_reason'] = self.last_reason
+        if self.last_seconds is not None:
+            status['last_seconds'] = round(self.last_seconds, 3)
+        if self.last_error:
+            status['last_error'] = self.last_error
+        return status
@@ -0,0 +1,141 @@
+"""
+Binary snapshot of the prepared nutrition database.
+
+Building the lookup tables from the IFCT CSV means importing pandas, parsing
+~90 columns and indexing every food name, all before the first request. The
+snapshot stores the prepared arrays and the n-gram postings in one ``.npz``
+file that NutritionDatabaseLoader reads in a few milliseconds with numpy only.
+
+The snapshot records the size, mtime and SHA-256 of the CSV it was built
+from; a snapshot whose source no longer matches is ignored and the loader
+falls back to the CSV. Build it as a deploy step:
+
+    python -m utils.db_snapshot [--db PATH] [--out PATH]
+"""
+
+import os
+import sys
+import hashlib
+import logging
+import argparse
+import tempfile
+from typing import Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+PROFILE_ARRAYS = ('profile_columns', 'profile_matrix')
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_snapshot(loader, snapshot_path: str) -> None:
+    """
+    Write the tables of a loader that was loaded from its CSV.
+
+    The full profile is included when the loader has one, so one snapshot can
+    serve deployments with and without NUTRITION_FULL_PROFILE.
+    """
+    if loader.index is None:
+        raise ValueError("Nutrition database must be loaded before writing a snapshot")
+
+    source_stat = os.stat(loader.db_path)
+    keys, offsets, rows = loader.index.packed_postings()
+
+    arrays = {
+        'version': np.array(SNAPSHOT_VERSION),
+        'source_size': np.array(source_stat.st_size, dtype=np.int64),
+        'source_mtime_ns': np.array(source_stat.st_mtime_ns, dtype=np.int64),
+        'source_sha256': np.array(file_sha256(loader.db_path)),
+        'food_codes': np.array(loader.food_codes, dtype=str),
+        'food_names': np.array(loader.food_names, dtype=str),
+        'food_names_lower': np.array(loader.index.names, dtype=str),
+        'nutrient_matrix': loader.nutrient_matrix,
+        'postings_keys': np.array(keys, dtype=str),
+        'postings_offsets': np.array(offsets, dtype=np.int32),
+        'postings_rows': np.array(rows, dtype=np.int32),
+    }
+    if loader.profile_matrix is not None:
+        arrays['profile_columns'] = np.array(loader.profile_columns, dtype=str)
+        arrays['profile_matrix'] = loader.profile_matrix
+
+    # Written next to the target and renamed into place, so a reader never sees
+    # a partially written snapshot.
+    directory = os.path.dirname(os.path.abspath(snapshot_path))
+    fd, tmp_path = tempfile.mkstemp(suffix='.npz', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, snapshot_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def read_snapshot(snapshot_path: str, source_path: str, include_profile: bool = False) -> Optional[Dict]:
+    """
+    Arrays of a snapshot built from ``source_path``, or None when it is missing or stale.
+
+    Size and mtime are checked first; when they differ (e.g. after a fresh
+    checkout) the source hash decides.
+    """
+    if not os.path.exists(snapshot_path):
+        return None
+
+    try:
+        with np.load(snapshot_path, allow_pickle=False) as data:
+            if int(data['version']) != SNAPSHOT_VERSION:
+                logger.warning("Ignoring nutrition snapshot %s: unsupported version", snapshot_path)
+                return None
+
+            if not os.path.exists(source_path):
+                logger.warning("Nutrition snapshot %s used without its source CSV", snapshot_path)
+            else:
+                source_stat = os.stat(source_path)
+                unchanged = (source_stat.st_size == int(data['source_size'])
+                             and source_stat.st_mtime_ns == int(data['source_mtime_ns']))
+                if not unchanged and file_sha256(source_path) != str(data['source_sha256']):
+                    logger.warning("Nutrition snapshot %s is stale. Loading %s instead.", snapshot_path, source_path)
+                    return None
+
+            if include_profile and not all(name in data.files for name in PROFILE_ARRAYS):
+                logger.warning("Nutrition snapshot %s has no full profile. Loading the CSV instead.", snapshot_path)
+                return None
+
+            names = [name for name in data.files if include_profile or name not in PROFILE_ARRAYS]
+            return {name: data[name] for name in names}
+
+    except (OSError, ValueError, KeyError) as e:
+        logger.error("Could not read nutrition snapshot %s: %s", snapshot_path, e)
+        return None
+
+
+def main(argv=None) -> int:
+    from config import NUTRITION_DB_FILE, NUTRITION_SNAPSHOT_FILE
+    from utils.db_loader import NutritionDatabaseLoader
+
+    parser = argparse.ArgumentParser(description="Build the binary nutrition database snapshot.")
+    parser.add_argument('--db', default=NUTRITION_DB_FILE, help="IFCT nutrition CSV")
+    parser.add_argument('--out', default=NUTRITION_SNAPSHOT_FILE, help="snapshot file to write")
+    args = parser.parse_args(argv)
+
+    loader = NutritionDatabaseLoader(args.db, full_profile=True)
+    loader.load()
+    write_snapshot(loader, args.out)
+
+    print(f"Wrote {args.out} ({len(loader.food_names)} foods, {os.path.getsize(args.out) / 1024:.0f} KiB)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+import os
+import json
+import logging
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+
+from utils import request_log
+from utils.keyword_matcher import KeywordMatcher
+from utils.lru_cache import LRUCache, MISSING
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATEGORIES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                       'attached_assets', 'estimation_categories.json')
+
+# Used when a file has no "default" entry.
+DEFAULT_NUTRITION = {'calories': 100, 'carbs': 15, 'protein': 5, 'fat': 3, 'fiber': 2}
+
+
+class EstimationTable:
+    """
+    Per-100g nutrient estimates for ingredients the database does not match.
+
+    The category file lists categories in priority order, each with its
+    nutrients and the keywords that select it::
+
+        {"default": {"calories": 100, ...},
+         "categories": [{"category": "meat", "nutrients": {...}, "keywords": ["chicken", ...]}]}
+
+    It is compiled into one read-only matrix with a row per category, plus a
+    last row for the default. Names resolve to a row through a keyword matcher,
+    and each name is resolved once. An estimate is then one row of the matrix.
+    """
+
+    def __init__(self, categories: List[Dict], default: Mapping[str, float], nutrient_keys: List[str],
+                 cache_size: int = 2048):
+        self.categories = [entry['category'] for entry in categories]
+        self.vectors = np.array([[float(entry['nutrients'].get(key, 0)) for key in nutrient_keys]
+                                 for entry in categories]
+                                + [[float(default.get(key, 0)) for key in nutrient_keys]])
+        self.vectors.setflags(write=False)
+        self.default_row = len(categories)
+        self.matcher = KeywordMatcher.from_groups({row: entry['keywords'] for row, entry in enumerate(categories)})
+        self.cache = LRUCache(cache_size)
+
+    @classmethod
+    def load(cls, path: Optional[str], nutrient_keys: List[str], cache_size: int = 2048) -> 'EstimationTable':
+        """Table from a category file; a missing or unreadable file leaves only the default estimate."""
+        if path:
+            try:
+                with open(path, encoding='utf-8') as f:
+                    data = json.load(f)
+                return cls(data['categories'], data.get('default', DEFAULT_NUTRITION), nutrient_keys, cache_size)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.error("Could not load estimation categories from %s: %s. Using default values only.",
+                             path, e)
+        return cls([], DEFAULT_NUTRITION, nutrient_keys, cache_size)
+
+    def row(self, ingredient_name: str) -> int:
+        """Row of ``vectors`` estimating the ingredient."""
+        cache_key = ingredient_name.lower()
+        row = self.cache.get(cache_key)
+        if row is MISSING:
+            row = self._resolve(ingredient_name)
+            self.cache.put(cache_key, row)
+        return row
+
+    def vector(self, ingredient_name: str) -> np.ndarray:
+        return self.vectors[self.row(ingredient_name)]
+
+    def category(self, ingredient_name: str) -> Optional[str]:
+        row = self.row(ingredient_name)
+        return None if row == self.default_row else self.categories[row]
+
+    def _resolve(self, ingredient_name: str) -> int:
+        request_log.event(logger, 'no_nutrition_data', "No nutrition data found for: %s. Using defaults.",
+                          ingredient_name, level=logging.WARNING)
+        row = self.matcher.first(ingredient_name.lower())
+
+        if row is not None:
+            request_log.event(logger, 'estimated_nutrition', "Estimated nutrition for '%s' based on category: '%s'",
+                              ingredient_name, self.categories[row])
+            return row
+
+        request_log.event(logger, 'default_nutrition', "Using default nutrition values for '%s'", ingredient_name,
+                          level=logging.WARNING)
+        return self.default_row
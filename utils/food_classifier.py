@@ -1,8 +1,9 @@
 import logging
 from typing import Dict, List, Optional
 
-logging.basicConfig(level=logging.INFO, 
-                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+from utils import request_log
+from utils.keyword_matcher import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
 class FoodClassifier:
@@ -47,11 +48,51 @@ class FoodClassifier:
             "Salad": ["salad", "koshimbir", "raita", "kosambari", "pacchadi"],
             "Chutney/Pickle": ["chutney", "pickle", "achar", "relish", "thecha", "pachadi"]
         }
+
+        # (category, points, keywords): a category scores once if any ingredient
+        # name contains one of its keywords.
+        self.ingredient_rules = [
+            ("Non-Veg Curry", 5, ["chicken", "mutton", "lamb", "beef", "fish", "prawn", "crab", "egg"]),
+            ("Dal", 5, ["dal", "lentil", "rajma", "chole", "chana", "beans", "pulse"]),
+            ("Rice", 5, ["rice", "chawal", "basmati"]),
+            ("Roti/Bread", 5, ["flour", "atta", "maida"]),
+            ("Wet Sabzi", 3, ["paneer"]),
+            ("Dessert", 4, ["sugar", "jaggery", "syrup", "honey", "condensed milk", "khoya"])
+        ]
+        self.gravy_ingredients = ["water", "milk", "cream", "curd", "yogurt", "tomato puree"]
+
+        self.custom_type_mappings = {
+            "vegetable": "Wet Sabzi",
+            "veg": "Wet Sabzi",
+            "curry": "Wet Sabzi",
+            "sabji": "Wet Sabzi", 
+            "sabzi": "Wet Sabzi",
+            "gravy": "Wet Sabzi",
+            "main course": "Wet Sabzi",
+            "side dish": "Dry Sabzi",
+            "pulse": "Dal",
+            "daal": "Dal",
+            "bread": "Roti/Bread",
+            "flatbread": "Roti/Bread",
+            "meat": "Non-Veg Curry",
+            "non-vegetarian": "Non-Veg Curry",
+            "sweet": "Dessert",
+            "mithai": "Dessert",
+            "starter": "Snack",
+            "appetizer": "Snack"
+        }
+
+        self.category_matcher = KeywordMatcher.from_groups(self.category_keywords)
+        self.ingredient_matcher = KeywordMatcher(
+            [(keyword, rule) for rule, (_, _, keywords) in enumerate(self.ingredient_rules) for keyword in keywords]
+            + [(keyword, "gravy") for keyword in self.gravy_ingredients]
+        )
+        self.custom_type_matcher = KeywordMatcher(self.custom_type_mappings)
     
     def classify_dish(self, dish_name: str, dish_type: Optional[str] = None, 
                       ingredients: Optional[List[Dict]] = None) -> Dict:
         if dish_type and dish_type in self.food_categories:
-            logger.info(f"Using provided dish type: {dish_type} for {dish_name}")
+            request_log.event(logger, 'dish_type_provided', "Using provided dish type: %s for %s", dish_type, dish_name)
             return {
                 "dish_type": dish_type,
                 **self.food_categories[dish_type]
@@ -66,7 +107,7 @@ class FoodClassifier:
             matched_category = self._map_custom_type_to_standard(dish_type)
         
         if not matched_category:
-            logger.warning(f"Could not classify dish: {dish_name}. Defaulting to 'Wet Sabzi'")
+            logger.warning("Could not classify dish: %s. Defaulting to 'Wet Sabzi'", dish_name)
             matched_category = "Wet Sabzi"
         
         return {
@@ -75,57 +116,39 @@ class FoodClassifier:
         }
     
     def _match_dish_name(self, dish_name: str) -> Optional[str]:
-        dish_lower = dish_name.lower()
+        matches_by_category = self.category_matcher.count_by_value(dish_name.lower())
 
         max_matches = 0
         best_category = None
         
-        for category, keywords in self.category_keywords.items():
-            matches = sum(1 for keyword in keywords if keyword.lower() in dish_lower)
+        for category in self.category_keywords:
+            matches = matches_by_category.get(category, 0)
             
             if matches > max_matches:
                 max_matches = matches
                 best_category = category
         
         if best_category:
-            logger.info(f"Matched dish '{dish_name}' to category '{best_category}' based on name")
+            request_log.event(logger, 'dish_matched', "Matched dish '%s' to category '%s' based on name",
+                              dish_name, best_category)
             return best_category
         
         return None
     
     def _match_from_ingredients(self, ingredients: List[Dict]) -> Optional[str]:
 
-        ingredient_names = [ingredient.get("name", "").lower() for ingredient in ingredients]
+        # One scan over all names; no keyword contains a newline, so matches
+        # never span two ingredients.
+        ingredient_names = "\n".join(ingredient.get("name", "").lower() for ingredient in ingredients)
+        matched_rules = self.ingredient_matcher.matched_values(ingredient_names)
 
         category_scores = {category: 0 for category in self.food_categories}
 
-        non_veg_ingredients = ["chicken", "mutton", "lamb", "beef", "fish", "prawn", "crab", "egg"]
-        if any(any(item in ing for ing in ingredient_names) for item in non_veg_ingredients):
-            category_scores["Non-Veg Curry"] += 5
-        
-        dal_ingredients = ["dal", "lentil", "rajma", "chole", "chana", "beans", "pulse"]
-        if any(any(item in ing for ing in ingredient_names) for item in dal_ingredients):
-            category_scores["Dal"] += 5
-        
-        rice_ingredients = ["rice", "chawal", "basmati"]
-        if any(any(item in ing for ing in ingredient_names) for item in rice_ingredients):
-            category_scores["Rice"] += 5
-        
-        roti_ingredients = ["flour", "atta", "maida"]
-        if any(any(item in ing for ing in ingredient_names) for item in roti_ingredients):
-            category_scores["Roti/Bread"] += 5
+        for rule, (category, points, _) in enumerate(self.ingredient_rules):
+            if rule in matched_rules:
+                category_scores[category] += points
         
-        if any("paneer" in ing for ing in ingredient_names):
-            category_scores["Wet Sabzi"] += 3
-        
-        sweet_ingredients = ["sugar", "jaggery", "syrup", "honey", "condensed milk", "khoya"]
-        if any(any(item in ing for ing in ingredient_names) for item in sweet_ingredients):
-            category_scores["Dessert"] += 4
-        
-        gravy_ingredients = ["water", "milk", "cream", "curd", "yogurt", "tomato puree"]
-        has_gravy = any(any(item in ing for ing in ingredient_names) for item in gravy_ingredients)
-        
-        if has_gravy:
+        if "gravy" in matched_rules:
             category_scores["Wet Sabzi"] += 2
         else:
             category_scores["Dry Sabzi"] += 2
@@ -133,7 +156,7 @@ class FoodClassifier:
         best_category = max(category_scores.items(), key=lambda x: x[1])
         
         if best_category[1] > 0:
-            logger.info(f"Matched to category '{best_category[0]}' based on ingredients")
+            request_log.event(logger, 'dish_matched', "Matched to category '%s' based on ingredients", best_category[0])
             return best_category[0]
         
         return None
@@ -141,36 +164,16 @@ class FoodClassifier:
     def _map_custom_type_to_standard(self, custom_type: str) -> Optional[str]:
         custom_lower = custom_type.lower()
         
-        for category, keywords in self.category_keywords.items():
-            if any(keyword.lower() in custom_lower for keyword in keywords):
-                logger.info(f"Mapped custom type '{custom_type}' to standard category '{category}'")
-                return category
-        
-        mappings = {
-            "vegetable": "Wet Sabzi",
-            "veg": "Wet Sabzi",
-            "curry": "Wet Sabzi",
-            "sabji": "Wet Sabzi", 
-            "sabzi": "Wet Sabzi",
-            "curry": "Wet Sabzi",
-            "gravy": "Wet Sabzi",
-            "main course": "Wet Sabzi",
-            "side dish": "Dry Sabzi",
-            "pulse": "Dal",
-            "daal": "Dal",
-            "bread": "Roti/Bread",
-            "flatbread": "Roti/Bread",
-            "meat": "Non-Veg Curry",
-            "non-vegetarian": "Non-Veg Curry",
-            "sweet": "Dessert",
-            "mithai": "Dessert",
-            "starter": "Snack",
-            "appetizer": "Snack"
-        }
-        
-        for key, value in mappings.items():
-            if key in custom_lower:
-                logger.info(f"Mapped custom type '{custom_type}' to standard category '{value}'")
-                return value
+        category = self.category_matcher.first(custom_lower)
+        if category:
+            request_log.event(logger, 'dish_type_mapped', "Mapped custom type '%s' to standard category '%s'",
+                              custom_type, category)
+            return category
+        
+        value = self.custom_type_matcher.first(custom_lower)
+        if value:
+            request_log.event(logger, 'dish_type_mapped', "Mapped custom type '%s' to standard category '%s'",
+                              custom_type, value)
+            return value
         
         return None
@@ -0,0 +1,90 @@
+import math
+import heapq
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+NGRAM_SIZE = 3
+
+
+def _gram_counts(text: str, size: int = NGRAM_SIZE) -> Dict[str, int]:
+    # Padding gives word starts and ends grams of their own, so "oil" ranks
+    # "oil, mustard" above "boiled ...".
+    padded = f" {' '.join(text.split())} "
+    counts: Dict[str, int] = {}
+    for i in range(len(padded) - size + 1):
+        gram = padded[i:i + size]
+        counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+class FuzzyIndex:
+    """
+    TF-IDF weighted character-trigram vectors of the food names, for ranking
+    names by cosine similarity to a query.
+
+    Scores range from 0 to 1, where 1 means the same set of trigrams. Each
+    trigram keeps a posting array of (row, weight), so a query only touches
+    rows sharing at least one trigram with it. ``row_weights`` optionally
+    scales the score of each row, e.g. to rank some rows below others on ties.
+    """
+
+    def __init__(self, names: Sequence[str], row_weights: Optional[Sequence[float]] = None):
+        self.size = len(names)
+        self.row_weights = None if row_weights is None else np.asarray(row_weights, dtype=np.float64)
+        row_grams = [_gram_counts(name) for name in names]
+
+        document_frequency: Dict[str, int] = {}
+        for grams in row_grams:
+            for gram in grams:
+                document_frequency[gram] = document_frequency.get(gram, 0) + 1
+
+        # Smoothed idf; a trigram no name contains gets the largest weight.
+        self.unseen_idf = math.log(self.size + 1) + 1.0
+        self.idf = {gram: math.log((self.size + 1) / (count + 1)) + 1.0
+                    for gram, count in document_frequency.items()}
+
+        postings: Dict[str, Tuple[List[int], List[float]]] = {}
+        for row_id, grams in enumerate(row_grams):
+            weights = {gram: count * self.idf[gram] for gram, count in grams.items()}
+            norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+            for gram, weight in weights.items():
+                rows, values = postings.setdefault(gram, ([], []))
+                rows.append(row_id)
+                values.append(weight / norm)
+
+        self.postings = {
+            gram: (np.array(rows, dtype=np.intp), np.array(values, dtype=np.float64))
+            for gram, (rows, values) in postings.items()
+        }
+
+    def _scores(self, query: str) -> np.ndarray:
+        scores = np.zeros(self.size)
+        grams = _gram_counts(query.lower())
+
+        weights = {gram: count * self.idf.get(gram, self.unseen_idf) for gram, count in grams.items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        if not norm:
+            return scores
+
+        for gram, weight in weights.items():
+            posting = self.postings.get(gram)
+            if posting is not None:
+                rows, values = posting
+                scores[rows] += values * (weight / norm)
+
+        if self.row_weights is not None:
+            scores *= self.row_weights
+        return scores
+
+    def top_k(self, query: str, k: int = 5) -> List[Tuple[int, float]]:
+        """The ``k`` best (row id, score) pairs, best first; ties keep table order."""
+        scores = self._scores(query)
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        best = heapq.nsmallest(k, ((-scores[row_id], row_id) for row_id in candidates.tolist()))
+        return [(row_id, min(float(-negative_score), 1.0)) for negative_score, row_id in best]
+
+    def score(self, query: str, row_id: int) -> float:
+        return min(float(self._scores(query)[row_id]), 1.0)
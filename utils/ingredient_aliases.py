@@ -0,0 +1,78 @@
+import re
+import json
+import logging
+from typing import Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+_NON_ALPHANUMERIC = re.compile(r'[^0-9a-z]+')
+_PARENTHESIZED = re.compile(r'\(([^()]*)\)')
+
+
+def normalize_name(name: str) -> str:
+    """Lower-case, with punctuation and repeated whitespace collapsed to single spaces."""
+    return _NON_ALPHANUMERIC.sub(' ', name.lower()).strip()
+
+
+class AliasTable:
+    """
+    Kitchen, Hindi and regional ingredient names resolved straight to database rows.
+
+    The alias file lists foods by IFCT ``food_code``::
+
+        [{"food_code": "B020", "food_name": "Rajmah, red (...)", "aliases": ["rajma", "kidney beans"]}]
+
+    and is compiled into one dict from normalized alias to row id, so a lookup
+    is a single hash probe. ``food_name`` only documents the entry.
+    """
+
+    def __init__(self, rows_by_alias: Dict[str, int]):
+        self.rows_by_alias = rows_by_alias
+
+    @classmethod
+    def load(cls, path: str, food_codes: Sequence[str]) -> 'AliasTable':
+        with open(path, encoding='utf-8') as f:
+            entries = json.load(f)
+        return cls.compile(entries, food_codes)
+
+    @classmethod
+    def compile(cls, entries: List[Dict], food_codes: Sequence[str]) -> 'AliasTable':
+        row_by_code: Dict[str, int] = {}
+        for row_id, code in enumerate(food_codes):
+            row_by_code.setdefault(code, row_id)
+
+        rows_by_alias: Dict[str, int] = {}
+        for entry in entries:
+            row_id = row_by_code.get(entry['food_code'])
+            if row_id is None:
+                logger.warning("Ignoring aliases for unknown food code %s", entry['food_code'])
+                continue
+
+            for alias in entry['aliases']:
+                key = normalize_name(alias)
+                if rows_by_alias.get(key, row_id) != row_id:
+                    logger.warning("Alias '%s' is listed for several foods. Using %s", alias, entry['food_code'])
+                rows_by_alias[key] = row_id
+
+        return cls(rows_by_alias)
+
+    def __len__(self) -> int:
+        return len(self.rows_by_alias)
+
+    def lookup(self, name: str) -> Optional[int]:
+        """
+        Row id for an ingredient name, or None.
+
+        "Black Gram (Whole Urad Dal)" is tried as a whole, then by the text in
+        parentheses, then by the text around them.
+        """
+        row_id = self.rows_by_alias.get(normalize_name(name))
+        if row_id is not None or '(' not in name:
+            return row_id
+
+        for inner in _PARENTHESIZED.findall(name):
+            row_id = self.rows_by_alias.get(normalize_name(inner))
+            if row_id is not None:
+                return row_id
+
+        return self.rows_by_alias.get(normalize_name(_PARENTHESIZED.sub(' ', name)))
@@ -0,0 +1,123 @@
+import logging
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+NGRAM_SIZE = 3
+
+
+def _ngrams(text: str, size: int = NGRAM_SIZE) -> Set[str]:
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class PackedPostings:
+    """
+    Read-only n-gram postings stored as flat arrays (keys, offsets, rows).
+
+    This is the form the postings take in a database snapshot. The row set of
+    an n-gram is only built the first time a query touches it, so loading a
+    snapshot costs one dict over the keys rather than thousands of sets.
+    """
+
+    def __init__(self, keys: Sequence[str], offsets: Sequence[int], rows: Sequence[int]):
+        self._keys = keys
+        self._slots = {key: slot for slot, key in enumerate(keys)}
+        self._offsets = offsets
+        self._rows = rows
+        self._sets: List[Optional[Set[int]]] = [None] * len(self._slots)
+
+    @classmethod
+    def pack(cls, postings: Dict[str, Set[int]]) -> Tuple[List[str], List[int], List[int]]:
+        keys = sorted(postings)
+        offsets = [0]
+        rows: List[int] = []
+        for key in keys:
+            rows.extend(sorted(postings[key]))
+            offsets.append(len(rows))
+        return keys, offsets, rows
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def as_lists(self) -> Tuple[List[str], List[int], List[int]]:
+        return list(self._keys), list(self._offsets), list(self._rows)
+
+    def get(self, gram: str) -> Optional[Set[int]]:
+        slot = self._slots.get(gram)
+        if slot is None:
+            return None
+
+        rows = self._sets[slot]
+        if rows is None:
+            rows = set(self._rows[self._offsets[slot]:self._offsets[slot + 1]])
+            self._sets[slot] = rows
+        return rows
+
+
+class IngredientIndex:
+    """
+    Lookup structures over the lower-cased food names of the nutrition database.
+
+    The index is built once per database load and answers the three lookup stages
+    of NutritionDatabaseLoader.get_ingredient_nutrition without scanning the
+    DataFrame: an exact-name hash map, and an inverted n-gram -> row-id index
+    used to narrow substring queries down to a handful of candidate rows.
+    Every query returns the first matching row id, i.e. the same row the
+    previous pandas mask/str.contains scans picked (for queries without regex
+    syntax; the index always matches literally).
+    """
+
+    def __init__(self, food_names_lower: List[str], postings: Optional[PackedPostings] = None):
+        self.names = list(food_names_lower)
+        self.exact: Dict[str, List[int]] = {}
+
+        for row_id, name in enumerate(self.names):
+            self.exact.setdefault(name, []).append(row_id)
+
+        if postings is None:
+            postings = {}
+            for row_id, name in enumerate(self.names):
+                for gram in _ngrams(name):
+                    postings.setdefault(gram, set()).add(row_id)
+        self.postings = postings
+
+    def packed_postings(self) -> Tuple[List[str], List[int], List[int]]:
+        """Postings as (keys, offsets, rows) lists, for storing in a snapshot."""
+        if isinstance(self.postings, PackedPostings):
+            return self.postings.as_lists()
+        return PackedPostings.pack(self.postings)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def find_exact(self, query: str) -> Tuple[Optional[int], int]:
+        """Return (first row id, match count) for rows whose name equals the query."""
+        rows = self.exact.get(query)
+        if not rows:
+            return None, 0
+        return rows[0], len(rows)
+
+    def find_containing(self, query: str) -> Tuple[Optional[int], int]:
+        """
+        Return (first row id, match count) for rows whose name contains the query.
+
+        The query is matched literally. Ingredient names come from model output
+        and from clients, so regex syntax in them is never evaluated.
+        """
+        if len(query) < NGRAM_SIZE:
+            candidates = range(len(self.names))
+        else:
+            postings = []
+            for gram in _ngrams(query):
+                rows = self.postings.get(gram)
+                if not rows:
+                    return None, 0
+                postings.append(rows)
+            postings.sort(key=len)
+            candidates = sorted(postings[0].intersection(*postings[1:]))
+
+        matches = [row_id for row_id in candidates if query in self.names[row_id]]
+        if not matches:
+            return None, 0
+        return matches[0], len(matches)
+
@@ -2,14 +2,15 @@
 Module for processing and standardizing ingredient quantities.
 """
 
-import re
 import json
 import logging
 from typing import Dict, List, Tuple, Optional, Any
 import os
 
-logging.basicConfig(level=logging.INFO, 
-                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+from utils import request_log
+from utils.keyword_matcher import KeywordMatcher
+from utils.quantity_parser import parse_quantity
+
 logger = logging.getLogger(__name__)
 
 class IngredientProcessor:
@@ -29,12 +30,62 @@ class IngredientProcessor:
             "spices": 0.5,
             "default": 0.7  
         }
+        self.ingredient_type_mappings = {
+            "oil": "Oil",
+            "ghee": "Ghee",
+            "butter": "Butter",
+            "milk": "Milk",
+            "cream": "Cream",
+            "flour": "Flour",
+            "rice": "Rice",
+            "sugar": "Sugar",
+            "salt": "Salt",
+            "chili powder": "Spices",
+            "turmeric": "Spices",
+            "garam masala": "Spices",
+            "cumin": "Spices",
+            "coriander": "Spices",
+            "spice": "Spices",
+            "onion": "Vegetables Chopped",
+            "tomato": "Vegetables Chopped",
+            "potato": "Vegetables Chopped",
+            "carrot": "Vegetables Chopped",
+            "capsicum": "Vegetables Chopped",
+            "spinach": "Leafy Vegetables",
+            "methi": "Leafy Vegetables",
+            "palak": "Leafy Vegetables",
+            "coriander leaves": "Leafy Vegetables",
+            "cilantro": "Leafy Vegetables",
+            "dal": "Pulses",
+            "lentil": "Pulses",
+            "chicken": "Meat",
+            "mutton": "Meat",
+            "fish": "Meat",
+            "paneer": "Paneer"
+        }
+        self.wet_ingredient_keywords = ["water", "liquid", "juice", "soup"]
+        self.common_weights = {
+            "onion": 100,
+            "tomato": 80,
+            "potato": 150,
+            "green chili": 5,
+            "garlic clove": 3,
+            "egg": 50,
+            "lemon": 60,
+            "default": 30
+        }
 
-        self.quantity_patterns = [
-            r'(\d+(?:\.\d+)?)\s*(?:-\s*\d+(?:\.\d+)?)?\s*(tablespoon|tbsp|tbs|cup|teaspoon|tsp|katori|glass|handful|pinch|gram|gm|g|kg|piece|ml|liter|lt|l)s?',
-            r'(\d+(?:\.\d+)?)\s*/\s*(\d+)\s+(tablespoon|tbsp|tbs|cup|teaspoon|tsp|katori|glass|handful|pinch|gram|gm|g|kg|piece|ml|liter|lt|l)s?',
-            r'(\d+(?:\.\d+)?)',
-        ]
+        # Keyword tables compiled once; table order keeps "first keyword wins".
+        self.density_matcher = KeywordMatcher(self.density_mappings)
+        self.ingredient_type_matcher = KeywordMatcher(
+            list(self.ingredient_type_mappings.items())
+            + [(keyword, "Wet Ingredients") for keyword in self.wet_ingredient_keywords]
+        )
+        self.common_weight_matcher = KeywordMatcher(self.common_weights)
+        self.count_weight_matchers = {
+            unit: KeywordMatcher(weights)
+            for unit, weights in self.measurements_data.get("count_to_weight", {}).items()
+        }
         
     def _load_measurements_data(self, file_path: str) -> Dict:
         try:
@@ -42,7 +93,7 @@ class IngredientProcessor:
                 with open(file_path, 'r') as f:
                     return json.load(f)
             else:
-                logger.warning(f"Household measurements file not found at {file_path}. Using default values.")
+                logger.warning("Household measurements file not found at %s. Using default values.", file_path)
                 return {
                     "volume_to_weight": {
                         "cup": {"base_ml": 250, "Default": 250},
@@ -58,7 +109,7 @@ class IngredientProcessor:
                     }
                 }
         except Exception as e:
-            logger.error(f"Error loading household measurements data: {str(e)}")
+            logger.error("Error loading household measurements data: %s", e)
             return {
                 "volume_to_weight": {
                     "cup": {"base_ml": 250, "Default": 250},
@@ -88,7 +139,8 @@ class IngredientProcessor:
                 parsed_quantity, parsed_unit = self._parse_quantity(quantity)
                 
                 if parsed_quantity is None:
-                    logger.warning(f"Could not parse quantity for {name}: {quantity}")
+                    request_log.event(logger, 'unparsed_quantity', "Could not parse quantity for %s: %s", name, quantity,
+                                      level=logging.WARNING)
                     continue
                 
                 grams = self._convert_to_grams(parsed_quantity, parsed_unit, name)
@@ -102,7 +154,7 @@ class IngredientProcessor:
                 })
                 
             except Exception as e:
-                logger.error(f"Error processing ingredient {ingredient.get('name', 'unknown')}: {str(e)}")
+                logger.error("Error processing ingredient %s: %s", ingredient.get('name', 'unknown'), e)
                 processed_ingredients.append({
                     'name': ingredient.get('name', 'unknown'),
                     'quantity': ingredient.get('quantity', ''),
@@ -115,42 +167,7 @@ class IngredientProcessor:
         return processed_ingredients
     
     def _parse_quantity(self, quantity_str: str) -> Tuple[Optional[float], Optional[str]]:
-        quantity_str = quantity_str.lower().strip()
-        
-        for pattern in self.quantity_patterns:
-            match = re.search(pattern, quantity_str)
-            if match:
-                if pattern.startswith(r'(\d+(?:\.\d+)?)\s*/\s*(\d+)'):
-                    numerator = float(match.group(1))
-                    denominator = float(match.group(2))
-                    quantity_value = numerator / denominator
-                    unit = match.group(3)
-                else:
-                    quantity_value = float(match.group(1))
-                    unit = match.group(2) if len(match.groups()) > 1 else None
-                
-                if unit:
-                    if unit in ['tablespoon', 'tbsp', 'tbs']:
-                        unit = 'tablespoon'
-                    elif unit in ['teaspoon', 'tsp']:
-                        unit = 'teaspoon'
-                    elif unit in ['g', 'gm', 'gram']:
-                        unit = 'gram'
-                    elif unit in ['kg', 'kilogram']:
-                        unit = 'kilogram'
-                        quantity_value *= 1000  
-                    elif unit in ['ml', 'milliliter']:
-                        unit = 'ml'
-                    elif unit in ['l', 'lt', 'liter']:
-                        unit = 'liter'
-                        quantity_value *= 1000  
-                else:
-                    unit = 'piece'
-                
-                return quantity_value, unit
-        
-
-        return None, None
+        return parse_quantity(quantity_str)
     
     def _convert_to_grams(self, quantity: float, unit: str, ingredient_name: str) -> float:
         if unit in ['gram', 'g', 'gm']:
@@ -177,90 +194,24 @@ class IngredientProcessor:
             
             return quantity * weight_in_grams
 
-        count_mappings = self.measurements_data.get("count_to_weight", {})
-        if unit in count_mappings:
+        count_matcher = self.count_weight_matchers.get(unit)
+        if count_matcher is not None:
 
-            specific_weight = None
-            for ingredient_type, weight in count_mappings[unit].items():
-                if ingredient_type.lower() in ingredient_name.lower():
-                    specific_weight = weight
-                    break
+            specific_weight = count_matcher.first(ingredient_name.lower())
 
             if specific_weight is None:
-                specific_weight = count_mappings[unit].get("Default", 30) 
+                specific_weight = self.measurements_data["count_to_weight"][unit].get("Default", 30) 
             
             return quantity * specific_weight
         
-        logger.warning(f"Unrecognized unit '{unit}' for {ingredient_name}. Assuming 'piece'.")
-        
-        common_weights = {
-            "onion": 100,
-            "tomato": 80,
-            "potato": 150,
-            "green chili": 5,
-            "garlic clove": 3,
-            "egg": 50,
-            "lemon": 60,
-            "default": 30
-        }
+        request_log.event(logger, 'unrecognized_unit', "Unrecognized unit '%s' for %s. Assuming 'piece'.",
+                          unit, ingredient_name, level=logging.WARNING)
 
-        for ingredient, weight in common_weights.items():
-            if ingredient in ingredient_name.lower():
-                return quantity * weight
-
-        return quantity * common_weights["default"]
+        weight = self.common_weight_matcher.first(ingredient_name.lower(), self.common_weights["default"])
+        return quantity * weight
     
     def _get_density_for_ingredient(self, ingredient_name: str) -> float:
-        ingredient_lower = ingredient_name.lower()
-        
-        for key, density in self.density_mappings.items():
-            if key in ingredient_lower:
-                return density
-        
-        return self.density_mappings["default"]
+        return self.density_matcher.first(ingredient_name.lower(), self.density_mappings["default"])
     
     def _get_ingredient_type(self, ingredient_name: str) -> str:
-        ingredient_lower = ingredient_name.lower()
-
-        mappings = {
-            "oil": "Oil",
-            "ghee": "Ghee",
-            "butter": "Butter",
-            "milk": "Milk",
-            "cream": "Cream",
-            "flour": "Flour",
-            "rice": "Rice",
-            "sugar": "Sugar",
-            "salt": "Salt",
-            "chili powder": "Spices",
-            "turmeric": "Spices",
-            "garam masala": "Spices",
-            "cumin": "Spices",
-            "coriander": "Spices",
-            "spice": "Spices",
-            "onion": "Vegetables Chopped",
-            "tomato": "Vegetables Chopped",
-            "potato": "Vegetables Chopped",
-            "carrot": "Vegetables Chopped",
-            "capsicum": "Vegetables Chopped",
-            "spinach": "Leafy Vegetables",
-            "methi": "Leafy Vegetables",
-            "palak": "Leafy Vegetables",
-            "coriander leaves": "Leafy Vegetables",
-            "cilantro": "Leafy Vegetables",
-            "dal": "Pulses",
-            "lentil": "Pulses",
-            "chicken": "Meat",
-            "mutton": "Meat",
-            "fish": "Meat",
-            "paneer": "Paneer"
-        }
-
-        for keyword, category in mappings.items():
-            if keyword in ingredient_lower:
-                return category
-
-        if any(word in ingredient_lower for word in ["water", "liquid", "juice", "soup"]):
-            return "Wet Ingredients"
-
-        return "Dry Ingredients"
+        return self.ingredient_type_matcher.first(ingredient_name.lower(), "Dry Ingredients")
@@ -0,0 +1,125 @@
+from collections import deque
+from typing import Any, Dict, Iterable, List, Mapping, Set, Tuple, Union
+
+KeywordTable = Union[Mapping[str, Any], Iterable[Tuple[str, Any]]]
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed, ordered keyword table.
+
+    Replaces the ``any(keyword in text for keyword in keywords)`` loops used for
+    classification, density and ingredient-type lookups: the table is compiled
+    once and a single pass over the text finds every keyword it contains,
+    including overlapping ones. Matching is on plain substrings, exactly like
+    ``in``; keywords are lower-cased, so callers pass lower-cased text.
+
+    The table is a ``{keyword: value}`` mapping or a sequence of
+    ``(keyword, value)`` pairs. Table order is the priority order: ``first``
+    returns the value of the earliest entry that matches, which is what the
+    "first keyword wins" loops it replaces returned. The same keyword may appear
+    in several entries (e.g. with different categories).
+
+    In pure Python the automaton costs one step per character of text, while
+    ``in`` costs roughly one C-level search per keyword; each query takes
+    whichever is shorter, so small tables and long texts fall back to ``in``.
+    Both give the same answer.
+    """
+
+    def __init__(self, table: KeywordTable):
+        items = table.items() if isinstance(table, Mapping) else table
+
+        self.keywords: List[str] = []
+        self.values: List[Any] = []
+        for keyword, value in items:
+            self.keywords.append(keyword.lower())
+            self.values.append(value)
+
+        self._transitions, self._outputs = self._build(self.keywords)
+
+    @classmethod
+    def from_groups(cls, groups: Mapping[Any, Iterable[str]]) -> 'KeywordMatcher':
+        """Build from ``{value: [keywords]}``, keeping group order then keyword order."""
+        return cls((keyword, value) for value, keywords in groups.items() for keyword in keywords)
+
+    @staticmethod
+    def _build(keywords: List[str]) -> Tuple[List[Dict[str, int]], List[Tuple[int, ...]]]:
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+
+        for entry, keyword in enumerate(keywords):
+            state = 0
+            for char in keyword:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(entry)
+
+        # Breadth-first pass computing failure links, folded straight into a
+        # full transition table so scanning never has to follow them.
+        transitions: List[Dict[str, int]] = [dict() for _ in goto]
+        transitions[0] = dict(goto[0])
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            fallback = fail[state]
+            outputs[state].extend(outputs[fallback])
+
+            merged = dict(transitions[fallback])
+            merged.update(goto[state])
+            transitions[state] = merged
+
+            for char, child in goto[state].items():
+                fail[child] = transitions[fallback].get(char, 0)
+                queue.append(child)
+
+        return transitions, [tuple(sorted(set(entries))) for entries in outputs]
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def matches(self, text: str) -> Set[int]:
+        """Indices of every table entry whose keyword occurs in ``text``."""
+        if len(text) > len(self.keywords):
+            return {entry for entry, keyword in enumerate(self.keywords) if keyword in text}
+
+        transitions = self._transitions
+        outputs = self._outputs
+        found = set()
+        state = 0
+
+        for char in text:
+            state = transitions[state].get(char, 0)
+            entries = outputs[state]
+            if entries:
+                found.update(entries)
+
+        return found
+
+    def first(self, text: str, default: Any = None) -> Any:
+        """Value of the earliest table entry found in ``text``, or ``default``."""
+        if len(text) > len(self.keywords):
+            for entry, keyword in enumerate(self.keywords):
+                if keyword in text:
+                    return self.values[entry]
+            return default
+
+        found = self.matches(text)
+        return self.values[min(found)] if found else default
+
+    def matched_values(self, text: str) -> Set[Any]:
+        return {self.values[entry] for entry in self.matches(text)}
+
+    def count_by_value(self, text: str) -> Dict[Any, int]:
+        """Number of distinct matching entries per value."""
+        counts: Dict[Any, int] = {}
+        for entry in self.matches(text):
+            value = self.values[entry]
+            counts[value] = counts.get(value, 0) + 1
+        return counts
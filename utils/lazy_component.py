@@ -0,0 +1,58 @@
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LazyComponent:
+    """
+    An expensive application component built on first use, exactly once.
+
+    Any number of threads may call ``get`` concurrently; one runs the factory
+    and the rest wait for it. A failed build is reported through ``status``
+    and retried by the next ``get``.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        self.name = name
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._value = None
+        self.state = 'pending'
+        self.error: Optional[str] = None
+        self.build_seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == 'ready'
+
+    def get(self) -> Any:
+        if self.state == 'ready':
+            return self._value
+
+        with self._lock:
+            if self.state != 'ready':
+                self.state = 'loading'
+                start = time.perf_counter()
+                try:
+                    self._value = self._factory()
+                except Exception as e:
+                    self.state = 'failed'
+                    self.error = str(e)
+                    raise
+                self.build_seconds = time.perf_counter() - start
+                self.error = None
+                self.state = 'ready'
+                logger.info("Initialized %s in %.3fs", self.name, self.build_seconds)
+
+        return self._value
+
+    def status(self) -> Dict[str, Any]:
+        status = {'state': self.state}
+        if self.build_seconds is not None:
+            status['build_seconds'] = round(self.build_seconds, 4)
+        if self.error:
+            status['error'] = self.error
+        return status
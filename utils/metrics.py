@@ -0,0 +1,162 @@
+"""
+Stage timing for the nutrition pipeline, exported in the Prometheus text format.
+
+Code wraps a stage in ``with metrics.span('stage'):``. Every span feeds a
+latency histogram in the process-wide REGISTRY; while a request breakdown is
+active (see ``start_request_timing``) it is also added to that request's
+per-stage totals. Spans may nest, so nested stage times overlap.
+"""
+
+import time
+import bisect
+import threading
+from contextvars import ContextVar
+from typing import Dict, Iterable, Optional, Tuple
+
+# Upper bounds in seconds; Prometheus adds +Inf.
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+STAGE_METRIC = 'nutrition_stage_duration_seconds'
+
+_request_timings: ContextVar[Optional[Dict[str, list]]] = ContextVar('request_timings', default=None)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram; safe to observe from several threads."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[position] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> Tuple[list, float, int]:
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+
+class MetricsRegistry:
+    """Histograms keyed by (metric name, label value)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._histograms: Dict[Tuple[str, str, str], Histogram] = {}
+        self._help: Dict[str, str] = {STAGE_METRIC: "Time spent in each stage of the nutrition pipeline."}
+        self._lock = threading.Lock()
+
+    def histogram(self, metric: str, label: str, value: str, help_text: str = None) -> Histogram:
+        key = (metric, label, value)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram(self.buckets))
+                if help_text:
+                    self._help.setdefault(metric, help_text)
+        return histogram
+
+    def observe(self, stage: str, seconds: float) -> None:
+        self.histogram(STAGE_METRIC, 'stage', stage).observe(seconds)
+
+        timings = _request_timings.get()
+        if timings is not None:
+            totals = timings.setdefault(stage, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += 1
+
+    def span(self, stage: str) -> 'Span':
+        return Span(self, stage)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self, cache_stats: Optional[Dict[str, Dict]] = None) -> str:
+        """All histograms, plus hit/miss counters for each named LRU cache stats dict."""
+        lines = []
+        by_metric: Dict[str, list] = {}
+        for (metric, label, value), histogram in sorted(self._histograms.items()):
+            by_metric.setdefault(metric, []).append((label, value, histogram))
+
+        for metric, series in by_metric.items():
+            lines.append(f"# HELP {metric} {self._help.get(metric, metric)}")
+            lines.append(f"# TYPE {metric} histogram")
+            for label, value, histogram in series:
+                counts, total, count = histogram.snapshot()
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.buckets + (float('inf'),), counts):
+                    cumulative += bucket_count
+                    lines.append(f'{metric}_bucket{{{label}="{value}",le="{_format_bound(bound)}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{{label}="{value}"}} {total!r}')
+                lines.append(f'{metric}_count{{{label}="{value}"}} {count}')
+
+        if cache_stats:
+            lines.extend(_render_caches(cache_stats.items()))
+
+        return "\n".join(lines) + "\n"
+
+
+class Span:
+    """Times one stage; returned by MetricsRegistry.span for use in a with block."""
+
+    __slots__ = ('registry', 'stage', 'start')
+
+    def __init__(self, registry: MetricsRegistry, stage: str):
+        self.registry = registry
+        self.stage = stage
+
+    def __enter__(self) -> 'Span':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.registry.observe(self.stage, time.perf_counter() - self.start)
+
+
+def _format_bound(bound: float) -> str:
+    return '+Inf' if bound == float('inf') else repr(bound)
+
+
+def _render_caches(caches: Iterable[Tuple[str, Dict]]) -> list:
+    caches = [(name, stats) for name, stats in caches if stats]
+    lines = []
+    for metric, key, kind, help_text in (
+            ('nutrition_cache_hits_total', 'hits', 'counter', "Cache lookups answered from the cache."),
+            ('nutrition_cache_misses_total', 'misses', 'counter', "Cache lookups that had to be computed."),
+            ('nutrition_cache_hit_ratio', 'hit_ratio', 'gauge', "Hits over lookups since the cache was created."),
+            ('nutrition_cache_entries', 'size', 'gauge', "Entries currently held.")):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for name, stats in caches:
+            lines.append(f'{metric}{{cache="{name}"}} {stats.get(key, 0)!r}')
+    return lines
+
+
+REGISTRY = MetricsRegistry()
+
+
+def span(stage: str) -> Span:
+    """Time a stage in the process-wide registry."""
+    return REGISTRY.span(stage)
+
+
+def start_request_timing():
+    """Collect per-stage totals for the current request (context); returns a token for stop."""
+    return _request_timings.set({})
+
+
+def request_timings() -> Optional[Dict[str, list]]:
+    """{stage: [seconds, calls]} collected since start_request_timing, or None."""
+    return _request_timings.get()
+
+
+def stop_request_timing(token) -> None:
+    _request_timings.reset(token)
@@ -1,21 +1,80 @@
+import json
+import hashlib
 import logging
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Tuple, Union, Any
 import math
 
-from utils.db_loader import NutritionDatabaseLoader
+import numpy as np
+
+from utils import metrics, request_log
+from utils.db_loader import NutritionDatabaseLoader, NUTRIENT_KEYS, DEFAULT_MATCH_THRESHOLD
+from utils.estimation_table import EstimationTable, DEFAULT_CATEGORIES_PATH
 from utils.food_classifier import FoodClassifier
+from utils.lru_cache import LRUCache
 
-logging.basicConfig(level=logging.INFO, 
-                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+class IngredientLookup(dict):
+    """Ingredient name -> (row id, match score), valid for one database version."""
+
+    def __init__(self, matches, db_version: str):
+        super().__init__(matches)
+        self.db_version = db_version
+
+class ResolvedRecipe:
+    """
+    A recipe with every ingredient matched, and its nutrient rows gathered.
+
+    Everything calculate_nutrition needs besides weights and servings, kept
+    under ``handle`` so what-if recalculations skip fetching and matching.
+    """
+
+    __slots__ = ('dish_name', 'dish_type', 'classification', 'items', 'db_loader', 'rows',
+                 'total_cooked_weight', 'cooked_weight_given', 'servings', 'handle')
+
+    def __init__(self, dish_name: str, dish_type: Optional[str], classification: Dict, items: List[Dict],
+                 db_loader: NutritionDatabaseLoader, rows: np.ndarray, total_cooked_weight: Optional[float],
+                 servings: int):
+        self.dish_name = dish_name
+        self.dish_type = dish_type
+        self.classification = classification
+        self.items = items
+        self.db_loader = db_loader
+        self.rows = rows
+        self.cooked_weight_given = bool(total_cooked_weight and total_cooked_weight > 0)
+        self.total_cooked_weight = total_cooked_weight
+        self.servings = servings
+        self.handle = hashlib.sha256(json.dumps(
+            [db_loader.version, dish_name, dish_type, total_cooked_weight, servings,
+             [(item['ingredient'], item['quantity'], item['grams'], item['row_id']) for item in items]],
+            default=str
+        ).encode('utf-8')).hexdigest()[:24]
+
+    @property
+    def total_raw_weight(self) -> float:
+        return sum(item['grams'] for item in self.items)
+
 class NutritionCalculator:
 
-    def __init__(self, nutrition_db_path: str):
+    def __init__(self, nutrition_db_path: str, cache_size: int = 2048, full_profile: bool = False,
+                 snapshot_path: Optional[str] = None, backend: str = 'pandas',
+                 match_threshold: float = DEFAULT_MATCH_THRESHOLD, alias_path: Optional[str] = None,
+                 tables: Optional[Dict[str, Any]] = None,
+                 estimation_path: Optional[str] = DEFAULT_CATEGORIES_PATH):
 
-        self.db_loader = NutritionDatabaseLoader(nutrition_db_path)
-        self.nutrition_db = self.db_loader.load_database()
+        self.db_loader = NutritionDatabaseLoader(nutrition_db_path, cache_size=cache_size,
+                                                 full_profile=full_profile, snapshot_path=snapshot_path,
+                                                 backend=backend, match_threshold=match_threshold,
+                                                 alias_path=alias_path)
+        if tables is not None:
+            # Tables already prepared by another process (see utils.shared_table).
+            self.db_loader.load_arrays(tables, 'shared')
+        else:
+            self.db_loader.load()
         self.food_classifier = FoodClassifier()
+        self.estimation = EstimationTable.load(estimation_path, NUTRIENT_KEYS, cache_size)
+        self.estimate_cache = self.estimation.cache
+        self.resolved_recipes = LRUCache(cache_size)
 
         self.default_nutrition = {
             'calories': 100,
@@ -32,89 +91,60 @@ class NutritionCalculator:
             'fat': {'min': 0, 'max': 80},
             'fiber': {'min': 0, 'max': 30}
         }
+
     
+    @property
+    def nutrition_db(self):
+        return self.db_loader.nutrition_df
+
     def calculate_nutrition(self, dish_name: str, dish_type: Optional[str], 
                             ingredients: List[Dict], total_cooked_weight: Optional[int] = None,
-                            servings: int = 4) -> Dict:
+                            servings: int = 4,
+                            nutrition_lookup: Optional[Dict[str, Tuple[Optional[int], float]]] = None,
+                            nutrients: Optional[List[str]] = None) -> Dict:
+        """
+        Nutrition per serving of a recipe of processed ingredients.
 
-        try:
+        The result carries a ``recipe_handle`` for ``recalculate``, which
+        answers for other servings, weights or substitutions from the matched
+        ingredients without looking anything up again.
+        """
+        # Read once: a database reload swaps db_loader, and this calculation
+        # must finish on the version it started with.
+        db_loader = self.db_loader
+        if getattr(nutrition_lookup, 'db_version', None) not in (None, db_loader.version):
+            nutrition_lookup = None
 
-            ingredient_nutrition = []
-            total_raw_weight = 0
-            
+        try:
+            weighed = []
             for ingredient in ingredients:
                 ingredient_name = ingredient.get('name', '')
                 grams = ingredient.get('grams', 0)
 
                 if grams is None or grams <= 0:
-                    logger.warning(f"Skipping ingredient with invalid weight: {ingredient_name}")
+                    request_log.event(logger, 'invalid_weight', "Skipping ingredient with invalid weight: %s",
+                                      ingredient_name, level=logging.WARNING)
                     continue
 
-                nutrition = self.db_loader.get_ingredient_nutrition(ingredient_name)
+                weighed.append((ingredient_name, ingredient.get('quantity', ''), grams))
 
-                if not nutrition:
-                    logger.warning(f"No nutrition data found for: {ingredient_name}. Using defaults.")
-                    nutrition = self._get_estimated_nutrition(ingredient_name)
+            matches = self._match_ingredients([name for name, _, _ in weighed], db_loader, nutrition_lookup)
+            items = [self._resolved_item(db_loader, name, quantity, grams, row_id, match_score)
+                     for (name, quantity, grams), (row_id, match_score) in zip(weighed, matches)]
 
-                nutrition_per_serving = self._calculate_scaled_nutrition(nutrition, grams)
-                
-                ingredient_nutrition.append({
-                    'ingredient': ingredient_name,
-                    'quantity': ingredient.get('quantity', ''),
-                    'grams': grams,
-                    'nutrition': nutrition_per_serving
-                })
+            with metrics.span('classify_dish'):
+                dish_classification = self.food_classifier.classify_dish(
+                    dish_name, dish_type, ingredients
+                )
 
-                total_raw_weight += grams
-            
-            total_nutrition = self._sum_nutrition(ingredient_nutrition)
-            
-            if total_cooked_weight and total_cooked_weight > 0:
-                logger.info(f"Using provided total cooked weight: {total_cooked_weight}g")
-                if total_raw_weight > 0 and abs(total_raw_weight - total_cooked_weight) / total_raw_weight > 0.5:
-                    logger.warning(f"Large difference between raw ingredients ({total_raw_weight}g) and "
-                                  f"cooked weight ({total_cooked_weight}g). This might affect accuracy.")
-            else:
-                total_cooked_weight = self._estimate_cooked_weight(total_raw_weight, dish_type)
-                logger.info(f"Estimated cooked weight: {total_cooked_weight}g from raw weight: {total_raw_weight}g")
-            
-            dish_classification = self.food_classifier.classify_dish(
-                dish_name, dish_type, ingredients
-            )
-            
-            serving_unit = dish_classification.get('serving_unit', 'katori')
-            serving_grams = dish_classification.get('serving_grams', 180)
-            standard_dish_type = dish_classification.get('dish_type', 'Wet Sabzi')
-            
-            nutrition_per_serving = self._calculate_nutrition_per_serving(
-                total_nutrition, total_cooked_weight, serving_grams, servings
-            )
-            
-            nutrition_per_serving = self._validate_nutrition_values(nutrition_per_serving)
-            
-            return {
-                "dish_name": dish_name,
-                "dish_type": standard_dish_type,
-                f"estimated_nutrition_per_{serving_unit}": {
-                    "calories": round(nutrition_per_serving['calories']),
-                    "protein": round(nutrition_per_serving['protein']),
-                    "carbs": round(nutrition_per_serving['carbs']),
-                    "fat": round(nutrition_per_serving['fat']),
-                    "fiber": round(nutrition_per_serving['fiber'], 1)
-                },
-                "serving_size_grams": serving_grams,
-                "total_cooked_weight_grams": total_cooked_weight,
-                "servings": servings,
-                "ingredients_used": [
-                    {
-                        "ingredient": item['ingredient'],
-                        "quantity": item['quantity']
-                    } for item in ingredient_nutrition
-                ]
-            }
+            resolved = ResolvedRecipe(dish_name, dish_type, dish_classification, items, db_loader,
+                                      self._nutrient_rows(items, db_loader), total_cooked_weight, servings)
+            self.resolved_recipes.put(resolved.handle, resolved)
+
+            return self._evaluate(resolved, total_cooked_weight, servings, nutrients=nutrients)
             
         except Exception as e:
-            logger.error(f"Error calculating nutrition for {dish_name}: {str(e)}")
+            logger.error("Error calculating nutrition for %s: %s", dish_name, e)
             return {
                 "dish_name": dish_name,
                 "dish_type": dish_type or "Unknown",
@@ -126,83 +156,252 @@ class NutritionCalculator:
                     for ing in ingredients if 'name' in ing
                 ]
             }
-    
-    def _get_estimated_nutrition(self, ingredient_name: str) -> Dict:
-        categories = {
-            'meat': {'calories': 200, 'carbs': 0, 'protein': 25, 'fat': 10, 'fiber': 0},
-            'vegetable': {'calories': 50, 'carbs': 10, 'protein': 2, 'fat': 0, 'fiber': 3},
-            'grain': {'calories': 350, 'carbs': 70, 'protein': 10, 'fat': 2, 'fiber': 10},
-            'dairy': {'calories': 150, 'carbs': 5, 'protein': 8, 'fat': 10, 'fiber': 0},
-            'oil': {'calories': 880, 'carbs': 0, 'protein': 0, 'fat': 100, 'fiber': 0},
-            'spice': {'calories': 30, 'carbs': 5, 'protein': 1, 'fat': 1, 'fiber': 2},
-            'fruit': {'calories': 70, 'carbs': 20, 'protein': 1, 'fat': 0, 'fiber': 2},
-            'legume': {'calories': 300, 'carbs': 50, 'protein': 20, 'fat': 5, 'fiber': 15}
-        }
-        
-        ingredient_lower = ingredient_name.lower()
-        
-        category_mapping = {
-            'meat': ['chicken', 'mutton', 'lamb', 'beef', 'pork', 'fish', 'prawn', 'crab', 'meat', 'egg'],
-            'vegetable': ['vegetable', 'onion', 'tomato', 'potato', 'carrot', 'cabbage', 'cauliflower', 
-                         'eggplant', 'brinjal', 'spinach', 'palak', 'methi', 'capsicum', 'gourd',
-                         'beans', 'peas', 'garlic', 'ginger'],
-            'grain': ['rice', 'wheat', 'flour', 'atta', 'maida', 'bread', 'roti', 'cereal', 'millet',
-                      'barley', 'corn', 'oats', 'quinoa', 'vermicelli', 'noodle', 'pasta'],
-            'dairy': ['milk', 'curd', 'yogurt', 'cheese', 'paneer', 'cream', 'butter', 'ghee'],
-            'oil': ['oil', 'ghee', 'butter', 'margarine', 'vanaspati', 'fat'],
-            'spice': ['spice', 'masala', 'chili', 'pepper', 'cumin', 'coriander', 'turmeric', 
-                     'cardamom', 'cinnamon', 'clove', 'bay', 'salt', 'saffron', 'asafoetida'],
-            'fruit': ['fruit', 'mango', 'apple', 'banana', 'grapes', 'orange', 'lemon', 'lime',
-                     'coconut', 'date', 'raisin', 'berry', 'plum', 'peach'],
-            'legume': ['dal', 'lentil', 'pulse', 'chickpea', 'bean', 'soybean', 'rajma', 'chana', 
-                      'moong', 'urad', 'masoor', 'tur', 'peas']
-        }
-        
-        for category, keywords in category_mapping.items():
-            if any(keyword in ingredient_lower for keyword in keywords):
-                logger.info(f"Estimated nutrition for '{ingredient_name}' based on category: '{category}'")
-                return {
-                    'ingredient': ingredient_name,
-                    **categories[category]
-                }
-        
-        logger.warning(f"Using default nutrition values for '{ingredient_name}'")
+
+    def recalculate(self, recipe_handle: str, servings: Optional[int] = None,
+                    total_cooked_weight: Optional[float] = None, serving_grams: Optional[float] = None,
+                    substitutions: Optional[List[Dict]] = None, nutrients: Optional[List[str]] = None) -> Dict:
+        """
+        Result of an earlier calculate_nutrition with some inputs changed.
+
+        Unset arguments keep the values of the original calculation; a cooked
+        weight that was estimated is estimated again when substitutions change
+        the raw weight. Each substitution is a processed ingredient,
+        ``{'ingredient': <name in the recipe>, 'name': <new name>, 'grams': <weight>}``:
+        ``name`` swaps the food (only new names are looked up), ``grams`` 0
+        removes it, and an entry without ``ingredient`` adds a new one.
+
+        Raises KeyError for an unknown or expired handle and ValueError for a
+        substitution naming an ingredient the recipe does not have.
+        """
+        resolved = self.resolved_recipes.get(recipe_handle, None)
+        if resolved is None:
+            raise KeyError(recipe_handle)
+
+        if substitutions:
+            resolved = self._substitute(resolved, substitutions)
+            self.resolved_recipes.put(resolved.handle, resolved)
+
+        if total_cooked_weight is None and not substitutions:
+            total_cooked_weight = resolved.total_cooked_weight
+        elif total_cooked_weight is None:
+            total_cooked_weight = resolved.total_cooked_weight if resolved.cooked_weight_given else None
+
+        return self._evaluate(resolved, total_cooked_weight,
+                              servings if servings is not None else resolved.servings,
+                              serving_grams, nutrients)
+
+    def _match_ingredients(self, ingredient_names: List[str], db_loader: NutritionDatabaseLoader,
+                           nutrition_lookup: Optional[Dict[str, Tuple[Optional[int], float]]] = None
+                           ) -> List[Tuple[Optional[int], float]]:
+        """(row id, match score) per name: from ``nutrition_lookup`` when it has the name, else one bulk lookup."""
+        if nutrition_lookup is None:
+            return db_loader.find_food_matches(ingredient_names)
+
+        missing = [name for name in ingredient_names if name not in nutrition_lookup]
+        found = dict(zip(missing, db_loader.find_food_matches(missing)))
+        return [nutrition_lookup[name] if name in nutrition_lookup else found[name] for name in ingredient_names]
+
+    def resolved_recipe(self, recipe_handle: Optional[str]) -> Optional['ResolvedRecipe']:
+        """The resolved recipe kept under a result's ``recipe_handle``, or None once it has been evicted."""
+        return self.resolved_recipes.get(recipe_handle, None) if recipe_handle else None
+
+    def keep_resolved(self, resolved: 'ResolvedRecipe') -> None:
+        """(Re-)register a resolved recipe under its handle, e.g. when its result is served from a cache."""
+        self.resolved_recipes.put(resolved.handle, resolved)
+
+    def _resolved_item(self, db_loader: NutritionDatabaseLoader, ingredient_name: str, quantity: str,
+                       grams: float, row_id: Optional[int], match_score: float) -> Dict:
         return {
             'ingredient': ingredient_name,
-            **self.default_nutrition
+            'quantity': quantity,
+            'grams': grams,
+            'row_id': row_id,
+            'matched_food': db_loader.food_name(row_id) if row_id is not None else None,
+            'match_score': match_score
         }
-    
-    def _calculate_scaled_nutrition(self, nutrition: Dict, grams: float) -> Dict:
 
-        if not nutrition:
-            return self.default_nutrition
-        
-        scale_factor = grams / 100.0  
-        
-        return {
-            'calories': nutrition['calories'] * scale_factor,
-            'carbs': nutrition['carbs'] * scale_factor,
-            'protein': nutrition['protein'] * scale_factor,
-            'fat': nutrition['fat'] * scale_factor,
-            'fiber': nutrition['fiber'] * scale_factor
+    def _substitute(self, resolved: 'ResolvedRecipe', substitutions: List[Dict]) -> 'ResolvedRecipe':
+        items = list(resolved.items)
+        positions = {item['ingredient'].lower(): position for position, item in enumerate(items)}
+        db_loader = resolved.db_loader
+
+        for substitution in substitutions:
+            target = substitution.get('ingredient')
+            if target is None:
+                position = None
+                current = {'ingredient': substitution['name'], 'quantity': '', 'grams': 0,
+                           'row_id': None, 'match_score': 0.0}
+            else:
+                position = positions.get(target.lower())
+                if position is None:
+                    raise ValueError(f"Recipe has no ingredient named {target!r}")
+                current = items[position]
+
+            name = substitution.get('name') or current['ingredient']
+            grams = substitution.get('grams', current['grams'])
+            if position is None or name != current['ingredient']:
+                row_id, match_score = db_loader.find_food_match(name)
+            else:
+                row_id, match_score = current['row_id'], current['match_score']
+
+            item = self._resolved_item(db_loader, name, substitution.get('quantity', current['quantity']),
+                                       grams, row_id, match_score)
+            if position is None:
+                positions[name.lower()] = len(items)
+                items.append(item)
+            else:
+                items[position] = item
+
+        items = [item for item in items if item['grams'] and item['grams'] > 0]
+        return ResolvedRecipe(resolved.dish_name, resolved.dish_type, resolved.classification, items, db_loader,
+                              self._nutrient_rows(items, db_loader),
+                              resolved.total_cooked_weight if resolved.cooked_weight_given else None,
+                              resolved.servings)
+
+    def _nutrient_rows(self, items: List[Dict], db_loader: NutritionDatabaseLoader) -> np.ndarray:
+        """Nutrients per 100g of each item: its database row, or the category estimate."""
+        row_ids = [item['row_id'] if item['row_id'] is not None else 0 for item in items]
+        estimated = {position: self._get_cached_estimate(item['ingredient'])
+                     for position, item in enumerate(items) if item['row_id'] is None}
+        return self._gather_rows(row_ids, estimated, db_loader)
+
+    def _evaluate(self, resolved: 'ResolvedRecipe', total_cooked_weight: Optional[float], servings: int,
+                  serving_grams: Optional[float] = None, nutrients: Optional[List[str]] = None) -> Dict:
+        total_raw_weight = resolved.total_raw_weight
+        total_nutrition = self._scale_rows(resolved.rows, [item['grams'] for item in resolved.items])
+
+        if total_cooked_weight and total_cooked_weight > 0:
+            request_log.event(logger, 'cooked_weight_provided', "Using provided total cooked weight: %sg",
+                              total_cooked_weight)
+            if total_raw_weight > 0 and abs(total_raw_weight - total_cooked_weight) / total_raw_weight > 0.5:
+                logger.warning("Large difference between raw ingredients (%sg) and "
+                               "cooked weight (%sg). This might affect accuracy.",
+                               total_raw_weight, total_cooked_weight)
+        else:
+            total_cooked_weight = self._estimate_cooked_weight(total_raw_weight, resolved.dish_type)
+            request_log.event(logger, 'cooked_weight_estimated', "Estimated cooked weight: %sg from raw weight: %sg",
+                              total_cooked_weight, total_raw_weight)
+
+        dish_classification = resolved.classification
+        serving_unit = dish_classification.get('serving_unit', 'katori')
+        if serving_grams is None:
+            serving_grams = dish_classification.get('serving_grams', 180)
+        standard_dish_type = dish_classification.get('dish_type', 'Wet Sabzi')
+
+        nutrition_per_serving = self._calculate_nutrition_per_serving(
+            total_nutrition, total_cooked_weight, serving_grams, servings
+        )
+
+        nutrition_per_serving = self._validate_nutrition_values(nutrition_per_serving)
+
+        result = {
+            "dish_name": resolved.dish_name,
+            "dish_type": standard_dish_type,
+            f"estimated_nutrition_per_{serving_unit}": {
+                "calories": round(nutrition_per_serving['calories']),
+                "protein": round(nutrition_per_serving['protein']),
+                "carbs": round(nutrition_per_serving['carbs']),
+                "fat": round(nutrition_per_serving['fat']),
+                "fiber": round(nutrition_per_serving['fiber'], 1)
+            },
+            "serving_size_grams": serving_grams,
+            "total_cooked_weight_grams": total_cooked_weight,
+            "servings": servings,
+            "ingredients_used": [
+                {
+                    "ingredient": item['ingredient'],
+                    "quantity": item['quantity'],
+                    "matched_food": item['matched_food'],
+                    "match_score": round(item['match_score'], 3)
+                } for item in resolved.items
+            ],
+            "recipe_handle": resolved.handle
         }
+
+        if nutrients:
+            row_ids = [item['row_id'] if item['row_id'] is not None else 0 for item in resolved.items]
+            estimated = {position: None for position, item in enumerate(resolved.items) if item['row_id'] is None}
+            profile_total = self._sum_profile(row_ids, [item['grams'] for item in resolved.items], estimated,
+                                              nutrients, resolved.db_loader)
+            profile_per_serving = self._scale_to_serving(
+                profile_total, total_cooked_weight, serving_grams, servings
+            )
+            result[f"nutrient_profile_per_{serving_unit}"] = {
+                column: round(value, 3) for column, value in zip(nutrients, profile_per_serving.tolist())
+            }
+
+        return result
     
-    def _sum_nutrition(self, ingredient_nutrition: List[Dict]) -> Dict:
-
-        total = {
-            'calories': 0,
-            'carbs': 0,
-            'protein': 0,
-            'fat': 0,
-            'fiber': 0
+    def resolve_ingredients(self, ingredient_names: List[str]) -> IngredientLookup:
+        """
+        Look up each distinct ingredient name once, mapping it to its database row and match score.
+
+        The result can be passed to calculate_nutrition as ``nutrition_lookup`` so
+        several dishes sharing ingredients only pay for one database lookup each.
+        It is ignored if the database has been reloaded since.
+        """
+        db_loader = self.db_loader
+        names = list(dict.fromkeys(ingredient_names))
+        return IngredientLookup(zip(names, db_loader.find_food_matches(names)), db_loader.version)
+
+    def reload_database(self) -> NutritionDatabaseLoader:
+        """
+        Load the database files again and swap the new tables in.
+
+        The new loader is fully built, and its lookup cache refilled with the
+        names recently looked up, before the swap. The swap is one attribute
+        assignment, so calculations already running finish on the old tables.
+        """
+        old_loader = self.db_loader
+        loader = old_loader.spawn()
+        loader.load()
+        loader.warm_up(old_loader.lookup_cache.keys())
+        self.db_loader = loader
+        return loader
+
+    def cache_stats(self) -> Dict:
+        return {
+            'ingredient_lookup': self.db_loader.cache_stats(),
+            'estimated_nutrition': self.estimate_cache.stats()
         }
-        
-        for item in ingredient_nutrition:
-            nutrition = item.get('nutrition', {})
-            for key in total:
-                total[key] += nutrition.get(key, 0)
-        
-        return total
+
+    def invalidate_caches(self) -> None:
+        self.db_loader.invalidate_cache()
+        self.estimate_cache.invalidate()
+
+    def _get_cached_estimate(self, ingredient_name: str) -> np.ndarray:
+        """Category estimate per 100g for an unmatched ingredient; a read-only row of the estimation table."""
+        return self.estimation.vector(ingredient_name)
+
+    def _sum_nutrition(self, row_ids: List[int], gram_weights: List[float], estimated: Dict[int, np.ndarray],
+                       db_loader: Optional[NutritionDatabaseLoader] = None) -> np.ndarray:
+        """
+        Total nutrient vector of a recipe.
+
+        Gathers one nutrient row per ingredient from the database matrix (or the
+        category estimate for unmatched ingredients), scales each by grams / 100 and
+        sums down the rows. The sum over axis 0 adds rows in ingredient order, so
+        totals are bit-identical to accumulating ingredient by ingredient.
+        """
+        return self._scale_rows(self._gather_rows(row_ids, estimated, db_loader or self.db_loader), gram_weights)
+
+    def _gather_rows(self, row_ids: List[int], estimated: Dict[int, np.ndarray],
+                     db_loader: NutritionDatabaseLoader) -> np.ndarray:
+        if len(estimated) == len(row_ids):
+            rows = np.empty((len(row_ids), len(NUTRIENT_KEYS)))
+        else:
+            rows = db_loader.nutrient_matrix.take(row_ids, axis=0)
+
+        for position, vector in estimated.items():
+            rows[position] = vector
+        return rows
+
+    def _scale_rows(self, rows: np.ndarray, gram_weights: List[float]) -> np.ndarray:
+        if not len(gram_weights):
+            return np.zeros(len(NUTRIENT_KEYS))
+
+        scale = np.asarray(gram_weights, dtype=np.float64) / 100.0
+        return (rows * scale[:, np.newaxis]).sum(axis=0)
     
     def _estimate_cooked_weight(self, raw_weight: float, dish_type: Optional[str] = None) -> int:
 
@@ -227,19 +426,45 @@ class NutritionCalculator:
 
             return int(raw_weight)
     
-    def _calculate_nutrition_per_serving(self, total_nutrition: Dict, 
+    def _sum_profile(self, row_ids: List[int], gram_weights: List[float], estimated: Dict[int, np.ndarray],
+                     columns: List[str], db_loader: Optional[NutritionDatabaseLoader] = None) -> np.ndarray:
+        """
+        Recipe totals for the requested full-profile columns.
+
+        Unmatched ingredients have no micronutrient data and contribute nothing.
+        Accumulates in float64 even though the profile is stored as float32.
+        """
+        db_loader = db_loader or self.db_loader
+        column_indices = db_loader.profile_column_indices(columns)
+
+        if not row_ids:
+            return np.zeros(len(columns))
+
+        rows = db_loader.profile_matrix[np.ix_(row_ids, column_indices)].astype(np.float64)
+        if estimated:
+            rows[list(estimated)] = 0.0
+
+        scale = np.asarray(gram_weights, dtype=np.float64) / 100.0
+        return (rows * scale[:, np.newaxis]).sum(axis=0)
+
+    def _scale_to_serving(self, total: np.ndarray, total_weight: float,
+                          serving_size: float, servings: int) -> np.ndarray:
+
+        if total_weight <= 0 or serving_size <= 0:
+            return total / servings
+
+        return total * (serving_size / total_weight)
+
+    def _calculate_nutrition_per_serving(self, total_nutrition: np.ndarray, 
                                          total_weight: float, 
                                          serving_size: float,
                                          servings: int) -> Dict:
 
         if total_weight <= 0 or serving_size <= 0:
             logger.warning("Invalid weight values for serving calculation. Using defaults.")
-            
-            return {key: value / servings for key, value in total_nutrition.items()}
-        
-        scale_factor = serving_size / total_weight
         
-        return {key: value * scale_factor for key, value in total_nutrition.items()}
+        per_serving = self._scale_to_serving(total_nutrition, total_weight, serving_size, servings)
+        return dict(zip(NUTRIENT_KEYS, per_serving.tolist()))
     
     def _validate_nutrition_values(self, nutrition: Dict) -> Dict:
         validated = {}
@@ -250,10 +475,12 @@ class NutritionCalculator:
                 max_val = self.nutrition_ranges[nutrient]['max']
 
                 if value < 0:
-                    logger.warning(f"Negative {nutrient} value ({value}). Setting to 0.")
+                    request_log.event(logger, 'negative_value', "Negative %s value (%s). Setting to 0.", nutrient, value,
+                                      level=logging.WARNING)
                     validated[nutrient] = 0
                 elif value > max_val * 5:  
-                    logger.warning(f"Extreme {nutrient} value ({value}). Capping to maximum.")
+                    request_log.event(logger, 'extreme_value', "Extreme %s value (%s). Capping to maximum.",
+                                      nutrient, value, level=logging.WARNING)
                     validated[nutrient] = max_val
                 else:
                     validated[nutrient] = value
@@ -0,0 +1,145 @@
+"""
+Single-pass parser for household ingredient quantities ("1 1/2 cups", "2-3 tbsp", "½ tsp").
+"""
+
+import re
+from typing import Optional, Tuple
+
+UNIT_ALIASES = {
+    "tablespoon": ["tablespoons", "tablespoon", "tbsps", "tbsp", "tbs", "tbl"],
+    "teaspoon": ["teaspoons", "teaspoon", "tsps", "tsp"],
+    "cup": ["cups", "cup"],
+    "katori": ["katoris", "katori"],
+    "glass": ["glasses", "glass"],
+    "handful": ["handfuls", "handful"],
+    "pinch": ["pinches", "pinch"],
+    "gram": ["grams", "gram", "gms", "gm", "g"],
+    "kilogram": ["kilograms", "kilogram", "kilos", "kilo", "kgs", "kg"],
+    "ml": ["milliliters", "milliliter", "millilitres", "millilitre", "ml"],
+    "liter": ["liters", "liter", "litres", "litre", "ltr", "lt", "l"],
+    "piece": ["pieces", "piece", "pcs", "pc"],
+}
+
+WORD_NUMBERS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "half": 0.5, "quarter": 0.25,
+}
+
+UNICODE_FRACTIONS = {
+    "½": 1 / 2, "⅓": 1 / 3, "⅔": 2 / 3, "¼": 1 / 4, "¾": 3 / 4, "⅕": 1 / 5, "⅖": 2 / 5,
+    "⅗": 3 / 5, "⅘": 4 / 5, "⅙": 1 / 6, "⅚": 5 / 6, "⅛": 1 / 8, "⅜": 3 / 8, "⅝": 5 / 8, "⅞": 7 / 8,
+}
+
+# Size and heaping qualifiers allowed between the amount and its unit ("2 heaped tbsp").
+QUALIFIERS = {"heaped", "heaping", "level", "rounded", "scant", "generous", "full",
+              "small", "medium", "large", "big", "a", "an", "of"}
+
+_UNIT_LOOKUP = {alias: unit for unit, aliases in UNIT_ALIASES.items() for alias in aliases}
+
+
+def _alternation(words):
+    return "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+def _amount(prefix: str) -> str:
+    fractions = "".join(UNICODE_FRACTIONS)
+    return (
+        rf"(?:(?P<{prefix}n>\d+)\s*/\s*(?P<{prefix}d>\d+)"
+        rf"|(?P<{prefix}i>\d+(?:\.\d+)?|\.\d+)"
+        rf"(?:\s*(?P<{prefix}u>[{fractions}])|\s+(?:and\s+)?(?P<{prefix}fn>\d+)\s*/\s*(?P<{prefix}fd>\d+))?"
+        rf"|(?P<{prefix}uo>[{fractions}])"
+        rf"|(?P<{prefix}w>{_alternation(WORD_NUMBERS)})\b)"
+        rf"(?P<{prefix}h>\s+and\s+a\s+half\b)?"
+    )
+
+
+# One pass captures the amount, an optional range upper bound and the next few
+# words; units and qualifiers are then resolved with dict lookups rather than
+# regex alternations, which keeps the pattern cheap to evaluate.
+QUANTITY_PATTERN = re.compile(
+    rf"(?<![\w.]){_amount('a')}"
+    rf"(?:\s*(?:-|–|—|\bto\b|\bor\b)\s*{_amount('b')})?"
+    r"\s*(?P<word1>[a-z]+)?(?:\s+(?P<word2>[a-z]+))?(?:\s+(?P<word3>[a-z]+))?"
+)
+
+
+# Most recipe quantities are a plain number and a word ("2 tablespoons", "250g").
+SIMPLE_QUANTITY_PATTERN = re.compile(r"\s*(\d+(?:\.\d+)?)\s*([a-z]*)\s*")
+
+_search = QUANTITY_PATTERN.search
+_simple_match = SIMPLE_QUANTITY_PATTERN.fullmatch
+
+# Group numbers resolved from the group names once, so the parser never
+# depends on hand-counted positions in the pattern.
+_GROUP_INDEX = QUANTITY_PATTERN.groupindex
+_AMOUNT_GROUPS = {
+    prefix: tuple(_GROUP_INDEX[prefix + name] for name in ("n", "d", "i", "u", "fn", "fd", "uo", "w", "h"))
+    for prefix in ("a", "b")
+}
+_WORD_GROUPS = tuple(_GROUP_INDEX[name] for name in ("word1", "word2", "word3"))
+
+
+def _amount_value(numerator, denominator, whole, unicode_part, part_numerator, part_denominator,
+                  unicode_only, word, and_a_half) -> Optional[float]:
+    if whole is not None:
+        value = float(whole)
+        if unicode_part is not None:
+            value += UNICODE_FRACTIONS[unicode_part]
+        elif part_numerator is not None:
+            value += int(part_numerator) / int(part_denominator)
+    elif numerator is not None:
+        value = int(numerator) / int(denominator)
+    elif unicode_only is not None:
+        value = UNICODE_FRACTIONS[unicode_only]
+    elif word is not None:
+        value = WORD_NUMBERS[word]
+    else:
+        return None
+
+    if and_a_half is not None:
+        value += 0.5
+
+    return value
+
+
+def parse_quantity(quantity_str: str) -> Tuple[Optional[float], Optional[str]]:
+    """
+    Parse a quantity string into (amount, canonical unit).
+
+    Handles decimals, fractions, mixed fractions ("1 1/2"), unicode fractions,
+    number words ("half", "one") and ranges ("2-3", "2 to 3"), which resolve to
+    their midpoint. Amounts are returned in the unit as written; a missing unit
+    means "piece". Returns (None, None) when no amount is found.
+    """
+    text = quantity_str.lower()
+
+    simple = _simple_match(text)
+    if simple is not None:
+        number, word = simple.groups()
+        return float(number), _UNIT_LOOKUP.get(word, "piece")
+
+    match = _search(text)
+
+    while match is not None:
+        unit = None
+        for word in match.group(*_WORD_GROUPS):
+            if word is None:
+                break
+            unit = _UNIT_LOOKUP.get(word)
+            if unit is not None or word not in QUALIFIERS:
+                break
+
+        # "a"/"an" only count as an amount when a unit follows ("a pinch").
+        if unit is None and match.group("aw") in ("a", "an"):
+            match = _search(text, match.end("aw"))
+            continue
+
+        value = _amount_value(*match.group(*_AMOUNT_GROUPS["a"]))
+        upper = _amount_value(*match.group(*_AMOUNT_GROUPS["b"]))
+        if upper is not None:
+            value = (value + upper) / 2
+
+        return float(value), unit or "piece"
+
+    return None, None
@@ -0,0 +1,218 @@
+"""
+Two-level (memory + SQLite) cache for recipes returned by RecipeFetcher.
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import logging
+import threading
+import unicodedata
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from utils.lru_cache import LRUCache, MISSING
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD = re.compile(r'[^\w\s]+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_dish_name(dish_name: str) -> str:
+    """Cache key for a dish: case, punctuation and spacing differences are ignored."""
+    normalized = unicodedata.normalize('NFKC', dish_name).lower()
+    normalized = _NON_WORD.sub(' ', normalized)
+    return _WHITESPACE.sub(' ', normalized).strip()
+
+
+class RecipeCache:
+    """
+    Recipe cache keyed by normalized dish name.
+
+    Entries live in a bounded in-memory LRU in front of a SQLite file, so they
+    survive worker restarts and are shared by every worker on the host. Entries
+    expire after ``ttl_seconds``; the disk store keeps at most ``max_entries``
+    rows, evicting the least recently used ones. Reads served from memory are
+    batched and written to the disk access times at most every
+    ``access_flush_seconds`` (and before every eviction), so hot dishes are not
+    evicted for looking idle on disk. Disk errors are logged and the cache
+    degrades to memory only rather than failing the request.
+    """
+
+    def __init__(self, db_path: Optional[str], ttl_seconds: float = 7 * 24 * 3600,
+                 max_entries: int = 5000, memory_size: int = 512,
+                 access_flush_seconds: float = 60.0):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.access_flush_seconds = access_flush_seconds
+        self.memory = LRUCache(memory_size)
+
+        self._access_lock = threading.Lock()
+        self._pending_access: Dict[str, float] = {}
+        self._last_access_flush = 0.0
+
+        if self.db_path:
+            try:
+                self._init_db()
+            except sqlite3.Error as e:
+                logger.error("Could not open recipe cache at %s: %s. Using memory only.", self.db_path, e)
+                self.db_path = None
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self) -> None:
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS recipes ("
+                " dish_key TEXT PRIMARY KEY,"
+                " recipe_json TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS recipes_last_access ON recipes (last_access)")
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def get(self, dish_name: str) -> Optional[Dict]:
+        key = normalize_dish_name(dish_name)
+        now = time.time()
+
+        entry = self.memory.get(key)
+        if entry is not MISSING:
+            created_at, recipe_json = entry
+            if not self._is_expired(created_at, now):
+                self._record_access(key, now)
+                return json.loads(recipe_json)
+            self.memory.discard(key)
+
+        if not self.db_path:
+            return None
+
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT recipe_json, created_at FROM recipes WHERE dish_key = ?", (key,)
+                ).fetchone()
+
+                if row is None:
+                    return None
+
+                recipe_json, created_at = row
+                if self._is_expired(created_at, now):
+                    conn.execute("DELETE FROM recipes WHERE dish_key = ?", (key,))
+                    return None
+
+                conn.execute("UPDATE recipes SET last_access = ? WHERE dish_key = ?", (now, key))
+        except sqlite3.Error as e:
+            logger.error("Recipe cache read failed for %s: %s", dish_name, e)
+            return None
+
+        self.memory.put(key, (created_at, recipe_json))
+        return json.loads(recipe_json)
+
+    def put(self, dish_name: str, recipe_data: Dict) -> None:
+        key = normalize_dish_name(dish_name)
+        now = time.time()
+        recipe_json = json.dumps(recipe_data)
+
+        self.memory.put(key, (now, recipe_json))
+
+        if not self.db_path:
+            return
+
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO recipes (dish_key, recipe_json, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?)", (key, recipe_json, now, now)
+                )
+                self._write_access(conn, self._take_pending_access(now))
+                self._evict(conn, now)
+        except sqlite3.Error as e:
+            logger.error("Recipe cache write failed for %s: %s", dish_name, e)
+
+    def _record_access(self, key: str, now: float) -> None:
+        if not self.db_path:
+            return
+
+        with self._access_lock:
+            self._pending_access[key] = now
+            if now - self._last_access_flush < self.access_flush_seconds:
+                return
+
+        pending = self._take_pending_access(now)
+        try:
+            with self._connect() as conn:
+                self._write_access(conn, pending)
+        except sqlite3.Error as e:
+            logger.error("Recipe cache access update failed: %s", e)
+
+    def _take_pending_access(self, now: float) -> Dict[str, float]:
+        with self._access_lock:
+            pending, self._pending_access = self._pending_access, {}
+            self._last_access_flush = now
+        return pending
+
+    def _write_access(self, conn: sqlite3.Connection, pending: Dict[str, float]) -> None:
+        if pending:
+            conn.executemany(
+                "UPDATE recipes SET last_access = MAX(last_access, ?) WHERE dish_key = ?",
+                [(accessed_at, key) for key, accessed_at in pending.items()]
+            )
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        if self.ttl_seconds > 0:
+            conn.execute("DELETE FROM recipes WHERE created_at < ?", (now - self.ttl_seconds,))
+
+        if self.max_entries > 0:
+            conn.execute(
+                "DELETE FROM recipes WHERE dish_key IN ("
+                " SELECT dish_key FROM recipes ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def invalidate(self, dish_name: Optional[str] = None) -> None:
+        """Drop one dish, or the whole cache when no dish is given."""
+        if dish_name is None:
+            self.memory.invalidate()
+        else:
+            self.memory.discard(normalize_dish_name(dish_name))
+
+        if not self.db_path:
+            return
+
+        try:
+            with self._connect() as conn:
+                if dish_name is None:
+                    conn.execute("DELETE FROM recipes")
+                else:
+                    conn.execute("DELETE FROM recipes WHERE dish_key = ?", (normalize_dish_name(dish_name),))
+        except sqlite3.Error as e:
+            logger.error("Recipe cache invalidation failed: %s", e)
+
+    def stats(self) -> Dict:
+        stats = {'memory': self.memory.stats(), 'disk_entries': None}
+        if self.db_path:
+            try:
+                with self._connect() as conn:
+                    stats['disk_entries'] = conn.execute("SELECT COUNT(*) FROM recipes").fetchone()[0]
+            except sqlite3.Error:
+                pass
+        return stats
@@ -1,55 +1,124 @@
 import os
 import json
 import logging
-from openai import OpenAI
 from typing import Dict, List, Optional, Tuple
 
-logging.basicConfig(level=logging.INFO, 
-                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+from utils import request_log
+from utils.recipe_cache import RecipeCache
+from utils.recipe_source import RecipeSource
+
 logger = logging.getLogger(__name__)
 
 class RecipeFetcher:
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[RecipeCache] = None,
+                 source: Optional[RecipeSource] = None):
 
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
-        if not self.api_key:
+        self.cache = cache
+        # Recipes not cached come from OpenAI, or from this source when one is given.
+        self.source = source
+        self.client = None
+        if not self.api_key and source is None:
             logger.warning("No OpenAI API key provided. Recipe fetching will not work.")
-        else:
-            self.client = OpenAI(api_key=self.api_key)
     
     def fetch_recipe(self, dish_name: str) -> Dict:
 
-        if not self.api_key:
-            logger.error("OpenAI API key not provided. Cannot fetch recipe.")
-            return self._get_fallback_recipe(dish_name)
+        recipe_data = self._local_recipe(dish_name)
+        if recipe_data is not None:
+            return recipe_data
         
         try:
 
-            prompt = self._craft_recipe_prompt(dish_name)
-
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are a knowledgeable Indian cuisine expert."},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.5
-            )
-            
-            recipe_data = json.loads(response.choices[0].message.content)
+            if self.source is not None:
+                return self._recipe_from_source(self.source.fetch(dish_name), dish_name)
 
-            if not self._validate_recipe_data(recipe_data):
-                logger.warning(f"Invalid recipe data for {dish_name}. Using fallback.")
-                return self._get_fallback_recipe(dish_name)
-            
-            logger.info(f"Successfully fetched recipe for {dish_name}")
-            return recipe_data
+            response = self._get_client().chat.completions.create(**self._completion_request(dish_name))
+
+            return self._recipe_from_completion(response, dish_name)
             
         except Exception as e:
-            logger.error(f"Error fetching recipe for {dish_name}: {str(e)}")
+            return self._fallback_after_error(dish_name, str(e))
+
+    def _get_client(self):
+        # openai takes about a second to import, so it is only loaded for the first upstream call.
+        if self.client is None:
+            from openai import OpenAI
+            self.client = OpenAI(api_key=self.api_key)
+        return self.client
+
+    # The helpers below hold every step around the upstream call, so the
+    # blocking path above and AsyncRecipeFetcher behave identically.
+
+    def _local_recipe(self, dish_name: str) -> Optional[Dict]:
+        """Recipe served without calling upstream: a cached one, or the fallback when there is no API key."""
+
+        if self.cache:
+            cached_recipe = self.cache.get(dish_name)
+            if cached_recipe:
+                request_log.event(logger, 'recipe_cache_hit', "Serving cached recipe for %s", dish_name,
+                                  level=logging.DEBUG)
+                return cached_recipe
+
+        if not self.api_key and self.source is None:
+            logger.error("OpenAI API key not provided. Cannot fetch recipe.")
+            return self._get_fallback_recipe(dish_name)
+
+        return None
+
+    def _recipe_from_completion(self, response, dish_name: str) -> Dict:
+
+        recipe_data = self._parse_completion(response, dish_name)
+        if recipe_data is None:
             return self._get_fallback_recipe(dish_name)
+
+        return recipe_data
+
+    def _recipe_from_source(self, recipe_data: Dict, dish_name: str) -> Dict:
+
+        recipe_data = self._accept_recipe(recipe_data, dish_name)
+        if recipe_data is None:
+            return self._get_fallback_recipe(dish_name)
+
+        return recipe_data
+
+    def _fallback_after_error(self, dish_name: str, error: str) -> Dict:
+
+        logger.error("Error fetching recipe for %s: %s", dish_name, error)
+        return self._get_fallback_recipe(dish_name)
     
+    def _completion_request(self, dish_name: str) -> Dict:
+
+        prompt = self._craft_recipe_prompt(dish_name)
+
+        return {
+            "model": "gpt-4o",
+            "messages": [
+                {"role": "system", "content": "You are a knowledgeable Indian cuisine expert."},
+                {"role": "user", "content": prompt}
+            ],
+            "response_format": {"type": "json_object"},
+            "temperature": 0.5
+        }
+
+    def _parse_completion(self, response, dish_name: str) -> Optional[Dict]:
+        """Decode and validate a completion; valid recipes are written to the cache."""
+
+        return self._accept_recipe(json.loads(response.choices[0].message.content), dish_name)
+
+    def _accept_recipe(self, recipe_data: Dict, dish_name: str) -> Optional[Dict]:
+        """Validate an upstream recipe and write it to the cache; None when it is invalid."""
+
+        if not self._validate_recipe_data(recipe_data):
+            logger.warning("Invalid recipe data for %s. Using fallback.", dish_name)
+            return None
+
+        logger.info("Successfully fetched recipe for %s", dish_name)
+
+        if self.cache:
+            self.cache.put(dish_name, recipe_data)
+
+        return recipe_data
+
     def _craft_recipe_prompt(self, dish_name: str) -> str:
 
         return f"""
@@ -88,7 +157,7 @@ class RecipeFetcher:
         required_fields = ["dish_name", "dish_type", "ingredients"]
 
         if not all(field in recipe_data for field in required_fields):
-            logger.warning(f"Missing required fields in recipe data. Found: {list(recipe_data.keys())}")
+            logger.warning("Missing required fields in recipe data. Found: %s", list(recipe_data.keys()))
             return False
 
         if not recipe_data["ingredients"] or len(recipe_data["ingredients"]) == 0:
@@ -97,7 +166,7 @@ class RecipeFetcher:
   
         for ingredient in recipe_data["ingredients"]:
             if "name" not in ingredient or "quantity" not in ingredient:
-                logger.warning(f"Ingredient missing name or quantity: {ingredient}")
+                logger.warning("Ingredient missing name or quantity: %s", ingredient)
                 return False
         
         return True
@@ -169,11 +238,11 @@ class RecipeFetcher:
 
         for key, recipe in common_recipes.items():
             if key in dish_name.lower():
-                logger.info(f"Using fallback recipe for {dish_name}")
+                request_log.event(logger, 'fallback_recipe', "Using fallback recipe for %s", dish_name)
                 return recipe
         
 
-        logger.info(f"Using generic fallback recipe for {dish_name}")
+        request_log.event(logger, 'generic_fallback_recipe', "Using generic fallback recipe for %s", dish_name)
         return {
             "dish_name": dish_name.title(),
             "dish_type": "Unknown",
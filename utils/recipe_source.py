@@ -0,0 +1,120 @@
+"""
+Pluggable recipe sources for RecipeFetcher.
+
+By default RecipeFetcher asks OpenAI for recipes it has not cached. Given a
+``RecipeSource`` it asks the source instead; the fetcher still validates and
+caches what the source returns and serves its fallback recipe when the
+source fails.
+"""
+
+import copy
+import json
+import time
+import random
+import asyncio
+import hashlib
+import threading
+from typing import Dict, List, Tuple
+
+from utils.recipe_cache import normalize_dish_name
+
+
+class RecipeSourceError(Exception):
+    """Raised by a source that could not produce a recipe."""
+
+
+class RecipeSource:
+    """
+    Produces raw recipe data for a dish name, shaped like an OpenAI recipe
+    (dish_name, dish_type, total_cooked_weight_grams, servings, ingredients).
+
+    ``fetch`` raises on failure. ``fetch_async`` is used by AsyncRecipeFetcher;
+    the default runs ``fetch`` in a thread.
+    """
+
+    name = 'source'
+
+    def fetch(self, dish_name: str) -> Dict:
+        raise NotImplementedError
+
+    async def fetch_async(self, dish_name: str) -> Dict:
+        return await asyncio.to_thread(self.fetch, dish_name)
+
+
+class LocalCorpusSource(RecipeSource):
+    """
+    Recipes served from a local corpus, standing in for OpenAI in load tests.
+
+    Dishes in the corpus get their own recipe; any other dish gets a corpus
+    recipe picked by a hash of its name, renamed to the dish. Each call waits
+    ``latency_ms`` plus an exponentially distributed extra delay averaging
+    ``jitter_ms``, and fails with probability ``error_rate``. Delays and
+    failures are drawn from the seed, the dish and how many times it was
+    fetched, so a run replays identically whatever the thread interleaving.
+    """
+
+    name = 'local'
+
+    def __init__(self, recipes: List[Dict], latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, seed: int = 0):
+        if not recipes:
+            raise ValueError("Recipe corpus is empty")
+        self.recipes = recipes
+        self.by_name = {normalize_dish_name(recipe['dish_name']): recipe for recipe in recipes}
+        self.latency_ms = max(0.0, latency_ms)
+        self.jitter_ms = max(0.0, jitter_ms)
+        self.error_rate = max(0.0, min(1.0, error_rate))
+        self.seed = seed
+        self._calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str, **options) -> 'LocalCorpusSource':
+        """Source for a corpus file: a JSON list of recipes, or JSONL with one recipe per line."""
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        if text.lstrip().startswith('['):
+            recipes = json.loads(text)
+        else:
+            recipes = [json.loads(line) for line in text.splitlines() if line.strip()]
+        return cls(recipes, **options)
+
+    def recipe(self, dish_name: str) -> Dict:
+        key = normalize_dish_name(dish_name)
+        recipe = self.by_name.get(key)
+        if recipe is None:
+            digest = hashlib.sha256(key.encode('utf-8')).digest()
+            recipe = dict(self.recipes[int.from_bytes(digest[:8], 'big') % len(self.recipes)],
+                          dish_name=dish_name.strip().title())
+        return copy.deepcopy(recipe)
+
+    def _draw(self, dish_name: str) -> Tuple[float, bool]:
+        """Delay in seconds and whether to fail, for the next call for this dish."""
+        key = normalize_dish_name(dish_name)
+        with self._lock:
+            call = self._calls.get(key, 0)
+            self._calls[key] = call + 1
+
+        rng = random.Random(f"{self.seed}:{key}:{call}")
+        delay_ms = self.latency_ms
+        if self.jitter_ms:
+            delay_ms += rng.expovariate(1.0 / self.jitter_ms)
+        return delay_ms / 1000.0, rng.random() < self.error_rate
+
+    def _result(self, dish_name: str, failed: bool) -> Dict:
+        if failed:
+            raise RecipeSourceError(f"Simulated recipe source error for {dish_name}")
+        return self.recipe(dish_name)
+
+    def fetch(self, dish_name: str) -> Dict:
+        delay, failed = self._draw(dish_name)
+        if delay:
+            time.sleep(delay)
+        return self._result(dish_name, failed)
+
+    async def fetch_async(self, dish_name: str) -> Dict:
+        # Waits on the event loop rather than a thread, like a real network call.
+        delay, failed = self._draw(dish_name)
+        if delay:
+            await asyncio.sleep(delay)
+        return self._result(dish_name, failed)
@@ -0,0 +1,148 @@
+"""
+Logging setup and per-request aggregation of per-ingredient log events.
+
+Modules log with plain ``logging`` loggers and %-style arguments, so nothing
+is formatted for records below the configured level. Entry points (the Flask
+app, the CLIs) call ``configure`` once instead of each module calling
+basicConfig.
+
+Messages emitted once per ingredient go through ``event``. While a request
+summary is active (``begin``/``end``) they are only counted, and ``end``
+emits one summary record for the request. A sampled fraction of requests
+also logs each event individually, whatever the configured level.
+"""
+
+import json
+import time
+import random
+import logging
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Example arguments kept per event in a request summary.
+MAX_EXAMPLES = 3
+
+summary_logger = logging.getLogger('nutrition.request')
+
+_summary: ContextVar[Optional['RequestSummary']] = ContextVar('request_log_summary', default=None)
+
+
+class StructuredFormatter(logging.Formatter):
+    """One JSON object per record, including the ``fields`` of summary records."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure(level='INFO', fmt: str = 'text', debug_sample_rate: float = 0.0) -> None:
+    """
+    Configure the root logger for the process; replaces any handlers already set.
+
+    ``fmt`` is "text" or "json". ``debug_sample_rate`` (0-1) is the fraction of
+    request summaries that also log every event individually.
+    """
+    global _debug_sample_rate
+
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(StructuredFormatter() if fmt == 'json' else logging.Formatter(TEXT_FORMAT))
+    logging.basicConfig(level=level, handlers=[handler], force=True)
+    _debug_sample_rate = max(0.0, min(1.0, debug_sample_rate))
+
+
+_debug_sample_rate = 0.0
+
+
+class RequestSummary:
+    """Event counts and a few example arguments collected during one request."""
+
+    __slots__ = ('name', 'fields', 'sampled', 'start', 'events', 'level')
+
+    def __init__(self, name: str, fields: Dict, sampled: bool):
+        self.name = name
+        self.fields = fields
+        self.sampled = sampled
+        self.start = time.perf_counter()
+        self.events: Dict[str, list] = {}
+        self.level = logging.INFO
+
+    def add(self, event: str, level: int, args: tuple) -> None:
+        entry = self.events.get(event)
+        if entry is None:
+            entry = self.events[event] = [0, []]
+        entry[0] += 1
+        if args and len(entry[1]) < MAX_EXAMPLES:
+            entry[1].append(args[0])
+        if level > self.level:
+            self.level = level
+
+    def as_fields(self) -> Dict:
+        fields = dict(self.fields)
+        fields['request'] = self.name
+        fields['duration_ms'] = round((time.perf_counter() - self.start) * 1000, 3)
+        fields['events'] = {event: {'count': count, 'examples': examples}
+                            for event, (count, examples) in self.events.items()}
+        return fields
+
+
+def begin(name: str, **fields):
+    """Start collecting events for the current request (context); returns a token for ``end``."""
+    sampled = _debug_sample_rate > 0 and random.random() < _debug_sample_rate
+    return _summary.set(RequestSummary(name, fields, sampled))
+
+
+def annotate(**fields) -> None:
+    """Add fields to the active request summary, if any."""
+    summary = _summary.get()
+    if summary is not None:
+        summary.fields.update(fields)
+
+
+def end(token) -> None:
+    """Emit the summary record of the request started by ``begin``."""
+    summary = _summary.get()
+    _summary.reset(token)
+    if summary is None or not summary_logger.isEnabledFor(summary.level):
+        return
+
+    fields = summary.as_fields()
+    annotations = "".join(f" {key}={value!r}" for key, value in summary.fields.items())
+    counts = ", ".join(f"{event}={entry['count']}" for event, entry in fields['events'].items())
+    summary_logger.log(summary.level, "%s%s finished in %.1fms (%s)", summary.name, annotations,
+                       fields['duration_ms'], counts or "no events", extra={'fields': fields})
+
+
+def event(logger: logging.Logger, name: str, msg: str, *args, level: int = logging.INFO) -> None:
+    """
+    Log a per-item message, or count it in the active request summary.
+
+    ``msg`` is only formatted when the record is actually emitted.
+    """
+    summary = _summary.get()
+    if summary is None:
+        if logger.isEnabledFor(level):
+            logger.log(level, msg, *args, stacklevel=2)
+        return
+
+    summary.add(name, level, args)
+    if summary.sampled:
+        # Sampled requests show every event, even below the configured level.
+        logger.handle(logger.makeRecord(logger.name, level, '(request_log)', 0, msg, args, None,
+                                        extra={'fields': {'event': name, 'request': summary.name}}))
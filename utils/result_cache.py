@@ -0,0 +1,60 @@
+import json
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+from utils.lru_cache import LRUCache, MISSING
+
+# Recipe fields that decide the computed nutrition; anything else a recipe
+# carries (source, notes) does not change the result.
+RESULT_FIELDS = ('dish_name', 'dish_type', 'ingredients', 'servings', 'total_cooked_weight_grams')
+
+
+def recipe_fingerprint(recipe_data: Dict, db_version: str, options: Any = None) -> str:
+    """
+    SHA-256 of the canonical JSON of a recipe's result fields, the database
+    version and any calculation options.
+
+    Key order and whitespace of the recipe do not matter; ingredient order does,
+    since results list ingredients in recipe order.
+    """
+    canonical = json.dumps(
+        {'recipe': {field: recipe_data.get(field) for field in RESULT_FIELDS},
+         'db_version': db_version,
+         'options': options},
+        sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    Computed nutrition results keyed by ``recipe_fingerprint``.
+
+    Entries belong to the database version they were computed with. The first
+    key for a new version drops every entry of the previous one, since those
+    can no longer be hit. Cached results are shared, so callers must not
+    modify them.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.cache = LRUCache(maxsize)
+        self.db_version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def key(self, recipe_data: Dict, db_version: str, options: Any = None) -> str:
+        if db_version != self.db_version:
+            with self._lock:
+                if db_version != self.db_version:
+                    self.cache.invalidate()
+                    self.db_version = db_version
+        return recipe_fingerprint(recipe_data, db_version, options)
+
+    def get(self, key: str, default: Any = MISSING) -> Any:
+        return self.cache.get(key, default)
+
+    def put(self, key: str, value: Any) -> None:
+        self.cache.put(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
@@ -0,0 +1,66 @@
+"""
+Nutrition tables shared by worker processes through memory-mapped files.
+
+The parent loads the database once and writes the matrices to ``.npy`` files
+in a private temporary directory; every worker maps them read-only, so the
+operating system keeps one copy in the page cache however many workers
+attach. The remaining tables (names, codes, n-gram postings) are small and
+travel with the descriptor that workers receive at start-up.
+"""
+
+import os
+import shutil
+import tempfile
+from typing import Any, Dict
+
+import numpy as np
+
+MAPPED_ARRAYS = ('nutrient_matrix', 'profile_matrix')
+
+
+class SharedNutritionTable:
+    """
+    Owner of the mapped files; use as a context manager, or call ``close``,
+    to delete them once the workers are done.
+    """
+
+    def __init__(self, loader, directory: str = None):
+        self.directory = tempfile.mkdtemp(prefix='nutrition-table-', dir=directory)
+
+        arrays = {}
+        mapped = {}
+        try:
+            for name, values in loader.table_arrays().items():
+                if name in MAPPED_ARRAYS:
+                    path = os.path.join(self.directory, f"{name}.npy")
+                    np.save(path, np.ascontiguousarray(values))
+                    mapped[name] = path
+                else:
+                    arrays[name] = values
+        except BaseException:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            raise
+
+        self.descriptor = {
+            'db_path': loader.db_path,
+            'full_profile': loader.profile_matrix is not None,
+            'arrays': arrays,
+            'mapped': mapped,
+        }
+
+    @staticmethod
+    def attach(descriptor: Dict[str, Any]) -> Dict[str, Any]:
+        """Arrays for NutritionDatabaseLoader.load_arrays, with the matrices mapped rather than read."""
+        arrays = dict(descriptor['arrays'])
+        for name, path in descriptor['mapped'].items():
+            arrays[name] = np.load(path, mmap_mode='r')
+        return arrays
+
+    def close(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self) -> 'SharedNutritionTable':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,108 @@
+"""
+Process pool for batch nutrition calculations.
+
+Workers do not load the nutrition database themselves: the parent loads it
+once and shares the prepared tables through SharedNutritionTable, so starting
+a worker costs a few milliseconds and the nutrient matrices exist once in
+memory whatever the number of workers.
+"""
+
+import logging
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from utils.shared_table import SharedNutritionTable
+
+logger = logging.getLogger(__name__)
+
+_processor = None
+_calculator = None
+
+
+def build_calculator(**overrides):
+    """A NutritionCalculator configured like the web app's."""
+    from config import (NUTRITION_DB_FILE, NUTRITION_SNAPSHOT_FILE, NUTRITION_DB_BACKEND, NUTRITION_FULL_PROFILE,
+                        INGREDIENT_CACHE_SIZE, INGREDIENT_MATCH_THRESHOLD, INGREDIENT_ALIASES_FILE,
+                        ESTIMATION_CATEGORIES_FILE)
+    from utils.nutrition_calculator import NutritionCalculator
+
+    options = dict(cache_size=INGREDIENT_CACHE_SIZE, full_profile=NUTRITION_FULL_PROFILE,
+                   snapshot_path=NUTRITION_SNAPSHOT_FILE,
+                   backend=NUTRITION_DB_BACKEND, match_threshold=INGREDIENT_MATCH_THRESHOLD,
+                   alias_path=INGREDIENT_ALIASES_FILE, estimation_path=ESTIMATION_CATEGORIES_FILE)
+    options.update(overrides)
+    return NutritionCalculator(NUTRITION_DB_FILE, **options)
+
+
+def _init_worker(descriptor: Dict, log_level: int) -> None:
+    global _processor, _calculator
+    from utils.ingredient_processor import IngredientProcessor
+
+    logging.getLogger().setLevel(log_level)
+    _processor = IngredientProcessor()
+    _calculator = build_calculator(tables=SharedNutritionTable.attach(descriptor),
+                                   full_profile=descriptor['full_profile'])
+
+
+def calculate_recipe(recipe, nutrients: Optional[List[str]] = None) -> Dict:
+    """Nutrition result for one recipe, or an ``error`` record; ``nutrients`` as for calculate_nutrition."""
+    if isinstance(recipe, Exception):
+        return {'error': f"Invalid record: {str(recipe)}"}
+
+    if not isinstance(recipe, dict) or not recipe.get('dish_name') or \
+            not isinstance(recipe.get('ingredients'), list):
+        return {'error': "Record needs a dish_name and an ingredients list"}
+
+    try:
+        processed_ingredients = _processor.process_ingredients(recipe['ingredients'])
+        return _calculator.calculate_nutrition(
+            recipe['dish_name'],
+            recipe.get('dish_type'),
+            processed_ingredients,
+            recipe.get('total_cooked_weight_grams'),
+            recipe.get('servings', 4),
+            nutrients=nutrients
+        )
+    except Exception as e:
+        return {'dish_name': recipe['dish_name'], 'error': str(e)}
+
+
+def calculate_chunk(chunk: List[Tuple[int, object]], nutrients: Optional[List[str]] = None) -> List[Tuple[int, Dict]]:
+    return [(line_number, calculate_recipe(recipe, nutrients)) for line_number, recipe in chunk]
+
+
+class NutritionWorkerPool:
+    """
+    A ProcessPoolExecutor whose workers calculate with one shared nutrition table.
+
+    ``calculator`` must already be loaded; its tables are shared as they are,
+    so workers match exactly what it would.
+    """
+
+    def __init__(self, calculator, workers: int = None, log_level: int = logging.WARNING):
+        self.table = SharedNutritionTable(calculator.db_loader)
+        try:
+            self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                                initargs=(self.table.descriptor, log_level))
+        except BaseException:
+            self.table.close()
+            raise
+        self.workers = self.executor._max_workers
+
+    def submit(self, fn, *args) -> Future:
+        return self.executor.submit(fn, *args)
+
+    def submit_chunk(self, chunk: List[Tuple[int, object]], nutrients: Optional[List[str]] = None) -> Future:
+        return self.executor.submit(calculate_chunk, chunk, nutrients)
+
+    def close(self) -> None:
+        try:
+            self.executor.shutdown()
+        finally:
+            self.table.close()
+
+    def __enter__(self) -> 'NutritionWorkerPool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()